@@ -0,0 +1,71 @@
+"""
+Startup cost of every cogito-cli subcommand: wall time and imported modules.
+
+Each subcommand runs in a fresh interpreter, with --help for the commands that
+would otherwise need a project, so that only the imports and the command line
+parsing are measured. The wall time includes the interpreter startup.
+
+    python benchmarks/cli_startup.py --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SUBCOMMANDS = [
+    ["--help"],
+    ["version"],
+    ["config", "--help"],
+    ["init", "--help"],
+    ["scaffold", "--help"],
+    ["train", "--help"],
+    ["predict", "--help"],
+    ["run", "--help"],
+]
+
+# Prints the number of imported modules once the command exits
+RUNNER = (
+    "import atexit, sys\n"
+    "atexit.register(lambda: print(len(sys.modules), file=sys.stderr))\n"
+    "from cogito.cli import main\n"
+    "sys.argv = ['cogito-cli', *sys.argv[1:]]\n"
+    "main()\n"
+)
+
+
+def measure(args: List[str], repeat: int) -> Tuple[float, int]:
+    """Median wall time in seconds and number of modules of a subcommand"""
+    times, modules = [], 0
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", RUNNER, *args],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        times.append(time.perf_counter() - start_time)
+        modules = int(result.stderr.strip().splitlines()[-1])
+    return statistics.median(times), modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'subcommand':<18} {'wall time':>10} {'modules':>8}")
+    for subcommand in SUBCOMMANDS:
+        wall_time, modules = measure(subcommand, args.repeat)
+        print(f"{' '.join(subcommand):<18} {wall_time * 1000:8.1f}ms {modules:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Per-request framework overhead of a route, in the validated and fast response modes.
+
+The predictor returns straight away, so the measured time is the cost of the
+request validation, the handler wrapper and the response serialization. Requests
+are sent to the ASGI application directly, without any network involved.
+
+    python benchmarks/response_overhead.py --requests 5000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+from fastapi import FastAPI
+
+from cogito.core.utils import get_predictor_handler_return_type, wrap_handler
+
+
+class Predictor:
+    async def predict(self, prompt: str, values: List[float], top_k: int = 5) -> Dict:
+        return {"label": prompt, "scores": values[:top_k]}
+
+
+def build_app(response_mode: str) -> FastAPI:
+    predictor = Predictor()
+    response_model = get_predictor_handler_return_type(predictor)
+    app = FastAPI()
+    app.add_api_route(
+        "/v1/predict",
+        wrap_handler(
+            "benchmark:Predictor",
+            predictor.predict,
+            response_model,
+            response_mode=response_mode,
+        ),
+        methods=["POST"],
+        response_model=response_model,
+    )
+    return app
+
+
+async def call(app: FastAPI, body: bytes) -> bytes:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/v1/predict",
+        "raw_path": b"/v1/predict",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("127.0.0.1", 8000),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    response = []
+
+    async def receive():
+        return messages.pop() if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            response.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(response)
+
+
+async def measure(app: FastAPI, body: bytes, requests: int) -> float:
+    for _ in range(min(requests, 100)):
+        await call(app, body)
+
+    start_time = time.perf_counter()
+    for _ in range(requests):
+        await call(app, body)
+    return (time.perf_counter() - start_time) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--values", type=int, default=64, help="Input list length")
+    args = parser.parse_args()
+
+    body = json.dumps(
+        {"prompt": "benchmark", "values": [i / 7 for i in range(args.values)]}
+    ).encode()
+
+    results = {}
+    for mode in ("validated", "fast"):
+        app = build_app(mode)
+        results[mode] = asyncio.run(measure(app, body, args.requests))
+        print(f"{mode:>10}: {results[mode] * 1e6:8.1f} us/request")
+
+    saved = results["validated"] - results["fast"]
+    print(
+        f"{'saved':>10}: {saved * 1e6:8.1f} us/request "
+        f"({saved / results['validated']:.0%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
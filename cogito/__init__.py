@@ -1,11 +1,32 @@
-from cogito.core.app import Application
+from typing import TYPE_CHECKING
+
 from cogito.core.models import BasePredictor
-from cogito.core.utils import model_download
 
 from ._version import __version__
 
+if TYPE_CHECKING:
+    from cogito.core.app import Application
+    from cogito.core.utils import model_download
+
 __all__ = [
     "Application",
     "BasePredictor",
     "model_download",
 ]
+
+# Loaded on first use, so that importing a predictor or running the CLI does not
+# pay for FastAPI, uvicorn, OpenTelemetry and the model store clients.
+_lazy_imports = {
+    "Application": "cogito.core.app",
+    "model_download": "cogito.core.utils",
+}
+
+
+def __getattr__(name: str):
+    if name in _lazy_imports:
+        import importlib
+
+        value = getattr(importlib.import_module(_lazy_imports[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
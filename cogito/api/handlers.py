@@ -15,3 +15,11 @@ async def metrics_handler(request: Request) -> Response:
 
 async def version_handler(request: Request) -> JSONResponse:
     return JSONResponse({"version": __version__})
+
+
+async def status_handler(request: Request) -> JSONResponse:
+    startup = request.app.state.startup
+    return JSONResponse(
+        startup.to_response().model_dump(),
+        status_code=200 if startup.ready else 503,
+    )
@@ -1,7 +1,14 @@
 from typing import Any, Optional
 
-from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+try:
+    # Pydantic v2
+    from pydantic_core import to_json
+except ImportError:
+    # Pydantic v1
+    to_json = None
 
 
 class ResultResponse(BaseModel):    
@@ -10,6 +17,37 @@ class ResultResponse(BaseModel):
     result: Any
 
 
+class JobResponse(BaseModel):
+    id: str
+    status: str
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+
+class PredictorStatusResponse(BaseModel):
+    state: str
+    duration_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+
+class StatusResponse(BaseModel):
+    state: str
+    progress: float
+    elapsed_seconds: float
+    predictors: dict[str, PredictorStatusResponse]
+    error: Optional[str] = None
+
+
+class ReloadResponse(BaseModel):
+    predictor: str
+    duration_seconds: float
+    drained: bool
+    memory_before_bytes: int
+    peak_memory_bytes: int
+
+
 class ErrorResponse(BaseModel):
     message: str
 
@@ -22,3 +60,14 @@ class BadRequestResponse(BaseModel):
 
     def to_json_response(self) -> JSONResponse:
         return JSONResponse(status_code=400, content=self.model_dump())
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by pydantic-core, skipping any validation"""
+
+    def render(self, content: Any) -> bytes:
+        if to_json is None:
+            from fastapi.encoders import jsonable_encoder
+
+            return super().render(jsonable_encoder(content))
+        return to_json(content)
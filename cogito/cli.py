@@ -1,15 +1,48 @@
+import importlib
+
 import click
 
-from cogito.commands.initialize import init
-from cogito.commands.scaffold import scaffold
-from cogito.commands.run import run
-from cogito.commands.predict import predict
-from cogito.commands.version import version
-from cogito.commands.train import train
-from cogito.commands.config import config
 
+class LazyGroup(click.Group):
+    """
+    Click group that imports the module of a subcommand only when it is invoked,
+    so that light commands do not pay for the imports of the heavy ones.
+    """
+
+    def __init__(self, *args, lazy_subcommands: dict = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Command name -> "module:attribute"
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context) -> list:
+        return sorted([*super().list_commands(ctx), *self.lazy_subcommands])
+
+    def get_command(self, ctx: click.Context, cmd_name: str):
+        if cmd_name in self.lazy_subcommands:
+            return self._load_command(cmd_name)
+        return super().get_command(ctx, cmd_name)
 
-@click.group()
+    def _load_command(self, cmd_name: str) -> click.Command:
+        module_name, attribute = self.lazy_subcommands[cmd_name].split(":")
+        command = getattr(importlib.import_module(module_name), attribute)
+        if not isinstance(command, click.Command):
+            raise ValueError(f"{module_name}:{attribute} is not a click command")
+        return command
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "init": "cogito.commands.initialize:init",
+        "scaffold": "cogito.commands.scaffold:scaffold",
+        "run": "cogito.commands.run:run",
+        "predict": "cogito.commands.predict:predict",
+        "train": "cogito.commands.train:train",
+        "version": "cogito.commands.version:version",
+        "config": "cogito.commands.config:config",
+        "cache": "cogito.commands.cache:cache",
+    },
+)
 @click.option(
     "-c",
     "--config-path",
@@ -26,15 +59,6 @@ def cli(ctx, config_path: str = ".") -> None:
     ctx.obj["config_path"] = config_path
 
 
-cli.add_command(init)
-cli.add_command(scaffold)
-cli.add_command(run)
-cli.add_command(predict)
-cli.add_command(train)
-cli.add_command(version)
-cli.add_command(config)
-
-
 def main():
     cli(obj={})
 
@@ -0,0 +1,110 @@
+import datetime
+import os
+from typing import Optional
+
+import click
+
+from cogito.core.config.file import ConfigFile
+from cogito.core.exceptions import ConfigFileNotFoundError
+
+# Cache directory of the server when `server.cache_dir` is not set
+DEFAULT_CACHE_DIR = "/.cogito/models"
+
+
+@click.group()
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    help="Model cache directory, instead of server.cache_dir",
+)
+@click.pass_obj
+def cache(ctx: click.Context, cache_dir: Optional[str] = None) -> None:
+    """Model cache management commands."""
+    from cogito.core.model_cache import ModelCache
+
+    try:
+        config = ConfigFile.load_from_file(ctx["config_path"])
+    except ConfigFileNotFoundError:
+        config = ConfigFile.default()
+
+    model_cache = config.get_cogito_param("server.model_cache")
+    ctx["model_cache"] = ModelCache(
+        cache_dir or config.cogito.get_server_cache_dir or DEFAULT_CACHE_DIR,
+        model_cache.max_size_bytes if model_cache else None,
+    )
+
+
+@cache.command(name="list")
+@click.pass_obj
+def list_entries(ctx: click.Context) -> None:
+    """List the cached models, from the least to the most recently used."""
+    model_cache = ctx["model_cache"]
+    entries = model_cache.entries()
+    for entry in entries:
+        last_used = datetime.datetime.fromtimestamp(entry.last_used_at)
+        pinned = " (pinned)" if model_cache.pinned(entry.key) else ""
+        click.echo(
+            f"{entry.model_path}\t{_format_size(entry.size)}\t"
+            f"{last_used:%Y-%m-%d %H:%M:%S}\t{entry.path}{pinned}"
+        )
+
+    max_size = model_cache.max_size
+    click.echo(
+        f"{len(entries)} models, {_format_size(model_cache.size())}"
+        + (f" of {_format_size(max_size)}" if max_size is not None else "")
+    )
+
+
+@cache.command()
+@click.option(
+    "--max-size-gb",
+    type=click.FloatRange(min=0),
+    help="Evict models down to this size, instead of server.model_cache.max_size_gb",
+)
+@click.option("--all", "prune_all", is_flag=True, help="Evict every model not in use")
+@click.pass_obj
+def prune(
+    ctx: click.Context, max_size_gb: Optional[float] = None, prune_all: bool = False
+) -> None:
+    """Evict the least recently used models and delete unused files."""
+    max_size = 0 if prune_all else None
+    if max_size_gb is not None and not prune_all:
+        max_size = int(max_size_gb * 1024**3)
+
+    removed, freed = ctx["model_cache"].prune(max_size)
+    for entry in removed:
+        click.echo(f"Removed {entry.model_path}")
+    click.echo(f"{len(removed)} models removed, {_format_size(freed)} freed")
+
+
+@cache.command()
+@click.option(
+    "--repair", is_flag=True, help="Remove the models with problems from the cache"
+)
+@click.pass_obj
+def verify(ctx: click.Context, repair: bool = False) -> None:
+    """Check the cached files against their content hash."""
+    model_cache = ctx["model_cache"]
+    if not os.path.isdir(model_cache.cache_dir):
+        click.echo(f"Error: No model cache at {model_cache.cache_dir}", err=True)
+        exit(1)
+
+    problems = model_cache.verify(repair=repair)
+    for entry, problem in problems:
+        click.echo(f"{entry.model_path}: {problem}", err=True)
+    if not problems:
+        click.echo(f"{len(model_cache.entries())} models verified")
+        return
+
+    if repair:
+        click.echo(f"{len({entry.key for entry, _ in problems})} models removed")
+    else:
+        exit(1)
+
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+    return f"{size:.1f} TiB"
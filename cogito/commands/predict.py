@@ -1,27 +1,89 @@
 import json
+from typing import TYPE_CHECKING
 
 import click
 
 from cogito.core.exceptions import ConfigFileNotFoundError, NoSetupMethodError
-from cogito.lib.prediction import Predict
+from cogito.lib.batch_prediction import PROCESS, THREAD
+
+if TYPE_CHECKING:
+    from cogito.lib.prediction import Predict
 
 
 @click.command()
+@click.option("--payload", type=str, help="The payload for the prediction")
+@click.option(
+    "--input-file",
+    type=click.Path(dir_okay=False, allow_dash=True),
+    help="JSONL file with one payload per line ('-' for stdin)",
+)
+@click.option(
+    "--output-file",
+    type=click.Path(dir_okay=False, allow_dash=True, writable=True),
+    default="-",
+    show_default=True,
+    help="JSONL file the results are written to, with --input-file",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of predictions running at the same time, with --input-file",
+)
+@click.option(
+    "--parallelism",
+    type=click.Choice([THREAD, PROCESS]),
+    default=THREAD,
+    show_default=True,
+    help="Run the workers as threads or as forked processes",
+)
 @click.option(
-    "--payload", type=str, required=True, help="The payload for the prediction"
+    "--ordered/--unordered",
+    default=True,
+    show_default=True,
+    help="Write the results in input order, or as soon as they are ready",
+)
+@click.option(
+    "--offset",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Skip the first lines of the input file, appending to the output file",
 )
 @click.pass_obj
-def predict(ctx: click.Context, payload: str) -> None:
+def predict(
+    ctx: click.Context,
+    payload: str,
+    input_file: str = None,
+    output_file: str = "-",
+    workers: int = 1,
+    parallelism: str = THREAD,
+    ordered: bool = True,
+    offset: int = 0,
+) -> None:
     """
-    Run a cogito prediction with the specified payload, printing the result to stdout.
+    Run a cogito prediction with the specified payload, printing the result to stdout,
+    or run the predictions of every line of a JSONL file.
 
     Example: python -m cogito.cli predict --payload '{"key": "value"}'
+
+    Example: python -m cogito.cli predict --input-file inputs.jsonl --output-file results.jsonl --workers 8
     """
+    if (payload is None) == (input_file is None):
+        click.echo(
+            "Error: Use exactly one of --payload or --input-file", err=True, color=True
+        )
+        exit(1)
 
     # Load config and initialize predictor
     try:
         config_path = ctx.get("config_path")
-        payload_data = json.loads(payload)
+        payload_data = json.loads(payload) if payload is not None else None
+
+        from cogito.lib.prediction import Predict
+
         predictor = Predict(config_path)
     except Exception as e:
         click.echo(f"Error initializing the predictor: {e}", err=True, color=True)
@@ -36,6 +98,12 @@ def predict(ctx: click.Context, payload: str) -> None:
         click.echo(f"Error setting up the predictor: {e}", err=True, color=True)
         exit(1)
 
+    if input_file is not None:
+        _predict_file(
+            predictor, input_file, output_file, workers, parallelism, ordered, offset
+        )
+        return
+
     # Run predictor
     try:
         result = predictor.run(payload_data)
@@ -49,3 +117,44 @@ def predict(ctx: click.Context, payload: str) -> None:
         # traceback.print_exc()
         click.echo(f"Error: {e}", err=True, color=True)
         exit(1)
+
+
+def _predict_file(
+    predictor: "Predict",
+    input_file: str,
+    output_file: str,
+    workers: int,
+    parallelism: str,
+    ordered: bool,
+    offset: int,
+) -> None:
+    """Stream the records of a JSONL file through the predictor"""
+    from cogito.lib.batch_prediction import PredictionSummary, predict_jsonl
+
+    # Printed however the run ends, for its offset to resume from
+    summary = PredictionSummary(next_offset=offset)
+    try:
+        # Resumed runs append to the results of the interrupted one
+        with (
+            click.open_file(input_file, "r") as inputs,
+            click.open_file(output_file, "a" if offset else "w") as outputs,
+        ):
+            predict_jsonl(
+                predictor,
+                inputs,
+                outputs,
+                workers=workers,
+                parallelism=parallelism,
+                ordered=ordered,
+                offset=offset,
+                summary=summary,
+            )
+    except KeyboardInterrupt:
+        click.echo(f"Interrupted: {summary}", err=True)
+        exit(130)
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True, color=True)
+        click.echo(f"Stopped: {summary}", err=True)
+        exit(1)
+
+    click.echo(f"Done: {summary}", err=True)
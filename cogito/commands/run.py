@@ -3,12 +3,18 @@ import sys
 
 import click
 
-from cogito import Application
-
 
 @click.command()
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes sharing the loaded model",
+)
 @click.pass_obj
-def run(ctx: click.Context) -> None:
+def run(ctx: click.Context, workers: int = 1) -> None:
     """Run cogito app"""
     config_path = ctx.get("config_path")
     absolute_path = os.path.abspath(config_path)
@@ -24,8 +30,11 @@ def run(ctx: click.Context) -> None:
     try:
         app_dir = os.path.dirname(os.path.abspath(config_path))
         sys.path.insert(0, app_dir)
+
+        from cogito.core.app import Application
+
         app = Application(config_file_path=absolute_path)
-        app.run()
+        app.run(workers=workers)
     except Exception as e:
         import traceback
 
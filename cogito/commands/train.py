@@ -3,7 +3,6 @@ import json
 import click
 
 from cogito.core.exceptions import ConfigFileNotFoundError, NoSetupMethodError
-from cogito.lib.training import Trainer
 
 
 @click.command()
@@ -29,6 +28,8 @@ def train(ctx: click.Context, payload: str) -> None:
 
     # Initialize trainer
     try:
+        from cogito.lib.training import Trainer
+
         trainer = Trainer(config_path)
     except Exception as e:
         click.echo(f"Error: {e}", err=True, color=True)
@@ -0,0 +1,212 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, List, Optional
+
+from cogito.core.exceptions import NoThreadsAvailableError
+from cogito.core.metrics import (
+    admission_queue_depth,
+    admission_queue_wait_histogram,
+    admission_rejected_counter,
+    concurrency_limit_gauge,
+)
+
+
+class AIMDLimit:
+    """
+    Additive-increase/multiplicative-decrease concurrency limit.
+
+    Latencies are averaged over rounds of ``limit`` samples, and compared to the
+    lowest round average seen so far, which slowly drifts up to follow lasting
+    changes. A round slower than ``tolerance`` times that baseline multiplies the
+    limit by ``backoff``. Otherwise, if requests had to wait for a slot during the
+    round, the limit grows by one.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.9,
+        tolerance: float = 1.5,
+        baseline_drift: float = 0.001,
+    ):
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= max_limit")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.baseline_drift = baseline_drift
+        self.limit = min(max(initial_limit, min_limit), max_limit)
+
+        self._baseline: Optional[float] = None
+        self._samples: List[float] = []
+        self._saturated = False
+
+    def mark_saturated(self) -> None:
+        """A request found every slot in use"""
+        self._saturated = True
+
+    def update(self, latency: float) -> int:
+        self._samples.append(latency)
+        if len(self._samples) < self.limit:
+            return self.limit
+
+        average = sum(self._samples) / len(self._samples)
+        self._samples = []
+        if self._baseline is None:
+            self._baseline = average
+        else:
+            self._baseline = min(average, self._baseline * (1 + self.baseline_drift))
+
+        if average > self._baseline * self.tolerance:
+            self.limit = max(self.min_limit, int(self.limit * self.backoff))
+        elif self._saturated:
+            self.limit = min(self.max_limit, self.limit + 1)
+        self._saturated = False
+        return self.limit
+
+
+class _Slots:
+    """FIFO semaphore whose number of slots can change at any time"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    def locked(self) -> bool:
+        return self.in_use >= self.limit or bool(self._waiters)
+
+    async def acquire(self) -> None:
+        if not self.locked():
+            self.in_use += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted right before being cancelled
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        self.in_use -= 1
+        self._wake()
+
+    def resize(self, limit: int) -> None:
+        self.limit = limit
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_use < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_use += 1
+                waiter.set_result(None)
+
+
+class AdmissionQueue:
+    """
+    FIFO admission control in front of a predictor.
+
+    Up to ``concurrency`` requests run at the same time. Further requests wait in
+    arrival order, and are rejected with ``NoThreadsAvailableError`` only when
+    ``max_depth`` requests are already waiting or when their wait exceeds
+    ``max_wait_ms``. With the default ``max_depth`` of 0 a busy route rejects
+    requests straight away.
+
+    With an ``adaptive_limit``, the number of concurrent requests follows that
+    limit instead, fed with the time each request holds its slot. ``acquire``
+    returns the time the slot was granted, to be passed back to ``release``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int = 1,
+        max_depth: int = 0,
+        max_wait_ms: Optional[float] = None,
+        adaptive_limit: Optional[AIMDLimit] = None,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be greater than 0")
+
+        self.name = name
+        self.adaptive_limit = adaptive_limit
+        self.concurrency = adaptive_limit.limit if adaptive_limit else concurrency
+        self.max_depth = max_depth
+        self.max_wait_ms = max_wait_ms
+
+        self._slots = _Slots(self.concurrency)
+        self._waiting = 0
+        concurrency_limit_gauge.add(self.concurrency, {"route": self.name})
+
+    @property
+    def depth(self) -> int:
+        """Number of requests currently waiting for a slot."""
+        return self._waiting
+
+    def locked(self) -> bool:
+        return self._slots.locked()
+
+    async def acquire(self) -> float:
+        if not self._slots.locked():
+            await self._slots.acquire()
+            return time.monotonic()
+
+        if self.adaptive_limit is not None:
+            self.adaptive_limit.mark_saturated()
+
+        if self._waiting >= self.max_depth:
+            admission_rejected_counter.add(1, {"route": self.name, "reason": "full"})
+            raise NoThreadsAvailableError(self.name)
+
+        timeout = self.max_wait_ms / 1000 if self.max_wait_ms else None
+        start_time = time.monotonic()
+        self._waiting += 1
+        admission_queue_depth.add(1, {"route": self.name})
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout)
+        except asyncio.TimeoutError:
+            admission_rejected_counter.add(1, {"route": self.name, "reason": "timeout"})
+            raise NoThreadsAvailableError(self.name)
+        finally:
+            self._waiting -= 1
+            admission_queue_depth.add(-1, {"route": self.name})
+            admission_queue_wait_histogram.record(
+                (time.monotonic() - start_time) * 1000, {"route": self.name}
+            )
+        return time.monotonic()
+
+    def release(self, acquired_at: Optional[float] = None) -> None:
+        if self.adaptive_limit is not None and acquired_at is not None:
+            limit = self.adaptive_limit.update(time.monotonic() - acquired_at)
+            if limit != self.concurrency:
+                concurrency_limit_gauge.add(
+                    limit - self.concurrency, {"route": self.name}
+                )
+                self.concurrency = limit
+                self._slots.resize(limit)
+
+        self._slots.release()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a slot for the duration of the block."""
+        acquired_at = await self.acquire()
+        try:
+            yield
+        finally:
+            self.release(acquired_at)
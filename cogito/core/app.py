@@ -1,44 +1,95 @@
 import asyncio
+import gc
 import logging
 import os
+import signal
 import sys
-from contextlib import asynccontextmanager
-from typing import Any, Dict, Union
+import time
+from contextlib import ExitStack, asynccontextmanager, nullcontext
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request
 from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from cogito.api.handlers import (
     health_check_handler,
     metrics_handler,
+    status_handler,
     version_handler,
 )
 from cogito.api.responses import (
     ErrorResponse,
     BadRequestResponse,
+    JobResponse,
+    ReloadResponse,
 )
+from cogito.core.batch_endpoint import create_batch_handler
 from cogito.core.config import ConfigFile
 from cogito.core.exceptioin_handlers import (
     bad_request_exception_handler,
+    client_disconnected_exception_handler,
+    deadline_exceeded_exception_handler,
+    reload_exception_handler,
+    service_not_ready_exception_handler,
+    job_not_found_exception_handler,
+    job_store_full_exception_handler,
     too_many_requests_exception_handler,
     validation_exception_handler,
 )
+from cogito.core.execution import (
+    PROCESS,
+    EventLoopMonitor,
+    create_invoker,
+    default_execution_mode,
+    register_process_predictor,
+)
 from cogito.core.exceptions import (
     BadRequestError,
+    ClientDisconnectedError,
+    DeadlineExceededError,
     ConfigFileNotFoundError,
+    JobNotFoundError,
+    JobStoreFullError,
     NoThreadsAvailableError,
+    ReloadError,
+    ServiceNotReadyError,
     SetupError,
 )
+from cogito.core.jobs import JobRunner, create_job_handlers, create_job_store
 from cogito.core.logging import get_logger
+from cogito.core.metrics import (
+    reload_duration_histogram,
+    reload_peak_memory_histogram,
+    setup_duration_histogram,
+    setup_metrics,
+    startup_duration_histogram,
+)
 from cogito.core.models import BasePredictor
+from cogito.core.model_cache import CACHE_MAX_SIZE_ENV
+from cogito.core.reload import PeakMemorySampler, PredictorHandle
+from cogito.core.startup import (
+    FAILED,
+    READY,
+    SETTING_UP,
+    WARMING_UP,
+    StartupStatus,
+)
+from cogito.core.streaming import is_streaming_handler
 from cogito.core.utils import (
+    create_routes_batchers,
+    create_routes_caches,
+    create_routes_coalescers,
+    create_routes_executors,
     create_routes_semaphores,
     get_predictor_handler_return_type,
     instance_class,
     wrap_handler,
     readiness_context,
 )
+from cogito.core.warmup import load_warmup_payloads, warm_up_route
+from cogito.core.workers import NotifyingServer, WorkerSupervisor
 
 
 class Application:
@@ -51,7 +102,11 @@ class Application:
         logger: Union[Any, logging.Logger] = None,
     ):
 
+        setup_metrics()
         self._logger = logger or Application._get_default_logger()
+        self._setup_done = False
+        self._is_worker = False
+        self._event_loop_monitor = EventLoopMonitor()
 
         try:
             self.config = ConfigFile.load_from_file(os.path.join(f"{config_file_path}"))
@@ -69,21 +124,51 @@ class Application:
             os.environ["HF_HOME"] = os.path.expanduser("/.cogito/models")
             os.environ["COGITO_HOME"] = os.path.expanduser("/.cogito/models")
 
+        model_cache = self.config.get_cogito_param("server.model_cache")
+        if model_cache and model_cache.max_size_bytes is not None:
+            os.environ[CACHE_MAX_SIZE_ENV] = str(model_cache.max_size_bytes)
+
         @asynccontextmanager
         async def lifespan(app: FastAPI):
-
-            try:
-                await self.setup(app)
-            except SetupError as e:
-                self._logger.critical(
-                    "Unable to start application",
-                    extra={"error": e},
+            # Pre-forked workers leave the readiness file to their supervisor
+            if self._is_worker:
+                readiness = nullcontext()
+            else:
+                readiness = readiness_context(
+                    self.config.cogito.get_server_readiness_file
                 )
-                sys.exit(1)
 
-            with readiness_context(self.config.cogito.get_server_readiness_file):
+            self._event_loop_monitor.start()
+            self._add_reload_signal_handler()
+            with ExitStack() as ready_stack:
+                if self._background_setup:
+                    # Serve the status endpoint while the predictors are set up
+                    startup = asyncio.create_task(self._start(readiness, ready_stack))
+                else:
+                    startup = None
+                    await self._start(readiness, ready_stack)
+
                 yield
 
+                if startup is not None:
+                    startup.cancel()
+                    await asyncio.gather(startup, return_exceptions=True)
+
+            self._remove_reload_signal_handler()
+            for task in self._reload_tasks:
+                task.cancel()
+            await asyncio.gather(*self._reload_tasks, return_exceptions=True)
+
+            for runner in self.job_runners.values():
+                await runner.stop()
+            await self._event_loop_monitor.stop()
+
+            for batcher in self.batchers.values():
+                await batcher.close()
+
+            for executor in self.executors.values():
+                executor.shutdown(wait=False, cancel_futures=True)
+
         self.app = FastAPI(
             title=self.config.cogito.get_server_name,
             version=self.config.cogito.get_server_version,
@@ -98,62 +183,301 @@ class Application:
 
         self.app.logger = self._logger
 
+        self._background_setup = bool(
+            self.config.get_cogito_param("server.background_setup")
+        )
+        # Until the predictors are ready, requests to their routes get a 503
+        self._route_dependencies = (
+            [Depends(self._check_ready)] if self._background_setup else None
+        )
+
         self._set_default_routes()
 
-        map_route_to_model: Dict[str, str] = {}
+        self.map_route_to_model: Dict[str, str] = {}
         self.map_model_to_instance: Dict[str, BasePredictor] = {}
+
+        routes = self.config.cogito.get_routes
+        for route in routes:
+            predictor_string = route.predictor
+            self.map_route_to_model[route.path] = predictor_string
+            if predictor_string not in self.map_model_to_instance:
+                predictor = instance_class(predictor_string)
+                self.map_model_to_instance[predictor_string] = predictor
+            else:
+                self._logger.info(
+                    "Predictor class already loaded",
+                    extra={"predictor": predictor_string},
+                )
+
+        self.startup = StartupStatus(list(self.map_model_to_instance))
+        self.app.state.startup = self.startup
+
+        self._reload_config = self.config.get_cogito_param("server.reload")
+        self._reload_lock = asyncio.Lock()
+        self._reload_tasks: Set[asyncio.Task] = set()
+        self.predictor_handles = self._create_predictor_handles()
+
         semaphores = create_routes_semaphores(self.config)
+        self.executors = create_routes_executors(self.config)
+        self.batchers = create_routes_batchers(
+            self.config, self.map_model_to_instance, self.executors
+        )
+        for route in routes:
+            batcher = self.batchers.get(route.path)
+            if batcher is not None and route.predictor in self.predictor_handles:
+                batcher.batch_handler = self._predictor_method(
+                    route.predictor, "predict_batch"
+                )
 
-        route = self.config.cogito.get_route
-        route_path = self.config.cogito.get_route_path
-        predictor_string = self.config.cogito.get_predictor
+        self.caches = create_routes_caches(self.config)
+        self.job_runners: Dict[str, JobRunner] = {}
+        self.warmups: Dict[str, Tuple[Callable, List[dict], int]] = {}
+        self.coalescers = create_routes_coalescers(self.config)
 
-        self._logger.info("Adding route", extra={"route": route})
-        map_route_to_model[route_path] = predictor_string
-        if predictor_string not in self.map_model_to_instance:
-            predictor = instance_class(predictor_string)
-            self.map_model_to_instance[predictor_string] = predictor
-        else:
-            self._logger.info(
-                "Predictor class already loaded",
-                extra={"predictor": predictor_string},
+        # Predictors shared by several routes share their request/response models
+        response_models: Dict[str, type] = {}
+
+        for route in routes:
+            self._logger.info("Adding route", extra={"route": route})
+            predictor_string = route.predictor
+            model = self.map_model_to_instance.get(predictor_string)
+
+            # Streamed chunks are not wrapped in a response model
+            streaming = is_streaming_handler(model.predict)
+            if streaming:
+                response_model = None
+            else:
+                if predictor_string not in response_models:
+                    response_models[predictor_string] = (
+                        get_predictor_handler_return_type(model)
+                    )
+                response_model = response_models[predictor_string]
+
+            execution_mode = getattr(route, "execution", None)
+            if execution_mode == PROCESS:
+                register_process_predictor(predictor_string, model)
+
+            handler_options = dict(
+                descriptor=predictor_string,
+                original_handler=self._predictor_method(predictor_string, "predict"),
+                admission_queue=semaphores[route.path],
+                response_model=response_model,
+                config=self.config,
+                batcher=self.batchers.get(route.path),
+                executor=self.executors.get(route.path),
+                execution_mode=execution_mode,
+                stream_format=getattr(route, "stream_format", None),
+                response_mode=getattr(route, "response_mode", None),
+                timeout_ms=getattr(route, "timeout_ms", None),
+            )
+            handler = wrap_handler(
+                **handler_options,
+                cache=self.caches.get(route.path),
+                coalescer=self.coalescers.get(route.path),
             )
 
-        model = self.map_model_to_instance.get(predictor_string)
-        response_model = get_predictor_handler_return_type(model)
+            self.app.add_api_route(
+                route.path,
+                handler,
+                methods=["POST"],
+                name=route.name,
+                description=route.description,
+                tags=route.tags,
+                response_model=response_model,
+                response_class=StreamingResponse if streaming else JSONResponse,
+                dependencies=self._route_dependencies,
+                responses={
+                    500: {"model": ErrorResponse},
+                    400: {"model": BadRequestResponse},
+                },
+            )
 
-        handler = wrap_handler(
-            descriptor=predictor_string,
-            original_handler=getattr(
-                self.map_model_to_instance.get(predictor_string), "predict"
+            batch_endpoint = getattr(route, "batch_endpoint", None)
+            if batch_endpoint:
+                self._add_batch_route(
+                    route, model, handler, batch_endpoint, semaphores[route.path]
+                )
+
+            jobs = getattr(route, "jobs", None)
+            if jobs:
+                self._add_job_routes(route, model, handler, response_model, jobs)
+
+            warmup = getattr(route, "warmup", None)
+            if warmup:
+                # Without the response cache, every iteration reaches the predictor
+                self.warmups[route.path] = (
+                    wrap_handler(**handler_options),
+                    load_warmup_payloads(warmup),
+                    warmup.iterations,
+                )
+
+        self.app.add_exception_handler(BadRequestError, bad_request_exception_handler)
+        self.app.add_exception_handler(
+            RequestValidationError, validation_exception_handler
+        )
+        self.app.add_exception_handler(
+            NoThreadsAvailableError, too_many_requests_exception_handler
+        )
+        self.app.add_exception_handler(
+            JobNotFoundError, job_not_found_exception_handler
+        )
+        self.app.add_exception_handler(
+            JobStoreFullError, job_store_full_exception_handler
+        )
+        self.app.add_exception_handler(
+            DeadlineExceededError, deadline_exceeded_exception_handler
+        )
+        self.app.add_exception_handler(
+            ClientDisconnectedError, client_disconnected_exception_handler
+        )
+        self.app.add_exception_handler(
+            ServiceNotReadyError, service_not_ready_exception_handler
+        )
+        self.app.add_exception_handler(ReloadError, reload_exception_handler)
+
+        if self._reload_config and self._reload_config.admin_endpoint:
+            self.app.add_api_route(
+                "/admin/reload",
+                self._reload_handler,
+                methods=["POST"],
+                name="reload",
+                description=(
+                    "Reload a predictor, or every predictor, without downtime: "
+                    "set up and warm up a new instance, then swap it in"
+                ),
+                tags=["admin"],
+                response_model=List[ReloadResponse],
+                responses={500: {"model": ErrorResponse}},
+            )
+
+    def _create_predictor_handles(self) -> Dict[str, PredictorHandle]:
+        """Swappable references to the predictors, when hot reloads are enabled"""
+        if not self._reload_config:
+            return {}
+
+        # Worker processes of the process execution mode keep their own copy
+        in_processes = {
+            route.predictor
+            for route in self.config.cogito.get_routes
+            if getattr(route, "execution", None) == PROCESS
+        }
+        for predictor in in_processes:
+            self._logger.warning(
+                "Predictors running in process execution mode cannot be reloaded",
+                extra={"predictor": predictor},
+            )
+        return {
+            name: PredictorHandle(name, instance)
+            for name, instance in self.map_model_to_instance.items()
+            if name not in in_processes
+        }
+
+    def _predictor_method(self, predictor: str, method: str) -> Callable:
+        """Method of a predictor, following its reloads when they are enabled"""
+        handle = self.predictor_handles.get(predictor)
+        if handle is not None:
+            return handle.bind(method)
+        return getattr(self.map_model_to_instance[predictor], method)
+
+    def _create_route_invoker(self, route, model: BasePredictor):
+        """Call the predictor of a route the way its synchronous handler does"""
+        batcher = self.batchers.get(route.path)
+        if batcher is not None:
+            return batcher.submit
+        return create_invoker(
+            route.predictor,
+            self._predictor_method(route.predictor, "predict"),
+            getattr(route, "execution", None) or default_execution_mode(model.predict),
+            self.executors.get(route.path),
+        )
+
+    def _add_batch_route(
+        self, route, model: BasePredictor, handler, config, admission_queue
+    ) -> None:
+        """Batch variant of a route, streaming NDJSON results in order"""
+        if is_streaming_handler(model.predict):
+            raise ValueError(
+                f"Batch endpoints are not supported by streaming route {route.path}"
+            )
+
+        self.app.add_api_route(
+            f"{route.path}/batch",
+            create_batch_handler(
+                name=route.path,
+                invoke=self._create_route_invoker(route, model),
+                input_model=handler.__annotations__["input"],
+                max_concurrency=config.max_concurrency,
+                max_items=config.max_items,
+                admission_queue=admission_queue,
             ),
-            semaphore=semaphores[predictor_string],
-            response_model=response_model,
-            config=self.config,
+            methods=["POST"],
+            name=f"{route.name}_batch",
+            description=(
+                f"Run a JSON list or NDJSON body of {route.path} payloads, "
+                "streaming one NDJSON result per item in order"
+            ),
+            tags=route.tags,
+            response_class=StreamingResponse,
+            dependencies=self._route_dependencies,
+        )
+
+    def _add_job_routes(
+        self, route, model: BasePredictor, handler, response_model, jobs
+    ) -> None:
+        """Asynchronous jobs of a route, run by workers sharing its predictor"""
+        if is_streaming_handler(model.predict):
+            raise ValueError(f"Jobs are not supported by streaming route {route.path}")
+
+        runner = JobRunner(
+            name=route.path,
+            store=create_job_store(
+                route.path, jobs, self.config.cogito.get_server_cache_dir
+            ),
+            invoke=self._create_route_invoker(route, model),
+            workers=jobs.workers,
         )
+        self.job_runners[route.path] = runner
 
+        submit_handler, status_handler, result_handler = create_job_handlers(
+            runner,
+            handler.__annotations__["input"],
+            response_model,
+            self.config.get_cogito_param("server.return_input_on_response"),
+        )
         self.app.add_api_route(
-            route_path,
-            handler,
+            f"{route.path}/jobs",
+            submit_handler,
             methods=["POST"],
-            name=self.config.cogito.get_route_name,
-            description=self.config.cogito.get_route_description,
-            tags=self.config.cogito.get_route_tags,
+            name=f"{route.name}_submit_job",
+            description=f"Submit an asynchronous job to {route.path}",
+            tags=route.tags,
+            response_model=JobResponse,
+            status_code=202,
+            dependencies=self._route_dependencies,
+        )
+        self.app.add_api_route(
+            f"{route.path}/jobs/{{job_id}}",
+            status_handler,
+            methods=["GET"],
+            name=f"{route.name}_job_status",
+            description="Status of a job, waiting up to `wait` seconds for it to finish",
+            tags=route.tags,
+            response_model=JobResponse,
+        )
+        self.app.add_api_route(
+            f"{route.path}/jobs/{{job_id}}/result",
+            result_handler,
+            methods=["GET"],
+            name=f"{route.name}_job_result",
+            description="Result of a job, waiting up to `wait` seconds for it to finish",
+            tags=route.tags,
             response_model=response_model,
             responses={
+                202: {"model": JobResponse},
                 500: {"model": ErrorResponse},
-                400: {"model": BadRequestResponse},
             },
         )
 
-        self.app.add_exception_handler(BadRequestError, bad_request_exception_handler)
-        self.app.add_exception_handler(
-            RequestValidationError, validation_exception_handler
-        )
-        self.app.add_exception_handler(
-            NoThreadsAvailableError, too_many_requests_exception_handler
-        )
-
     def _set_default_routes(self) -> None:
         """Include default routes"""
         self.app.add_api_route(
@@ -174,6 +498,15 @@ class Application:
             tags=["metrics"],
         )
 
+        self.app.add_api_route(
+            "/status",
+            status_handler,
+            methods=["GET"],
+            name="status",
+            description="Startup progress, 503 until the predictors are ready",
+            tags=["health"],
+        )
+
         self.app.add_api_route(
             "/version",
             version_handler,
@@ -183,33 +516,301 @@ class Application:
             tags=["version"],
         )
 
-    async def setup(self, app: FastAPI):
-        self._logger.info("Setting up application", extra={})
-        for predictor in self.map_model_to_instance.values():
+    async def _start(self, readiness, ready_stack: ExitStack):
+        """Set up and warm up the application, then signal its readiness"""
+        try:
+            if not self._setup_done:
+                await self.setup(self.app)
+        except SetupError as e:
+            self.startup.set_state(FAILED, str(e))
+            self._logger.critical(
+                "Unable to start application",
+                extra={"error": e},
+            )
+            if not self._background_setup:
+                sys.exit(1)
+            # The server is already serving, shut it down as a SIGTERM would
+            os.kill(os.getpid(), signal.SIGTERM)
+            return
+
+        for runner in self.job_runners.values():
+            await runner.start()
+
+        # Readiness is only signalled once the routes are warmed up
+        self.startup.set_state(WARMING_UP)
+        await self.warm_up()
+
+        ready_stack.enter_context(readiness)
+        self.startup.set_state(READY)
+        startup_duration_histogram.record(self.startup.elapsed_seconds * 1000)
+        self._logger.info(
+            "Application ready",
+            extra={"duration_seconds": round(self.startup.elapsed_seconds, 3)},
+        )
+
+    async def reload(self, predictor: Optional[str] = None) -> List[ReloadResponse]:
+        """
+        Reload one predictor, or every predictor, while the current instances keep
+        serving. Reloads run one at a time.
+        """
+        if not self.startup.ready:
+            raise ServiceNotReadyError("reload")
+        if predictor is None:
+            names = list(self.predictor_handles)
+        elif predictor in self.predictor_handles:
+            names = [predictor]
+        else:
+            raise BadRequestError(f"Predictor {predictor} cannot be reloaded")
+
+        async with self._reload_lock:
+            return [await self._reload_predictor(name) for name in names]
+
+    async def _reload_handler(self, predictor: Optional[str] = None):
+        return await self.reload(predictor)
+
+    async def _reload_predictor(self, name: str) -> ReloadResponse:
+        """
+        Build, set up and warm up a new instance next to the current one, send the
+        next requests to it, then wait for the requests still running on the
+        previous instance before releasing it.
+        """
+        handle = self.predictor_handles[name]
+        routes = [
+            route for route in self.config.cogito.get_routes if route.predictor == name
+        ]
+        self._logger.info("Reloading predictor", extra={"predictor": name})
+
+        start_time = time.perf_counter()
+        async with PeakMemorySampler() as memory:
             try:
-                self._logger.debug(
-                    "Setting up predictor",
-                    extra={"predictor": predictor.__class__.__name__},
-                )
-                # if is courutine
-                if asyncio.iscoroutinefunction(predictor.setup):
-                    await predictor.setup()
+                instance = instance_class(name)
+                if asyncio.iscoroutinefunction(instance.setup):
+                    await instance.setup()
                 else:
-                    predictor.setup()
+                    await asyncio.to_thread(instance.setup)
+                await self._warm_up_instance(name, instance, routes)
             except Exception as e:
                 self._logger.critical(
-                    "Unable to setting up predictor",
-                    extra={"predictor": predictor.__class__.__name__, "error": e},
+                    "Unable to reload predictor",
+                    extra={"predictor": name, "error": e},
+                )
+                raise ReloadError(name, e)
+
+            previous = handle.swap(instance)
+            self.map_model_to_instance[name] = instance
+            # Responses of the previous instance are no longer valid, including
+            # those of the requests it is still running
+            for route in routes:
+                cache = self.caches.get(route.path)
+                if cache is not None:
+                    cache.clear()
+                coalescer = self.coalescers.get(route.path)
+                if coalescer is not None:
+                    coalescer.clear()
+
+            drained = await handle.drain(
+                previous, self._reload_config.drain_timeout_seconds
+            )
+            if not drained:
+                self._logger.warning(
+                    "Previous predictor still busy, released once its requests finish",
+                    extra={"predictor": name, "in_flight": handle.in_flight(previous)},
                 )
-                raise SetupError(predictor.__class__.__name__, e)
+            del previous
+            gc.collect()
+
+        duration = time.perf_counter() - start_time
+        reload_duration_histogram.record(duration * 1000, {"predictor": name})
+        reload_peak_memory_histogram.record(memory.peak, {"predictor": name})
+        self._logger.info(
+            "Predictor reloaded",
+            extra={
+                "predictor": name,
+                "duration_seconds": round(duration, 3),
+                "memory_before_bytes": memory.start,
+                "peak_memory_bytes": memory.peak,
+                "drained": drained,
+            },
+        )
+        return ReloadResponse(
+            predictor=name,
+            duration_seconds=round(duration, 3),
+            drained=drained,
+            memory_before_bytes=memory.start,
+            peak_memory_bytes=memory.peak,
+        )
+
+    async def _warm_up_instance(self, name: str, instance, routes) -> None:
+        """Warm up a new instance with the warm-up payloads of its routes"""
+        for route in routes:
+            if route.path not in self.warmups:
+                continue
+            _, payloads, iterations = self.warmups[route.path]
+            response_model = (
+                None
+                if is_streaming_handler(instance.predict)
+                else get_predictor_handler_return_type(instance)
+            )
+            handler = wrap_handler(
+                descriptor=name,
+                original_handler=instance.predict,
+                response_model=response_model,
+                config=self.config,
+            )
+            await warm_up_route(route.path, handler, payloads, iterations, self._logger)
+
+    def _add_reload_signal_handler(self) -> None:
+        if not (self._reload_config and self._reload_config.signal):
+            return
+        try:
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGHUP, self._reload_on_signal
+            )
+        except (NotImplementedError, RuntimeError, ValueError) as e:
+            # Only the main thread of the process can handle signals
+            self._logger.warning(
+                "Unable to reload predictors on SIGHUP", extra={"error": str(e)}
+            )
+
+    def _remove_reload_signal_handler(self) -> None:
+        if self._reload_config and self._reload_config.signal:
+            try:
+                asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass
+
+    def _reload_on_signal(self) -> None:
+        async def reload():
+            try:
+                await self.reload()
+            except Exception as e:
+                self._logger.error("Reload on SIGHUP failed", extra={"error": str(e)})
+
+        task = asyncio.create_task(reload())
+        self._reload_tasks.add(task)
+        task.add_done_callback(self._reload_tasks.discard)
+
+    async def _check_ready(self, request: Request):
+        if not self.startup.ready:
+            raise ServiceNotReadyError(request.url.path)
+
+    async def setup(self, app: FastAPI):
+        self._logger.info("Setting up application", extra={})
+        self.startup.set_state(SETTING_UP)
+        predictors = self.map_model_to_instance
+        # The event loop keeps serving while a background setup runs
+        in_thread = len(predictors) > 1 or self._background_setup
+
+        # Set up every predictor at the same time, so that startup takes as long
+        # as the slowest one instead of the sum of all of them.
+        await asyncio.gather(
+            *(
+                self._setup_predictor(name, predictor, in_thread=in_thread)
+                for name, predictor in predictors.items()
+            )
+        )
+
+    async def warm_up(self):
+        """Run the sample payloads of every route, all routes at the same time"""
+        if not self.warmups:
+            return
+
+        start_time = time.perf_counter()
+        await asyncio.gather(
+            *(
+                warm_up_route(path, handler, payloads, iterations, self._logger)
+                for path, (handler, payloads, iterations) in self.warmups.items()
+            )
+        )
+        self._logger.info(
+            "Application warmed up",
+            extra={
+                "routes": list(self.warmups),
+                "duration_ms": round((time.perf_counter() - start_time) * 1000, 2),
+            },
+        )
+
+    async def _setup_predictor(
+        self, name: str, predictor: BasePredictor, in_thread: bool
+    ):
+        self.startup.predictor_started(name)
+        try:
+            self._logger.debug(
+                "Setting up predictor",
+                extra={"predictor": predictor.__class__.__name__},
+            )
+            # if is courutine
+            if asyncio.iscoroutinefunction(predictor.setup):
+                await predictor.setup()
+            elif in_thread:
+                await asyncio.to_thread(predictor.setup)
+            else:
+                predictor.setup()
+        except Exception as e:
+            self.startup.predictor_finished(name, error=str(e))
+            self._logger.critical(
+                "Unable to setting up predictor",
+                extra={"predictor": predictor.__class__.__name__, "error": e},
+            )
+            raise SetupError(predictor.__class__.__name__, e)
+
+        duration = self.startup.predictor_finished(name)
+        setup_duration_histogram.record(duration * 1000, {"predictor": name})
+        self._logger.info(
+            "Predictor set up",
+            extra={"predictor": name, "duration_seconds": round(duration, 3)},
+        )
+
+    def run(self, workers: int = 1):
+        if workers > 1:
+            self._run_workers(workers)
+            return
 
-    def run(self):
         uvicorn.run(
             self.app,
             host=self.config.cogito.get_fastapi_host,
             port=self.config.cogito.get_fastapi_port,
         )
 
+    def _run_workers(self, workers: int):
+        """
+        Set up the predictors once and fork `workers` uvicorn processes that share
+        the loaded models and a single listening socket.
+        """
+        try:
+            asyncio.run(self.setup(self.app))
+        except SetupError as e:
+            self._logger.critical(
+                "Unable to start application",
+                extra={"error": e},
+            )
+            sys.exit(1)
+
+        self._setup_done = True
+        self._is_worker = True
+        # Workers are only reported to the supervisor once their lifespan is over
+        self._background_setup = False
+
+        config = uvicorn.Config(
+            self.app,
+            host=self.config.cogito.get_fastapi_host,
+            port=self.config.cogito.get_fastapi_port,
+        )
+        sock = config.bind_socket()
+
+        def serve(notify):
+            NotifyingServer(config, on_started=notify).run(sockets=[sock])
+
+        try:
+            WorkerSupervisor(
+                workers,
+                serve,
+                readiness_file=self.config.cogito.get_server_readiness_file,
+                logger=self._logger,
+            ).run()
+        finally:
+            sock.close()
+
     @classmethod
     def _get_default_logger(cls):
         return get_logger("cogito.app")
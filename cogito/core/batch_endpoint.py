@@ -0,0 +1,124 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from cogito.core.admission import AdmissionQueue
+from cogito.core.exceptions import BadRequestError
+from cogito.core.metrics import batch_endpoint_items_counter
+from cogito.core.streaming import MEDIA_TYPES, NDJSON, format_chunk
+
+
+async def read_items(request: Request, max_items: int) -> List[Tuple[Any, str]]:
+    """
+    Read the items of a batch request, either a JSON list or newline delimited
+    JSON. Each item comes with the error that prevented parsing it, if any.
+    """
+    content_type = request.headers.get("content-type", "")
+    if MEDIA_TYPES[NDJSON] in content_type:
+        items, buffer = [], b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            items.extend(_parse_line(line) for line in lines if line.strip())
+            if len(items) > max_items:
+                raise BadRequestError(f"A batch accepts up to {max_items} items")
+        if buffer.strip():
+            items.append(_parse_line(buffer))
+    else:
+        try:
+            payload = json.loads(await request.body())
+        except ValueError as e:
+            raise BadRequestError(f"Invalid JSON body: {e}")
+        if not isinstance(payload, list):
+            raise BadRequestError("The body of a batch request must be a JSON list")
+        items = [(item, None) for item in payload]
+
+    if len(items) > max_items:
+        raise BadRequestError(f"A batch accepts up to {max_items} items")
+    return items
+
+
+def _parse_line(line: bytes) -> Tuple[Any, str]:
+    try:
+        return json.loads(line), None
+    except ValueError as e:
+        return None, f"Invalid JSON: {e}"
+
+
+def create_batch_handler(
+    name: str,
+    invoke: Callable[[Dict[str, Any]], Awaitable[Any]],
+    input_model: type,
+    max_concurrency: int = 4,
+    max_items: int = 10000,
+    admission_queue: AdmissionQueue = None,
+) -> Callable:
+    """
+    Build the handler of the batch variant of a route. Items run through
+    ``invoke`` with up to ``max_concurrency`` of them in flight, and their results
+    are streamed back in order as NDJSON. An item that fails reports its error on
+    its own line, without failing the rest of the batch. Each item takes a slot of
+    the ``admission_queue`` of the route while it runs, like a request of the
+    route would.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be greater than 0")
+
+    async def admitted_invoke(dict_input: Dict[str, Any]) -> Tuple[Any, float]:
+        acquired_at = await admission_queue.acquire() if admission_queue else None
+        try:
+            start_time = time.time()
+            result = await invoke(dict_input)
+            return result, time.time() - start_time
+        finally:
+            if admission_queue:
+                admission_queue.release(acquired_at)
+
+    async def run_item(index: int, item: Any, error: str) -> Dict[str, Any]:
+        if error is None:
+            try:
+                dict_input = input_model.model_validate(item).model_dump()
+                result, inference_time_seconds = await admitted_invoke(dict_input)
+                batch_endpoint_items_counter.add(1, {"route": name, "status": "ok"})
+                return {
+                    "index": index,
+                    "inference_time_seconds": inference_time_seconds,
+                    "result": result,
+                }
+            except ValidationError as e:
+                error = str(e)
+            except Exception as e:
+                logging.exception(e)
+                error = str(e)
+
+        batch_endpoint_items_counter.add(1, {"route": name, "status": "error"})
+        return {"index": index, "error": error}
+
+    async def results(items: List[Tuple[Any, str]]) -> AsyncIterator[str]:
+        pending = deque()
+        try:
+            for index, (item, error) in enumerate(items):
+                pending.append(asyncio.ensure_future(run_item(index, item, error)))
+                # Emit in order, keeping at most max_concurrency items in flight
+                while len(pending) >= max_concurrency or (
+                    pending and pending[0].done()
+                ):
+                    yield format_chunk(await pending.popleft(), NDJSON)
+            while pending:
+                yield format_chunk(await pending.popleft(), NDJSON)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def handler(request: Request):
+        items = await read_items(request, max_items)
+        return StreamingResponse(results(items), media_type=MEDIA_TYPES[NDJSON])
+
+    return handler
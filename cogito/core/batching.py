@@ -0,0 +1,147 @@
+import asyncio
+import inspect
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from cogito.core.metrics import (
+    batch_queue_wait_histogram,
+    batch_size_histogram,
+    inference_duration_histogram,
+)
+
+
+class MicroBatcher:
+    """
+    Collects requests arriving within a short window and runs them as a single
+    ``predict_batch`` call, fanning the results back out to each caller.
+
+    A batch is dispatched as soon as it reaches ``max_batch_size`` items or when
+    ``max_wait_ms`` have passed since its first item arrived. At most
+    ``concurrency`` batches run at the same time. Synchronous batch handlers run
+    on ``executor``, or on the loop's default executor when it is not given.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        batch_handler: Callable,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+        concurrency: int = 1,
+        executor: Optional[Executor] = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be greater than 0")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must not be negative")
+
+        self.name = name
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.concurrency = max(1, concurrency or 1)
+
+        self.batch_handler = batch_handler
+        self._executor = executor
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Dict[str, Any]) -> Any:
+        """Queue a single input and wait for its result."""
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future, time.monotonic()))
+        return await future
+
+    async def close(self) -> None:
+        """Stop collecting batches and fail any request still waiting."""
+        tasks = list(self._running)
+        if self._worker is not None:
+            tasks.append(self._worker)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        while self._queue is not None and not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError(f"{self.name} batcher closed"))
+        self._worker = None
+
+    def _ensure_started(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.concurrency)
+            self._worker = asyncio.create_task(self._collect())
+
+    async def _collect(self) -> None:
+        max_wait = self.max_wait_ms / 1000
+        while True:
+            # Wait for a free slot first, so that requests arriving while every
+            # slot is busy pile up in the queue and form the next batch.
+            await self._slots.acquire()
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + max_wait
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    if timeout <= 0:
+                        batch.append(self._queue.get_nowait())
+                    else:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+
+            task = asyncio.create_task(self._execute(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _execute(self, batch: List[Tuple[Dict[str, Any], asyncio.Future, float]]):
+        try:
+            # Drop requests whose caller is already gone
+            batch = [entry for entry in batch if not entry[1].done()]
+            if not batch:
+                return
+
+            now = time.monotonic()
+            for _, _, enqueued_at in batch:
+                batch_queue_wait_histogram.record(
+                    (now - enqueued_at) * 1000, {"predictor": self.name}
+                )
+            batch_size_histogram.record(len(batch), {"predictor": self.name})
+
+            items = [item for item, _, _ in batch]
+            start_time = time.time()
+            if inspect.iscoroutinefunction(self.batch_handler):
+                results = await self.batch_handler(items)
+            else:
+                results = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self.batch_handler, items
+                )
+            inference_duration_histogram.record(
+                (time.time() - start_time) * 1000,
+                {"predictor": self.name, "batched": True},
+            )
+
+            results = list(results)
+            if len(results) != len(items):
+                raise ValueError(
+                    f"predict_batch of {self.name} returned {len(results)} results "
+                    f"for {len(items)} inputs"
+                )
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError(f"{self.name} batcher closed"))
+            self._slots.release()
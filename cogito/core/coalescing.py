@@ -0,0 +1,64 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from cogito.core.metrics import coalesced_requests_counter
+
+
+class SharedCall:
+    """Progress of a coalesced call, and the number of requests waiting for it"""
+
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.waiting = 0
+
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight calls.
+
+    The first call for a key runs ``fn`` in its own task, and every call for the
+    same key made before it finishes awaits that task instead of running ``fn``
+    again. Cancelling one of the callers does not cancel the shared call.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call, _ = self.join(key, fn)
+        return await asyncio.shield(call)
+
+    def join(
+        self, key: str, fn: Callable[[], Awaitable[Any]]
+    ) -> Tuple[asyncio.Future, bool]:
+        """The in-flight call for the key, and whether this caller started it"""
+        call = self._calls.get(key)
+        if call is not None:
+            coalesced_requests_counter.add(1, {"route": self.name})
+            return call, False
+
+        call = asyncio.ensure_future(fn())
+        self._calls[key] = call
+        call.add_done_callback(lambda done: self._forget(key, done))
+        return call, True
+
+    def cancel(self, key: str, call: asyncio.Future) -> None:
+        """Cancel a call nobody waits for anymore, the next calls run ``fn`` again"""
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        call.cancel()
+
+    def clear(self) -> None:
+        """Make the next calls run ``fn`` again, while running calls finish"""
+        self._calls.clear()
+
+    def _forget(self, key: str, call: asyncio.Future) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Mark the exception as retrieved, in case every caller went away
+        if not call.cancelled():
+            call.exception()
@@ -156,6 +156,10 @@ class CogitoConfig(BaseModel, ConfigInterface):
     def get_route_path(self) -> str:
         return self.server.route.path
 
+    @property
+    def get_routes(self) -> list[RouteConfig]:
+        return [self.server.route]
+
     @property
     def get_route_name(self) -> str:
         return self.server.route.name
@@ -1,8 +1,31 @@
 """V1 configuration models"""
 
 from cogito.core.config.v1.base import CogitoConfig
+from cogito.core.config.v1.concurrency import AdaptiveConcurrencyConfig
+from cogito.core.config.v1.batch_endpoint import BatchEndpointConfig
+from cogito.core.config.v1.batching import BatchingConfig
+from cogito.core.config.v1.cache import CacheConfig
 from cogito.core.config.v1.fastapi import FastAPIConfig
+from cogito.core.config.v1.jobs import JobsConfig
+from cogito.core.config.v1.model_cache import ModelCacheConfig
+from cogito.core.config.v1.queue import QueueConfig
+from cogito.core.config.v1.reload import ReloadConfig
 from cogito.core.config.v1.route import RouteConfig
 from cogito.core.config.v1.server import ServerConfig
+from cogito.core.config.v1.warmup import WarmupConfig
 
-__all__ = ["CogitoConfig", "FastAPIConfig", "RouteConfig", "ServerConfig"]
+__all__ = [
+    "AdaptiveConcurrencyConfig",
+    "BatchEndpointConfig",
+    "BatchingConfig",
+    "CacheConfig",
+    "CogitoConfig",
+    "FastAPIConfig",
+    "JobsConfig",
+    "ModelCacheConfig",
+    "QueueConfig",
+    "ReloadConfig",
+    "RouteConfig",
+    "ServerConfig",
+    "WarmupConfig",
+]
@@ -1,4 +1,4 @@
-from typing import Type
+from typing import List, Type
 
 from cogito.core.config.v0.base import CogitoConfig as v0
 
@@ -12,6 +12,7 @@ class CogitoConfig(v0):
     Cogito configuration.
     """
 
+    server: ServerConfig
     predictor: str = ""
 
     @classmethod
@@ -22,10 +23,47 @@ class CogitoConfig(v0):
             predictor="predict:Predictor",
         )
 
+    @classmethod
+    def get_server_config_class(cls) -> Type[ServerConfig]:
+        """Get the ServerConfig class."""
+        return ServerConfig
+
+    @classmethod
+    def get_fastapi_config_class(cls) -> Type[FastAPIConfig]:
+        """Get the FastAPIConfig class."""
+        return FastAPIConfig
+
+    @classmethod
+    def get_route_config_class(cls) -> Type[RouteConfig]:
+        """Get the RouteConfig class."""
+        return RouteConfig
+
     @property
     def get_predictor(self):
         return self.predictor
 
+    @property
+    def get_routes(self) -> List[RouteConfig]:
+        """
+        Get the routes to serve: every entry of `server.routes` or, when it is not
+        set, the single `server.route`. Routes without a predictor use `predictor`.
+        """
+        if self.server.routes:
+            routes = self.server.routes
+        elif self.server.route:
+            routes = [self.server.route]
+        else:
+            routes = []
+
+        return [
+            (
+                route
+                if route.predictor
+                else route.model_copy(update={"predictor": self.predictor})
+            )
+            for route in routes
+        ]
+
     def upgrade(self, version: int, config: v0):
         """Upgrade the configuration to a newer version."""
 
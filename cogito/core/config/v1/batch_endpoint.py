@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+
+class BatchEndpointConfig(BaseModel):
+    """
+    Batch endpoint configuration.
+    """
+
+    max_concurrency: int = 4
+    max_items: int = 10000
+
+    @classmethod
+    def default(cls):
+        return cls()
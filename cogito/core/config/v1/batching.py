@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+
+class BatchingConfig(BaseModel):
+    """
+    Dynamic micro-batching configuration.
+    """
+
+    max_batch_size: int = 8
+    max_wait_ms: float = 5.0
+
+    @classmethod
+    def default(cls):
+        return cls()
@@ -0,0 +1,17 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class CacheConfig(BaseModel):
+    """
+    Response cache configuration.
+    """
+
+    max_entries: int = 1024
+    ttl_seconds: Optional[float] = 300.0
+    no_cache_params: List[str] = []
+
+    @classmethod
+    def default(cls):
+        return cls()
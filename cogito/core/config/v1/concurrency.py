@@ -0,0 +1,19 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class AdaptiveConcurrencyConfig(BaseModel):
+    """
+    Adaptive concurrency limit configuration.
+    """
+
+    initial_limit: Optional[int] = None
+    min_limit: int = 1
+    max_limit: int = 64
+    backoff: float = 0.9
+    tolerance: float = 1.5
+
+    @classmethod
+    def default(cls):
+        return cls()
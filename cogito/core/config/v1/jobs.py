@@ -0,0 +1,19 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+
+class JobsConfig(BaseModel):
+    """
+    Asynchronous jobs configuration.
+    """
+
+    workers: int = 1
+    max_jobs: int = 1000
+    result_ttl_seconds: float = 3600.0
+    backend: Literal["memory", "sqlite"] = "memory"
+    path: Optional[str] = None
+
+    @classmethod
+    def default(cls):
+        return cls()
@@ -0,0 +1,21 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ModelCacheConfig(BaseModel):
+    """
+    Model cache configuration.
+    """
+
+    max_size_gb: Optional[float] = None
+
+    @classmethod
+    def default(cls):
+        return cls()
+
+    @property
+    def max_size_bytes(self) -> Optional[int]:
+        if self.max_size_gb is None:
+            return None
+        return int(self.max_size_gb * 1024**3)
@@ -0,0 +1,16 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class QueueConfig(BaseModel):
+    """
+    Admission queue configuration.
+    """
+
+    max_depth: int = 64
+    max_wait_ms: Optional[float] = 1000.0
+
+    @classmethod
+    def default(cls):
+        return cls()
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class ReloadConfig(BaseModel):
+    """
+    Hot reload configuration.
+    """
+
+    # The endpoint has no authentication, so it is only exposed on request
+    admin_endpoint: bool = False
+    signal: bool = True
+    drain_timeout_seconds: float = 60.0
+
+    @classmethod
+    def default(cls):
+        return cls()
@@ -1,5 +1,12 @@
-from typing import Optional
+from typing import Literal, Optional
 from cogito.core.config.v0.route import RouteConfig as v0
+from cogito.core.config.v1.batch_endpoint import BatchEndpointConfig
+from cogito.core.config.v1.batching import BatchingConfig
+from cogito.core.config.v1.cache import CacheConfig
+from cogito.core.config.v1.concurrency import AdaptiveConcurrencyConfig
+from cogito.core.config.v1.jobs import JobsConfig
+from cogito.core.config.v1.queue import QueueConfig
+from cogito.core.config.v1.warmup import WarmupConfig
 
 
 class RouteConfig(v0):
@@ -8,6 +15,19 @@ class RouteConfig(v0):
     """
 
     predictor: Optional[str] = None
+    threads: Optional[int] = None
+    batching: Optional[BatchingConfig] = None
+    queue: Optional[QueueConfig] = None
+    execution: Optional[Literal["event_loop", "thread", "process"]] = None
+    stream_format: Optional[Literal["sse", "ndjson"]] = None
+    cache: Optional[CacheConfig] = None
+    coalesce: bool = False
+    response_mode: Optional[Literal["validated", "fast"]] = None
+    jobs: Optional[JobsConfig] = None
+    batch_endpoint: Optional[BatchEndpointConfig] = None
+    timeout_ms: Optional[float] = None
+    adaptive_concurrency: Optional[AdaptiveConcurrencyConfig] = None
+    warmup: Optional[WarmupConfig] = None
 
     @classmethod
     def default(cls):
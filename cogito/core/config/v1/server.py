@@ -1,5 +1,7 @@
-from typing import Optional
+from typing import List, Optional
 from cogito.core.config.v0.server import ServerConfig as v0
+from cogito.core.config.v1.model_cache import ModelCacheConfig
+from cogito.core.config.v1.reload import ReloadConfig
 from cogito.core.config.v1.route import RouteConfig
 
 
@@ -8,7 +10,11 @@ class ServerConfig(v0):
     Server configuration.
     """
 
-    route: Optional[RouteConfig]
+    route: Optional[RouteConfig] = None
+    routes: Optional[List[RouteConfig]] = None
+    background_setup: bool = False
+    reload: Optional[ReloadConfig] = None
+    model_cache: Optional[ModelCacheConfig] = None
 
     @classmethod
     def default(cls):
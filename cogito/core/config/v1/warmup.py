@@ -0,0 +1,17 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class WarmupConfig(BaseModel):
+    """
+    Warm-up configuration.
+    """
+
+    payloads: List[Dict[str, Any]] = []
+    file: Optional[str] = None
+    iterations: int = 1
+
+    @classmethod
+    def default(cls):
+        return cls()
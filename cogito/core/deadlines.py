@@ -0,0 +1,145 @@
+import asyncio
+import math
+from typing import TYPE_CHECKING, Any, Optional
+
+from cogito.core.admission import AdmissionQueue
+from cogito.core.exceptions import (
+    BadRequestError,
+    ClientDisconnectedError,
+    DeadlineExceededError,
+    NoThreadsAvailableError,
+)
+from cogito.core.metrics import dropped_requests_counter
+
+if TYPE_CHECKING:
+    from starlette.requests import Request
+
+# Relative timeout of a request, in milliseconds from its arrival
+DEADLINE_HEADER = "x-request-timeout-ms"
+
+# Reasons why a request is dropped before its inference
+EXPIRED_BEFORE_INFERENCE = "expired_before_inference"
+EXPIRED_IN_QUEUE = "expired_in_queue"
+CLIENT_DISCONNECTED = "client_disconnected"
+
+
+def get_deadline(
+    request: Optional["Request"], default_timeout_ms: Optional[float] = None
+) -> Optional[float]:
+    """
+    Event loop time by which the request must start its inference, from the
+    deadline header or the route default timeout, whichever is the earliest.
+    """
+    timeouts = []
+    if default_timeout_ms:
+        timeouts.append(default_timeout_ms)
+
+    header = request.headers.get(DEADLINE_HEADER) if request is not None else None
+    if header is not None:
+        try:
+            timeout = float(header)
+        except ValueError:
+            timeout = math.nan
+        # nan would disable the deadline, and inf is no deadline at all
+        if not math.isfinite(timeout):
+            raise BadRequestError(f"Invalid {DEADLINE_HEADER} header: {header}")
+        timeouts.append(timeout)
+
+    if not timeouts:
+        return None
+    return asyncio.get_running_loop().time() + min(timeouts) / 1000
+
+
+def check_deadline(deadline: Optional[float], name: str) -> None:
+    """Drop the request if its deadline passed, before running its inference"""
+    if deadline is not None and asyncio.get_running_loop().time() >= deadline:
+        dropped_requests_counter.add(
+            1, {"predictor": name, "reason": EXPIRED_BEFORE_INFERENCE}
+        )
+        raise DeadlineExceededError(name)
+
+
+async def wait_until_started(
+    call: asyncio.Future,
+    started: asyncio.Event,
+    deadline: Optional[float],
+    name: str,
+) -> Any:
+    """
+    Wait for the result of a call shared with other requests, giving up when the
+    deadline passes before the call started its inference. The call itself goes
+    on for the other requests.
+    """
+    if deadline is not None and not started.is_set():
+        waiter = asyncio.ensure_future(started.wait())
+        try:
+            timeout = max(deadline - asyncio.get_running_loop().time(), 0)
+            done, _ = await asyncio.wait(
+                [waiter, call], timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            waiter.cancel()
+        if not done:
+            dropped_requests_counter.add(
+                1, {"predictor": name, "reason": EXPIRED_IN_QUEUE}
+            )
+            raise DeadlineExceededError(name)
+
+    return await asyncio.shield(call)
+
+
+async def wait_for_disconnect(request: "Request") -> None:
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def acquire_before_deadline(
+    queue: AdmissionQueue,
+    request: Optional["Request"],
+    deadline: Optional[float],
+    name: str,
+) -> float:
+    """
+    Wait for a slot of the admission queue, giving up when the deadline passes or
+    when the client disconnects while the request is still queued. Returns the
+    time the slot was granted, as ``AdmissionQueue.acquire`` does.
+    """
+    if not queue.locked() or (deadline is None and request is None):
+        return await queue.acquire()
+
+    loop = asyncio.get_running_loop()
+    acquire = asyncio.ensure_future(queue.acquire())
+    waiters = [acquire]
+    if request is not None:
+        waiters.append(asyncio.ensure_future(wait_for_disconnect(request)))
+
+    acquired = False
+    try:
+        timeout = max(deadline - loop.time(), 0) if deadline is not None else None
+        done, _ = await asyncio.wait(
+            waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        if acquire in done:
+            acquired_at = acquire.result()
+            acquired = True
+            return acquired_at
+
+        reason = CLIENT_DISCONNECTED if done else EXPIRED_IN_QUEUE
+        dropped_requests_counter.add(1, {"predictor": name, "reason": reason})
+        if done:
+            raise ClientDisconnectedError(name)
+        raise DeadlineExceededError(name)
+    finally:
+        for waiter in waiters[1:]:
+            waiter.cancel()
+        if not acquired:
+            acquire.cancel()
+            try:
+                await acquire
+            except (asyncio.CancelledError, NoThreadsAvailableError):
+                pass
+            else:
+                # The slot was granted while giving up on it, without being used
+                queue.release()
@@ -3,7 +3,16 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from fastapi.encoders import jsonable_encoder
 
-from cogito.core.exceptions import NoThreadsAvailableError, BadRequestError
+from cogito.core.exceptions import (
+    BadRequestError,
+    ClientDisconnectedError,
+    DeadlineExceededError,
+    JobNotFoundError,
+    JobStoreFullError,
+    NoThreadsAvailableError,
+    ReloadError,
+    ServiceNotReadyError,
+)
 
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -43,3 +52,81 @@ async def bad_request_exception_handler(
             }
         ),
     )
+
+
+async def job_not_found_exception_handler(
+    request: Request, exc: JobNotFoundError
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_404_NOT_FOUND,
+        content=jsonable_encoder(
+            {
+                "detail": str(exc),
+            }
+        ),
+    )
+
+
+async def job_store_full_exception_handler(
+    request: Request, exc: JobStoreFullError
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content=jsonable_encoder(
+            {
+                "detail": "There are too many jobs pending, try again later.",
+            }
+        ),
+    )
+
+
+async def deadline_exceeded_exception_handler(
+    request: Request, exc: DeadlineExceededError
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content=jsonable_encoder(
+            {
+                "detail": "The request deadline expired before it could be processed.",
+            }
+        ),
+    )
+
+
+async def client_disconnected_exception_handler(
+    request: Request, exc: ClientDisconnectedError
+) -> JSONResponse:
+    # Nobody is listening anymore, 499 is the usual "client closed request" code
+    return JSONResponse(
+        status_code=499,
+        content=jsonable_encoder(
+            {
+                "detail": "The client disconnected before the request was processed.",
+            }
+        ),
+    )
+
+
+async def service_not_ready_exception_handler(
+    request: Request, exc: ServiceNotReadyError
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=jsonable_encoder(
+            {
+                "detail": "The model is still loading, try again later.",
+            }
+        ),
+        headers={"Retry-After": "5"},
+    )
+
+
+async def reload_exception_handler(request: Request, exc: ReloadError) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content=jsonable_encoder(
+            {
+                "detail": f"{exc} The previous predictor keeps serving.",
+            }
+        ),
+    )
@@ -32,3 +32,33 @@ class BadRequestError(Exception):
 class NoSetupMethodError(Exception):
     def __init__(self, class_name: str):
         super().__init__(f"No setup method found for {class_name}")
+
+
+class JobNotFoundError(Exception):
+    def __init__(self, job_id: str):
+        super().__init__(f"Job not found: {job_id}")
+
+
+class JobStoreFullError(Exception):
+    def __init__(self, name: str):
+        super().__init__(f"Too many jobs stored for {name}")
+
+
+class DeadlineExceededError(Exception):
+    def __init__(self, name: str):
+        super().__init__(f"Request deadline exceeded before running {name}")
+
+
+class ClientDisconnectedError(Exception):
+    def __init__(self, name: str):
+        super().__init__(f"Client disconnected while waiting for {name}")
+
+
+class ServiceNotReadyError(Exception):
+    def __init__(self, name: str):
+        super().__init__(f"{name} is not ready yet")
+
+
+class ReloadError(Exception):
+    def __init__(self, predictor: str, error: Exception):
+        super().__init__(f"Unable to reload predictor {predictor}: {error}")
@@ -0,0 +1,174 @@
+import asyncio
+import functools
+import inspect
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from cogito.core.metrics import event_loop_lag_histogram, event_loop_stall_counter
+
+# Execution modes of a route
+EVENT_LOOP = "event_loop"
+THREAD = "thread"
+PROCESS = "process"
+
+EXECUTION_MODES = (EVENT_LOOP, THREAD, PROCESS)
+
+# Predictors available to the worker processes of routes in process mode. The
+# workers are forked once the predictors are set up, so they inherit them as is.
+_process_predictors: Dict[str, Any] = {}
+
+_thread_local = threading.local()
+
+
+class _ThreadEventLoop:
+    """Event loop owned by a worker thread, closed when the thread goes away"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+
+    def __del__(self):
+        self.loop.close()
+
+
+def default_execution_mode(handler: Callable) -> str:
+    """Coroutines run on the event loop and plain functions on a thread"""
+    return EVENT_LOOP if inspect.iscoroutinefunction(handler) else THREAD
+
+
+def register_process_predictor(descriptor: str, predictor: Any) -> None:
+    _process_predictors[descriptor] = predictor
+
+
+def predict_in_process(descriptor: str, kwargs: Dict[str, Any]) -> Any:
+    """Run the predict method of a registered predictor, in a worker process"""
+    predictor = _process_predictors[descriptor]
+    if inspect.iscoroutinefunction(predictor.predict):
+        return asyncio.run(predictor.predict(**kwargs))
+    return predictor.predict(**kwargs)
+
+
+def run_coroutine_in_thread(coroutine_function: Callable, **kwargs) -> Any:
+    """
+    Run a coroutine function to completion from a worker thread, on an event
+    loop owned by that thread and reused across calls.
+    """
+    thread_loop = getattr(_thread_local, "event_loop", None)
+    if thread_loop is None:
+        thread_loop = _thread_local.event_loop = _ThreadEventLoop()
+    return thread_loop.loop.run_until_complete(coroutine_function(**kwargs))
+
+
+def create_invoker(
+    descriptor: str,
+    handler: Callable,
+    mode: str,
+    executor: Optional[Executor] = None,
+) -> Callable[[Dict[str, Any]], Awaitable[Any]]:
+    """
+    Build a coroutine function that calls ``handler`` with a dict of keyword
+    arguments according to the execution mode of the route.
+    """
+    is_coroutine = inspect.iscoroutinefunction(handler)
+
+    if mode == EVENT_LOOP:
+        if is_coroutine:
+
+            async def invoke(kwargs: Dict[str, Any]) -> Any:
+                return await handler(**kwargs)
+
+        else:
+
+            async def invoke(kwargs: Dict[str, Any]) -> Any:
+                return handler(**kwargs)
+
+    elif mode == THREAD:
+        target = (
+            functools.partial(run_coroutine_in_thread, handler)
+            if is_coroutine
+            else handler
+        )
+
+        async def invoke(kwargs: Dict[str, Any]) -> Any:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, functools.partial(target, **kwargs)
+            )
+
+    elif mode == PROCESS:
+
+        async def invoke(kwargs: Dict[str, Any]) -> Any:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, predict_in_process, descriptor, kwargs
+            )
+
+    else:
+        raise ValueError(f"Unknown execution mode: {mode}")
+
+    return invoke
+
+
+class ForkProcessExecutor(Executor):
+    """
+    Process pool created on first use, by the process that uses it, so that
+    pre-forked server workers never share the pipes of a single pool.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("fork"),
+                )
+                self._pid = os.getpid()
+        return self._pool.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+            self._pool = None
+
+
+class EventLoopMonitor:
+    """
+    Measures how late the event loop wakes up from a fixed sleep. Any lag is
+    time the loop spent blocked, unable to serve other requests.
+    """
+
+    def __init__(self, interval_ms: float = 100.0, stall_threshold_ms: float = 100.0):
+        self.interval_ms = interval_ms
+        self.stall_threshold_ms = stall_threshold_ms
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval = self.interval_ms / 1000
+        while True:
+            start_time = loop.time()
+            await asyncio.sleep(interval)
+            lag_ms = (loop.time() - start_time - interval) * 1000
+            event_loop_lag_histogram.record(max(lag_ms, 0.0))
+            if lag_ms >= self.stall_threshold_ms:
+                event_loop_stall_counter.add(1)
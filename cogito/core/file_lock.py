@@ -0,0 +1,179 @@
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+from cogito.core.logging import get_logger
+
+# A lock whose owner stopped refreshing it for this long is stale
+DEFAULT_STALE_SECONDS = 60.0
+DEFAULT_POLL_SECONDS = 0.5
+
+_logger = get_logger("cogito.file_lock")
+
+
+class FileLock:
+    """
+    Lock shared by the processes using the same directory, including processes
+    of other hosts on a shared volume.
+
+    The lock is a file created exclusively, holding the host, pid and a unique
+    token of its owner. The owner refreshes its modification time from a thread
+    while it holds the lock. A lock is stale, and taken over, when its owner is
+    a process of the same host that no longer exists, or when it was not
+    refreshed for ``stale_seconds``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        stale_seconds: float = DEFAULT_STALE_SECONDS,
+        poll_seconds: float = DEFAULT_POLL_SECONDS,
+    ):
+        self.path = path
+        self.stale_seconds = stale_seconds
+        self.poll_seconds = poll_seconds
+        self.token: Optional[str] = None
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    @property
+    def locked(self) -> bool:
+        return self.token is not None
+
+    def acquire(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for the lock, for up to ``timeout`` seconds. Raises ``TimeoutError``
+        when it is still held by another process by then.
+        """
+        if self.locked:
+            raise RuntimeError(f"Lock already acquired: {self.path}")
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        waiting = False
+        while not self._try_acquire():
+            owner = read_lock_owner(self.path)
+            if owner is not None and self.is_stale(owner):
+                self._break(owner)
+                continue
+
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Timed out waiting for lock {self.path}")
+            if not waiting:
+                waiting = True
+                _logger.info(
+                    "Waiting for lock",
+                    extra={"lock": self.path, "owner": owner},
+                )
+            time.sleep(self.poll_seconds)
+
+        self._stop.clear()
+        self._heartbeat = threading.Thread(
+            target=self._refresh, name="cogito-lock-heartbeat", daemon=True
+        )
+        self._heartbeat.start()
+
+    def release(self) -> None:
+        if not self.locked:
+            return
+
+        self._stop.set()
+        self._heartbeat.join()
+        owner = read_lock_owner(self.path)
+        # A lock taken over after being seen as stale is not ours anymore
+        if owner is not None and owner.get("token") == self.token:
+            os.remove(self.path)
+        self.token = None
+
+    def is_stale(self, owner: Dict) -> bool:
+        if owner.get("host") == socket.gethostname() and not pid_exists(
+            owner.get("pid", 0)
+        ):
+            return True
+        try:
+            age = time.time() - os.path.getmtime(self.path)
+        except FileNotFoundError:
+            return False
+        return age > self.stale_seconds
+
+    def _try_acquire(self) -> bool:
+        token = uuid.uuid4().hex
+        try:
+            fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+
+        owner = {
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "token": token,
+            "acquired_at": time.time(),
+        }
+        with os.fdopen(fd, "w") as f:
+            json.dump(owner, f)
+        self.token = token
+        return True
+
+    def _break(self, owner: Dict) -> None:
+        # Move the lock away first, so that only one of the processes that saw
+        # it stale removes it
+        broken = f"{self.path}.{uuid.uuid4().hex}.stale"
+        try:
+            os.rename(self.path, broken)
+        except FileNotFoundError:
+            return
+
+        moved = read_lock_owner(broken)
+        if moved is not None and moved.get("token") != owner.get("token"):
+            # Another process broke it first and acquired it since, give it back
+            try:
+                os.link(broken, self.path)
+            except FileExistsError:
+                pass
+        else:
+            _logger.warning(
+                "Stale lock broken", extra={"lock": self.path, "owner": owner}
+            )
+        os.remove(broken)
+
+    def _refresh(self) -> None:
+        while not self._stop.wait(self.stale_seconds / 4):
+            try:
+                os.utime(self.path)
+            except FileNotFoundError:
+                return
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+def read_lock_owner(path: str) -> Optional[Dict]:
+    """Owner of a lock file, or None if there is no lock"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        # Being written by its owner right now
+        return {}
+
+
+def pid_exists(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
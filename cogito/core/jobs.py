@@ -0,0 +1,389 @@
+import asyncio
+from abc import ABC, abstractmethod
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import Query
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from cogito.api.responses import ErrorResponse, JobResponse, ResultResponse
+from cogito.core.exceptions import JobNotFoundError, JobStoreFullError
+from cogito.core.metrics import (
+    job_duration_histogram,
+    jobs_finished_counter,
+    jobs_pending,
+)
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+FINISHED = (SUCCEEDED, FAILED)
+
+# Longest a status or result request may wait for a job to finish
+MAX_WAIT_SECONDS = 60.0
+
+
+class Job(BaseModel):
+    id: str
+    status: str = QUEUED
+    payload: Dict[str, Any]
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def to_response(self) -> JobResponse:
+        return JobResponse(**self.model_dump(exclude={"payload", "result"}))
+
+
+class JobStore(ABC):
+    """
+    Storage of the jobs of a route. Finished jobs are kept for
+    ``result_ttl_seconds``, and at most ``max_jobs`` jobs are stored at a time.
+    """
+
+    def __init__(self, name: str, max_jobs: int = 1000, result_ttl_seconds=3600.0):
+        self.name = name
+        self.max_jobs = max_jobs
+        self.result_ttl_seconds = result_ttl_seconds
+
+    def add(self, job: Job) -> None:
+        self.purge()
+        if self.count() >= self.max_jobs:
+            raise JobStoreFullError(self.name)
+        self.save(job)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        job = self._load(job_id)
+        if job is not None and self._expired(job, time.time()):
+            return None
+        return job
+
+    def _expired(self, job: Job, now: float) -> bool:
+        return job.finished and job.finished_at + self.result_ttl_seconds < now
+
+    @abstractmethod
+    def count(self) -> int:
+        pass
+
+    @abstractmethod
+    def save(self, job: Job) -> None:
+        pass
+
+    @abstractmethod
+    def unfinished(self) -> List[Job]:
+        pass
+
+    @abstractmethod
+    def purge(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    @abstractmethod
+    def _load(self, job_id: str) -> Optional[Job]:
+        pass
+
+
+class MemoryJobStore(JobStore):
+    """Jobs kept in the memory of the process, lost on restart"""
+
+    def __init__(self, name: str, max_jobs: int = 1000, result_ttl_seconds=3600.0):
+        super().__init__(name, max_jobs, result_ttl_seconds)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    def count(self) -> int:
+        return len(self._jobs)
+
+    def save(self, job: Job) -> None:
+        self._jobs[job.id] = job
+
+    def unfinished(self) -> List[Job]:
+        return [job for job in self._jobs.values() if not job.finished]
+
+    def purge(self) -> None:
+        now = time.time()
+        expired = [key for key, job in self._jobs.items() if self._expired(job, now)]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _load(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+
+class SQLiteJobStore(JobStore):
+    """
+    Jobs kept in a SQLite database, so that results survive restarts. Several
+    routes may share the same database file.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        max_jobs: int = 1000,
+        result_ttl_seconds=3600.0,
+    ):
+        super().__init__(name, max_jobs, result_ttl_seconds)
+        self.path = path
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, route TEXT NOT NULL, status TEXT NOT NULL, "
+                "finished_at REAL, data TEXT NOT NULL)"
+            )
+
+    def count(self) -> int:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE route = ?", (self.name,)
+            ).fetchone()
+        return row[0]
+
+    def save(self, job: Job) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO jobs (id, route, status, finished_at, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job.id, self.name, job.status, job.finished_at, job.model_dump_json()),
+            )
+
+    def unfinished(self) -> List[Job]:
+        placeholders = ", ".join("?" for _ in FINISHED)
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT data FROM jobs WHERE route = ? "
+                f"AND status NOT IN ({placeholders})",
+                (self.name, *FINISHED),
+            ).fetchall()
+        return [Job.model_validate_json(row[0]) for row in rows]
+
+    def purge(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM jobs WHERE route = ? AND finished_at < ?",
+                (self.name, time.time() - self.result_ttl_seconds),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _load(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM jobs WHERE id = ? AND route = ?",
+                (job_id, self.name),
+            ).fetchone()
+        return Job.model_validate_json(row[0]) if row else None
+
+
+class JobRunner:
+    """
+    Runs the jobs of a route with ``workers`` concurrent workers, calling
+    ``invoke`` (the route predictor) with the payload of each job. Jobs left
+    unfinished by a previous run of a persistent store are run again on start.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        store: JobStore,
+        invoke: Callable[[Dict[str, Any]], Awaitable[Any]],
+        workers: int = 1,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be greater than 0")
+
+        self.name = name
+        self.store = store
+        self.invoke = invoke
+        self.workers = workers
+
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self._finished: Dict[str, asyncio.Event] = {}
+
+    async def start(self) -> None:
+        for job in self.store.unfinished():
+            job.status = QUEUED
+            job.started_at = None
+            self.store.save(job)
+            self._enqueue(job.id)
+
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.store.close()
+
+    def submit(self, payload: Dict[str, Any]) -> Job:
+        job = Job(id=uuid.uuid4().hex, payload=payload, created_at=time.time())
+        self.store.add(job)
+        self._enqueue(job.id)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        job = self.store.get(job_id)
+        if job is None:
+            raise JobNotFoundError(job_id)
+        return job
+
+    async def wait(self, job_id: str, timeout: float = 0) -> Job:
+        """Return the job once finished, or as it is after ``timeout`` seconds"""
+        job = self.get(job_id)
+        if job.finished or timeout <= 0:
+            return job
+
+        event = self._finished.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.get(job_id)
+
+    def _enqueue(self, job_id: str) -> None:
+        jobs_pending.add(1, {"route": self.name})
+        self._queue.put_nowait(job_id)
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self.store.get(job_id)
+                if job is not None:
+                    await self._run(job)
+            except Exception as e:
+                # A job the store cannot save must not stop the worker
+                logging.exception(e)
+                self._fail(job_id, e)
+            finally:
+                jobs_pending.add(-1, {"route": self.name})
+                event = self._finished.pop(job_id, None)
+                if event is not None:
+                    event.set()
+
+    async def _run(self, job: Job) -> None:
+        job.status = RUNNING
+        job.started_at = time.time()
+        self.store.save(job)
+
+        try:
+            job.result = await self.invoke(job.payload)
+            job.status = SUCCEEDED
+        except Exception as e:
+            logging.exception(e)
+            job.error = str(e)
+            job.status = FAILED
+
+        job.finished_at = time.time()
+        self.store.save(job)
+
+        jobs_finished_counter.add(1, {"route": self.name, "status": job.status})
+        job_duration_histogram.record(
+            (job.finished_at - job.created_at) * 1000, {"route": self.name}
+        )
+
+    def _fail(self, job_id: str, error: Exception) -> None:
+        """Save a job as failed, without the result that could not be stored"""
+        try:
+            job = self.store.get(job_id)
+            if job is None:
+                return
+            job.result = None
+            job.error = str(error)
+            job.status = FAILED
+            job.finished_at = time.time()
+            self.store.save(job)
+        except Exception as e:
+            logging.exception(e)
+            return
+
+        jobs_finished_counter.add(1, {"route": self.name, "status": FAILED})
+
+
+def create_job_store(name: str, jobs_config, cache_dir: Optional[str]) -> JobStore:
+    if jobs_config.backend == "sqlite":
+        path = jobs_config.path or os.path.join(cache_dir or ".", "jobs.sqlite")
+        return SQLiteJobStore(
+            name,
+            path,
+            max_jobs=jobs_config.max_jobs,
+            result_ttl_seconds=jobs_config.result_ttl_seconds,
+        )
+    return MemoryJobStore(
+        name,
+        max_jobs=jobs_config.max_jobs,
+        result_ttl_seconds=jobs_config.result_ttl_seconds,
+    )
+
+
+def create_job_handlers(
+    runner: JobRunner,
+    input_model: type,
+    response_model: ResultResponse,
+    return_input: bool = True,
+):
+    """Build the submit, status and result handlers of the jobs of a route"""
+
+    async def submit_handler(input):
+        try:
+            dict_input = input.model_dump()
+        except:
+            dict_input = input.dict()
+
+        return runner.submit(dict_input).to_response()
+
+    submit_handler.__annotations__ = {"input": input_model, "return": JobResponse}
+
+    async def status_handler(
+        job_id: str, wait: float = Query(0, ge=0, le=MAX_WAIT_SECONDS)
+    ) -> JobResponse:
+        job = await runner.wait(job_id, wait)
+        return job.to_response()
+
+    async def result_handler(
+        job_id: str, wait: float = Query(0, ge=0, le=MAX_WAIT_SECONDS)
+    ):
+        job = await runner.wait(job_id, wait)
+        if job.status == FAILED:
+            return ErrorResponse(message=job.error).to_json_response()
+        if job.status != SUCCEEDED:
+            return JSONResponse(status_code=202, content=job.to_response().model_dump())
+
+        return response_model(
+            inference_time_seconds=job.finished_at - job.started_at,
+            input=job.payload if return_input else None,
+            result=job.result,
+        )
+
+    result_handler.__annotations__["return"] = response_model
+
+    return submit_handler, status_handler, result_handler
@@ -1,10 +1,22 @@
 from opentelemetry import metrics
-from opentelemetry.exporter.prometheus import PrometheusMetricReader
-from opentelemetry.sdk.metrics import MeterProvider
 
-_exporter = PrometheusMetricReader()
-_meter_provider = MeterProvider(metric_readers=[_exporter])
-metrics.set_meter_provider(_meter_provider)
+# Instruments are recorded through the API until the exporter is set up, which
+# only the server needs
+_meter_provider = None
+
+
+def setup_metrics() -> None:
+    """Export the metrics to Prometheus, once per process"""
+    global _meter_provider
+    if _meter_provider is not None:
+        return
+
+    from opentelemetry.exporter.prometheus import PrometheusMetricReader
+    from opentelemetry.sdk.metrics import MeterProvider
+
+    _meter_provider = MeterProvider(metric_readers=[PrometheusMetricReader()])
+    metrics.set_meter_provider(_meter_provider)
+
 
 _meter = metrics.get_meter("cogito.metrics")
 
@@ -14,3 +26,117 @@ request_histogram = _meter.create_histogram(
 inference_duration_histogram = _meter.create_histogram(
     name="inference_duration_histogram", description="Inference duration", unit="ms"
 )
+batch_size_histogram = _meter.create_histogram(
+    name="batch_size_histogram", description="Micro-batch size", unit="1"
+)
+batch_queue_wait_histogram = _meter.create_histogram(
+    name="batch_queue_wait_histogram",
+    description="Time spent waiting for a micro-batch",
+    unit="ms",
+)
+admission_queue_depth = _meter.create_up_down_counter(
+    name="admission_queue_depth",
+    description="Requests waiting in the admission queue",
+    unit="1",
+)
+admission_queue_wait_histogram = _meter.create_histogram(
+    name="admission_queue_wait_histogram",
+    description="Time spent waiting in the admission queue",
+    unit="ms",
+)
+admission_rejected_counter = _meter.create_counter(
+    name="admission_rejected_counter",
+    description="Requests rejected by the admission queue",
+    unit="1",
+)
+event_loop_lag_histogram = _meter.create_histogram(
+    name="event_loop_lag_histogram",
+    description="Delay of the event loop in waking up from a scheduled sleep",
+    unit="ms",
+)
+event_loop_stall_counter = _meter.create_counter(
+    name="event_loop_stall_counter",
+    description="Times the event loop was blocked beyond the stall threshold",
+    unit="1",
+)
+stream_first_chunk_histogram = _meter.create_histogram(
+    name="stream_first_chunk_histogram",
+    description="Time to the first chunk of a streamed prediction",
+    unit="ms",
+)
+stream_duration_histogram = _meter.create_histogram(
+    name="stream_duration_histogram",
+    description="Total duration of a streamed prediction",
+    unit="ms",
+)
+response_cache_hits_counter = _meter.create_counter(
+    name="response_cache_hits_counter",
+    description="Requests served from the response cache",
+)
+response_cache_misses_counter = _meter.create_counter(
+    name="response_cache_misses_counter",
+    description="Cacheable requests not found in the response cache",
+)
+response_cache_evictions_counter = _meter.create_counter(
+    name="response_cache_evictions_counter",
+    description="Entries evicted from the response cache, by reason",
+)
+coalesced_requests_counter = _meter.create_counter(
+    name="coalesced_requests_counter",
+    description="Inferences avoided by joining an identical in-flight request",
+)
+jobs_pending = _meter.create_up_down_counter(
+    name="jobs_pending",
+    description="Asynchronous jobs queued or running",
+)
+jobs_finished_counter = _meter.create_counter(
+    name="jobs_finished_counter",
+    description="Asynchronous jobs finished, by status",
+)
+job_duration_histogram = _meter.create_histogram(
+    name="job_duration_histogram",
+    description="Time from the submission of a job to its completion",
+    unit="ms",
+)
+batch_endpoint_items_counter = _meter.create_counter(
+    name="batch_endpoint_items_counter",
+    description="Items processed by batch endpoints, by status",
+)
+dropped_requests_counter = _meter.create_counter(
+    name="dropped_requests_counter",
+    description="Requests dropped before their inference, by reason",
+)
+concurrency_limit_gauge = _meter.create_up_down_counter(
+    name="concurrency_limit",
+    description="Number of requests a route runs at the same time",
+)
+warmup_duration_histogram = _meter.create_histogram(
+    name="warmup_duration_histogram",
+    description="Time spent warming up a route before the server is ready",
+    unit="ms",
+)
+setup_duration_histogram = _meter.create_histogram(
+    name="setup_duration_histogram",
+    description="Time spent in the setup of a predictor",
+    unit="ms",
+)
+model_download_duration_histogram = _meter.create_histogram(
+    name="model_download_duration_histogram",
+    description="Time spent downloading a model, by source",
+    unit="ms",
+)
+startup_duration_histogram = _meter.create_histogram(
+    name="startup_duration_histogram",
+    description="Time from the start of the application until it is ready",
+    unit="ms",
+)
+reload_duration_histogram = _meter.create_histogram(
+    name="reload_duration_histogram",
+    description="Time to build, set up, warm up and swap a reloaded predictor",
+    unit="ms",
+)
+reload_peak_memory_histogram = _meter.create_histogram(
+    name="reload_peak_memory_histogram",
+    description="Peak resident memory of the process during a predictor reload",
+    unit="By",
+)
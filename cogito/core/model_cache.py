@@ -0,0 +1,421 @@
+import atexit
+import hashlib
+import os
+import shutil
+import socket
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from cogito.core.file_lock import FileLock, pid_exists
+from cogito.core.logging import get_logger
+from cogito.core.model_store import (
+    LOCKS_DIR,
+    MANIFEST_FILE,
+    METADATA_SUFFIX,
+    PARTIAL_SUFFIX,
+    STATE_SUFFIX,
+    download_lock,
+    model_key,
+)
+
+# Metadata of the managed cache, under the cache directory
+CACHE_DIR = ".cogito-cache"
+CACHE_MAX_SIZE_ENV = "COGITO_CACHE_MAX_SIZE"
+
+# Pins are refreshed while their process runs. Pins of another host that were
+# not refreshed for a while belong to a process that is gone.
+PIN_REFRESH_SECONDS = 60.0
+PIN_STALE_SECONDS = 300.0
+
+_logger = get_logger("cogito.model_cache")
+
+# Pin files of the current process, removed when it exits
+_pins: Set[str] = set()
+_pins_heartbeat: Optional[threading.Thread] = None
+
+
+class CacheEntry(BaseModel):
+    key: str
+    model_path: str
+    path: str
+    # File or directory removed when the entry is evicted
+    root: str
+    # Real path of every file of the model -> SHA-256 of its content
+    files: Dict[str, str] = {}
+    size: int = 0
+    created_at: float
+    last_used_at: float
+
+
+class ModelCache:
+    """
+    Managed store of the models downloaded to a cache directory.
+
+    Every file of a model is a hardlink to a blob named after the SHA-256 of its
+    content, so identical files of different models are stored once. Entries
+    record the files of each model and when it was last used. When the blobs
+    exceed ``max_size`` bytes, the least recently used entries are evicted,
+    except the ones pinned by a running process or being downloaded.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_size: Optional[int] = None,
+        pin_stale_seconds: float = PIN_STALE_SECONDS,
+    ):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.pin_stale_seconds = pin_stale_seconds
+        self.root = os.path.join(cache_dir, CACHE_DIR)
+        self._blobs_dir = os.path.join(self.root, "blobs")
+        self._entries_dir = os.path.join(self.root, "entries")
+        self._pins_dir = os.path.join(self.root, "pins")
+
+    def lock(self) -> FileLock:
+        """Lock of the cache metadata, shared by every process of the cache"""
+        return FileLock(os.path.join(self.cache_dir, LOCKS_DIR, "cache.lock"))
+
+    def add(self, model_path: str, path: str) -> CacheEntry:
+        """
+        Record the files of a model downloaded to ``path`` as used now,
+        deduplicating them, then evict entries down to ``max_size``.
+        """
+        key = model_key(model_path)
+        # Hashing is the slow part, done before locking the cache. The files of
+        # a model do not change meanwhile, their download lock is held.
+        previous = self.get(key)
+        known = previous.files if previous else {}
+        hashes = {file: self._hash(file, known) for file in _model_files(path)}
+
+        with self.lock():
+            previous = self.get(key)
+            now = time.time()
+            entry = CacheEntry(
+                key=key,
+                model_path=model_path,
+                path=path,
+                root=_entry_root(path),
+                created_at=previous.created_at if previous else now,
+                last_used_at=now,
+            )
+            digests = {}
+            for file, digest in hashes.items():
+                self._link(file, digest)
+                entry.files[file] = digest
+                digests[digest] = os.path.getsize(file)
+            entry.size = sum(digests.values())
+
+            # Another model path downloaded to the same place replaced its files
+            for other in self.entries():
+                if other.key != key and other.root == entry.root:
+                    self._remove_metadata(other.key)
+            self._save(entry)
+
+            if self.max_size is not None:
+                self.evict(self.max_size, keep={key})
+        return entry
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            with open(self._entry_file(key)) as f:
+                return CacheEntry.model_validate_json(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def entries(self) -> List[CacheEntry]:
+        """Entries from the least to the most recently used"""
+        if not os.path.isdir(self._entries_dir):
+            return []
+        entries = [
+            self.get(name[: -len(".json")])
+            for name in os.listdir(self._entries_dir)
+            if name.endswith(".json")
+        ]
+        return sorted(filter(None, entries), key=lambda entry: entry.last_used_at)
+
+    def size(self) -> int:
+        """Size of the content stored in the cache"""
+        return sum(os.path.getsize(blob) for blob in self._blobs())
+
+    def pin(self, model_path: str) -> None:
+        """Keep a model from being evicted while the current process runs"""
+        pins_dir = os.path.join(self._pins_dir, model_key(model_path))
+        os.makedirs(pins_dir, exist_ok=True)
+        pin_file = os.path.join(pins_dir, f"{socket.gethostname()}-{os.getpid()}")
+        open(pin_file, "w").close()
+        if not _pins:
+            atexit.register(_remove_pins)
+        _pins.add(pin_file)
+        _start_pins_heartbeat()
+
+    def unpin(self, model_path: str) -> None:
+        pin_file = os.path.join(
+            self._pins_dir,
+            model_key(model_path),
+            f"{socket.gethostname()}-{os.getpid()}",
+        )
+        _pins.discard(pin_file)
+        if os.path.exists(pin_file):
+            os.remove(pin_file)
+
+    def pinned(self, key: str) -> bool:
+        """
+        Whether a running process uses an entry. The processes of other hosts
+        cannot be checked, so their pins are in use only while they are
+        refreshed. Pins of processes that are gone are removed.
+        """
+        pins_dir = os.path.join(self._pins_dir, key)
+        if not os.path.isdir(pins_dir):
+            return False
+
+        hostname = socket.gethostname()
+        now = time.time()
+        pinned = False
+        for name in os.listdir(pins_dir):
+            pin_file = os.path.join(pins_dir, name)
+            host, _, pid = name.rpartition("-")
+            if host == hostname:
+                alive = pid_exists(int(pid or 0))
+            else:
+                try:
+                    age = now - os.path.getmtime(pin_file)
+                except FileNotFoundError:
+                    continue
+                alive = age <= self.pin_stale_seconds
+            if alive:
+                pinned = True
+            elif os.path.exists(pin_file):
+                os.remove(pin_file)
+        return pinned
+
+    def evict(self, max_size: int, keep: Iterable[str] = ()) -> List[CacheEntry]:
+        """
+        Evict the least recently used entries until the cache fits in
+        ``max_size`` bytes. Must be called with the cache locked.
+        """
+        evicted = []
+        size = self.size()
+        for entry in self.entries():
+            if size <= max_size:
+                break
+            if entry.key in keep or self.pinned(entry.key):
+                continue
+
+            # Not while another process downloads the model again
+            lock = download_lock(self.cache_dir, entry.model_path)
+            try:
+                lock.acquire(timeout=0)
+            except TimeoutError:
+                continue
+            try:
+                self.remove(entry)
+                freed = self._remove_orphan_blobs()
+            finally:
+                lock.release()
+            size -= freed
+            evicted.append(entry)
+            _logger.info(
+                "Model evicted from cache",
+                extra={"model_path": entry.model_path, "freed_bytes": freed},
+            )
+
+        if size > max_size:
+            _logger.warning(
+                "Model cache is over its maximum size",
+                extra={"size": size, "max_size": max_size},
+            )
+        return evicted
+
+    def remove(self, entry: CacheEntry) -> None:
+        """Delete the files of an entry and its metadata"""
+        if os.path.isdir(entry.root) and not os.path.islink(entry.root):
+            shutil.rmtree(entry.root, ignore_errors=True)
+        elif os.path.lexists(entry.root):
+            os.remove(entry.root)
+        if os.path.exists(entry.root + METADATA_SUFFIX):
+            os.remove(entry.root + METADATA_SUFFIX)
+        self._remove_metadata(entry.key)
+
+    def prune(self, max_size: Optional[int] = None) -> Tuple[List[CacheEntry], int]:
+        """
+        Drop the entries whose files are gone, evict entries down to
+        ``max_size`` (the configured maximum by default), and delete the blobs
+        no model uses anymore. Returns the removed entries and the bytes freed.
+        """
+        max_size = self.max_size if max_size is None else max_size
+        removed = []
+        freed = 0
+        with self.lock():
+            for entry in self.entries():
+                if not os.path.exists(entry.path):
+                    self._remove_metadata(entry.key)
+                    removed.append(entry)
+            freed += self._remove_orphan_blobs()
+
+            if max_size is not None:
+                size = self.size()
+                removed += self.evict(max_size)
+                freed += size - self.size()
+
+            # Pins of processes that are gone
+            for entry in self.entries():
+                self.pinned(entry.key)
+        return removed, freed
+
+    def verify(self, repair: bool = False) -> List[Tuple[CacheEntry, str]]:
+        """
+        Check that the files of every entry are still the blobs they were
+        stored as, and that the blobs match their hash. Returns the problems
+        found. With ``repair``, the entries with problems are removed, so that
+        their models are downloaded again.
+        """
+        problems = []
+        hashes: Dict[str, str] = {}
+        with self.lock():
+            for entry in self.entries():
+                for file, digest in entry.files.items():
+                    blob = self._blob_path(digest)
+                    if not os.path.exists(file):
+                        problems.append((entry, f"Missing file {file}"))
+                    elif not os.path.exists(blob):
+                        problems.append((entry, f"Missing blob of {file}"))
+                    elif not os.path.samefile(file, blob):
+                        problems.append((entry, f"Modified file {file}"))
+                    else:
+                        if blob not in hashes:
+                            hashes[blob] = hash_file(blob)
+                        if hashes[blob] != digest:
+                            problems.append((entry, f"Corrupt file {file}"))
+
+            if repair:
+                for key in {entry.key for entry, _ in problems}:
+                    entry = self.get(key)
+                    if entry is not None:
+                        self.remove(entry)
+                self._remove_orphan_blobs()
+        return problems
+
+    def _hash(self, file: str, known: Dict[str, str]) -> str:
+        """SHA-256 of a file, known already when it is still its blob"""
+        digest = known.get(file)
+        if digest is not None:
+            blob = self._blob_path(digest)
+            if os.path.exists(blob) and os.path.samefile(file, blob):
+                return digest
+        return hash_file(file)
+
+    def _link(self, file: str, digest: str) -> None:
+        """Store a file as a blob, or replace it by the blob of its content"""
+        blob = self._blob_path(digest)
+        if not os.path.exists(blob):
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            os.link(file, blob)
+            # Writing to a file must not change the models that share it
+            os.chmod(blob, 0o444)
+        elif not os.path.samefile(file, blob):
+            temporary_file = f"{file}.{os.getpid()}.link"
+            os.link(blob, temporary_file)
+            os.replace(temporary_file, file)
+
+    def _blobs(self) -> List[str]:
+        if not os.path.isdir(self._blobs_dir):
+            return []
+        return [
+            os.path.join(root, name)
+            for root, _, names in os.walk(self._blobs_dir)
+            for name in names
+        ]
+
+    def _remove_orphan_blobs(self) -> int:
+        """Delete the blobs no longer linked from any model, returning their size"""
+        freed = 0
+        for blob in self._blobs():
+            stat = os.stat(blob)
+            if stat.st_nlink == 1:
+                os.remove(blob)
+                freed += stat.st_size
+        return freed
+
+    def _remove_metadata(self, key: str) -> None:
+        if os.path.exists(self._entry_file(key)):
+            os.remove(self._entry_file(key))
+        shutil.rmtree(os.path.join(self._pins_dir, key), ignore_errors=True)
+
+    def _save(self, entry: CacheEntry) -> None:
+        os.makedirs(self._entries_dir, exist_ok=True)
+        temporary_file = self._entry_file(entry.key) + ".tmp"
+        with open(temporary_file, "w") as f:
+            f.write(entry.model_dump_json(indent=2))
+        os.replace(temporary_file, self._entry_file(entry.key))
+
+    def _entry_file(self, key: str) -> str:
+        return os.path.join(self._entries_dir, f"{key}.json")
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self._blobs_dir, digest[:2], digest)
+
+
+def get_cache_max_size() -> Optional[int]:
+    max_size = os.getenv(CACHE_MAX_SIZE_ENV)
+    return int(max_size) if max_size else None
+
+
+def hash_file(path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(8 * 1024 * 1024), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def _entry_root(path: str) -> str:
+    # Hugging Face snapshots live in <cache>/models--owner--name/snapshots/<rev>
+    if os.path.basename(os.path.dirname(path)) == "snapshots":
+        return os.path.dirname(os.path.dirname(path))
+    return path
+
+
+def _model_files(path: str) -> List[str]:
+    """Real paths of the files of a model, without the download bookkeeping"""
+    if os.path.isfile(path):
+        paths = [path]
+    else:
+        paths = [
+            os.path.join(root, name)
+            for root, _, names in os.walk(path)
+            for name in names
+            if name != MANIFEST_FILE
+            and not name.endswith((PARTIAL_SUFFIX, STATE_SUFFIX))
+        ]
+    return sorted({os.path.realpath(file) for file in paths if os.path.isfile(file)})
+
+
+def _start_pins_heartbeat() -> None:
+    global _pins_heartbeat
+    if _pins_heartbeat is not None and _pins_heartbeat.is_alive():
+        return
+
+    def refresh():
+        while True:
+            time.sleep(PIN_REFRESH_SECONDS)
+            for pin_file in list(_pins):
+                try:
+                    os.utime(pin_file)
+                except FileNotFoundError:
+                    pass
+
+    _pins_heartbeat = threading.Thread(
+        target=refresh, name="cogito-pins-heartbeat", daemon=True
+    )
+    _pins_heartbeat.start()
+
+
+def _remove_pins() -> None:
+    for pin_file in _pins:
+        if os.path.exists(pin_file):
+            os.remove(pin_file)
+    _pins.clear()
@@ -1,29 +1,439 @@
+import base64
+import hashlib
+import json
 import os
-from huggingface_hub import snapshot_download
-from google.cloud import storage
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Set, Tuple
 
+from cogito.core.file_lock import FileLock
+from cogito.core.logging import get_logger
 
-def download_huggingface_model(model_id: str, cache_dir: str) -> str:
+# Parallel downloads of Google Cloud Storage objects
+DEFAULT_DOWNLOAD_WORKERS = 8
+DEFAULT_CHUNK_SIZE = 32 * 1024 * 1024
+DOWNLOAD_WORKERS_ENV = "COGITO_DOWNLOAD_WORKERS"
+
+# Suffixes of the files of a download in progress, next to its destination
+PARTIAL_SUFFIX = ".part"
+STATE_SUFFIX = ".part.json"
+
+# Locks of the downloads in progress, under the cache directory
+LOCKS_DIR = ".cogito-locks"
+
+# Generation of every file of a downloaded directory, or of a downloaded file
+# next to it, to skip unchanged files
+MANIFEST_FILE = ".cogito-manifest.json"
+METADATA_SUFFIX = ".cogito.json"
+
+_logger = get_logger("cogito.model_store")
+
+
+def download_lock(cache_dir: str, model_path: str) -> FileLock:
     """
-    Download a model from Hugging Face and return the model id.
+    Lock of the downloads to the destination of a model in the cache, shared by
+    every process of the cache
     """
-    return snapshot_download(repo_id=model_id, cache_dir=cache_dir)
+    if model_path.startswith("gs://"):
+        key = model_key(_gcs_destination(model_path))
+    else:
+        key = model_key(model_path)
+    return FileLock(os.path.join(cache_dir, LOCKS_DIR, f"{key}.lock"))
+
 
+def model_key(model_path: str) -> str:
+    return hashlib.sha256(model_path.encode()).hexdigest()[:32]
 
-def download_gcp_model(model_path: str, cache_dir: str) -> str:
+
+def _gcs_destination(model_path: str) -> str:
     """
-    Download a model from Google Cloud Storage and return the local file path.
+    Path of a Google Cloud Storage object or prefix relative to the cache, by
+    bucket and object path, so that objects named alike do not collide
     """
-    client = storage.Client()
+    bucket_name, blob_path = _split_gcs_path(model_path)
+    destination = os.path.normpath(os.path.join(bucket_name, blob_path))
+    if (
+        os.path.isabs(destination)
+        or destination == os.curdir
+        or destination.split(os.sep)[0] == os.pardir
+    ):
+        raise ValueError(f"Invalid model path: {model_path}")
+    return destination
+
+
+def _split_gcs_path(model_path: str) -> Tuple[str, str]:
     path_parts = model_path.replace("gs://", "").split("/", 1)
-    bucket_name, blob_path = path_parts[0], path_parts[1]
-    bucket = client.bucket(bucket_name)
-    blob = bucket.blob(blob_path)
+    return path_parts[0], path_parts[1] if len(path_parts) > 1 else ""
+
 
-    model_file = os.path.join(cache_dir, os.path.basename(blob_path))
+def download_huggingface_model(
+    model_id: str, cache_dir: str, workers: Optional[int] = None
+) -> str:
+    """
+    Download a model from Hugging Face and return the model id.
+    """
+    from huggingface_hub import snapshot_download
 
-    if os.path.exists(model_file):
+    return snapshot_download(
+        repo_id=model_id,
+        cache_dir=cache_dir,
+        max_workers=get_download_workers(workers),
+    )
+
+
+def download_gcp_model(
+    model_path: str,
+    cache_dir: str,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    client=None,
+) -> str:
+    """
+    Download a model from Google Cloud Storage and return the local file path,
+    under the cache directory by bucket and object path. Paths ending with a
+    slash are prefixes, downloaded as a directory.
+    """
+    destination = os.path.join(cache_dir, _gcs_destination(model_path))
+    if client is None:
+        from google.cloud import storage
+
+        client = storage.Client()
+
+    bucket_name, blob_path = _split_gcs_path(model_path)
+    if blob_path == "" or blob_path.endswith("/"):
+        download_gcp_prefix(
+            client.bucket(bucket_name), blob_path, destination, workers, chunk_size
+        )
+        return destination
+
+    blob = client.bucket(bucket_name).get_blob(blob_path)
+    if blob is None:
+        raise FileNotFoundError(f"Object not found: {model_path}")
+
+    model_file = destination
+    metadata_file = model_file + METADATA_SUFFIX
+
+    # Downloads are only renamed to their final path once complete and verified
+    metadata = _load_manifest(metadata_file) or None
+    if _is_unchanged(model_file, blob, metadata):
+        if metadata != _manifest_entry(blob):
+            _save_manifest(metadata_file, _manifest_entry(blob))
         return model_file
 
-    blob.download_to_filename(model_file)
+    os.makedirs(os.path.dirname(model_file), exist_ok=True)
+    download_blob(blob, model_file, workers=workers, chunk_size=chunk_size)
+    _save_manifest(metadata_file, _manifest_entry(blob))
     return model_file
+
+
+def download_gcp_prefix(
+    bucket,
+    prefix: str,
+    directory: str,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> None:
+    """
+    Download every object under ``prefix`` into ``directory``, keeping their
+    layout. Files whose generation or checksum match their object are skipped,
+    and files of objects no longer under the prefix are removed.
+    Up to ``workers`` files download at the same time, and the workers left
+    split the chunks of the files being downloaded.
+    """
+    workers = get_download_workers(workers)
+    manifest_file = os.path.join(directory, MANIFEST_FILE)
+    manifest = _load_manifest(manifest_file)
+
+    pending = []
+    skipped = 0
+    listed: Set[str] = set()
+    for blob in bucket.list_blobs(prefix=prefix):
+        # Placeholders of empty folders
+        if blob.name.endswith("/"):
+            continue
+        relative_path = blob.name[len(prefix) :]
+        path = os.path.normpath(os.path.join(directory, relative_path))
+        if not path.startswith(os.path.normpath(directory) + os.sep):
+            raise ValueError(f"Object {blob.name} is outside of {prefix}")
+        listed.add(path)
+
+        if _is_unchanged(path, blob, manifest.get(relative_path)):
+            skipped += 1
+            manifest[relative_path] = _manifest_entry(blob)
+        else:
+            pending.append((blob, relative_path, path))
+
+    os.makedirs(directory, exist_ok=True)
+    removed = _remove_unlisted_files(directory, listed, manifest)
+    lock = threading.Lock()
+    file_workers = min(workers, len(pending)) or 1
+    chunk_workers = max(1, workers // file_workers)
+
+    def fetch(item) -> int:
+        blob, relative_path, path = item
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        start_time = time.perf_counter()
+        download_blob(blob, path, workers=chunk_workers, chunk_size=chunk_size)
+        elapsed = time.perf_counter() - start_time
+        _logger.info(
+            "Model file downloaded",
+            extra={
+                "file": relative_path,
+                "bytes": blob.size,
+                "seconds": round(elapsed, 3),
+                "mb_per_second": (
+                    round(blob.size / elapsed / 1e6, 2) if elapsed else 0.0
+                ),
+            },
+        )
+        with lock:
+            manifest[relative_path] = _manifest_entry(blob)
+            _save_manifest(manifest_file, manifest)
+        return blob.size
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(
+        max_workers=file_workers, thread_name_prefix="cogito-download-files"
+    ) as executor:
+        downloaded = sum(executor.map(fetch, pending))
+    _save_manifest(manifest_file, manifest)
+
+    elapsed = time.perf_counter() - start_time
+    _logger.info(
+        "Model directory downloaded",
+        extra={
+            "prefix": prefix,
+            "directory": directory,
+            "files": len(pending),
+            "skipped": skipped,
+            "removed": removed,
+            "bytes": downloaded,
+            "seconds": round(elapsed, 3),
+            "mb_per_second": round(downloaded / elapsed / 1e6, 2) if elapsed else 0.0,
+        },
+    )
+
+
+def _remove_unlisted_files(
+    directory: str, listed: Set[str], manifest: Dict[str, Dict]
+) -> int:
+    """
+    Remove the files of objects deleted from the prefix, so that a model never
+    mixes files of two versions. Returns the number of files removed.
+    """
+    in_progress = {
+        path + suffix for path in listed for suffix in (PARTIAL_SUFFIX, STATE_SUFFIX)
+    }
+    removed = 0
+    for root, _, names in os.walk(directory, topdown=False):
+        for name in names:
+            path = os.path.join(root, name)
+            if name == MANIFEST_FILE or path in listed or path in in_progress:
+                continue
+            os.remove(path)
+            manifest.pop(os.path.relpath(path, directory), None)
+            removed += 1
+        if root != directory and not os.listdir(root):
+            os.rmdir(root)
+
+    # Entries of files that were removed by hand
+    for relative_path in list(manifest):
+        if os.path.join(directory, relative_path) not in listed:
+            del manifest[relative_path]
+    return removed
+
+
+def _is_unchanged(path: str, blob, entry: Optional[Dict]) -> bool:
+    if not os.path.exists(path) or os.path.getsize(path) != blob.size:
+        return False
+    if entry is not None and entry.get("generation") == blob.generation:
+        return True
+    # Rewritten with the same content, or downloaded before the manifest was
+    try:
+        verify_checksum(path, blob)
+    except ValueError:
+        return False
+    return True
+
+
+def _manifest_entry(blob) -> Dict:
+    return {
+        "generation": blob.generation,
+        "size": blob.size,
+        "crc32c": getattr(blob, "crc32c", None),
+    }
+
+
+def _load_manifest(manifest_file: str) -> Dict:
+    try:
+        with open(manifest_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(manifest_file: str, manifest: Dict) -> None:
+    temporary_file = manifest_file + ".tmp"
+    with open(temporary_file, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temporary_file, manifest_file)
+
+
+def get_download_workers(workers: Optional[int] = None) -> int:
+    return workers or int(os.getenv(DOWNLOAD_WORKERS_ENV) or DEFAULT_DOWNLOAD_WORKERS)
+
+
+def download_blob(
+    blob,
+    destination: str,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> None:
+    """
+    Download an object as ranged chunks fetched by ``workers`` threads, into a
+    partial file next to ``destination``. The chunks already written by an
+    interrupted download of the same object generation are not downloaded
+    again. The file is verified against the CRC32C or MD5 checksum of the object
+    before it is renamed to ``destination``.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be greater than 0")
+
+    partial_file = destination + PARTIAL_SUFFIX
+    state_file = destination + STATE_SUFFIX
+    chunks = range(0, max(1, -(-blob.size // chunk_size)))
+
+    done = _load_download_state(state_file, blob.generation, blob.size, chunk_size)
+    if not done or not os.path.exists(partial_file):
+        done = set()
+        with open(partial_file, "wb") as f:
+            f.truncate(blob.size)
+
+    lock = threading.Lock()
+    fd = os.open(partial_file, os.O_WRONLY)
+
+    def fetch(chunk: int) -> None:
+        start = chunk * chunk_size
+        end = min(start + chunk_size, blob.size) - 1
+        data = (
+            blob.download_as_bytes(
+                start=start,
+                end=end,
+                raw_download=True,
+                checksum=None,
+                if_generation_match=blob.generation,
+            )
+            if blob.size
+            else b""
+        )
+        if len(data) != end - start + 1:
+            raise IOError(
+                f"Expected {end - start + 1} bytes at offset {start}, got {len(data)}"
+            )
+        os.pwrite(fd, data, start)
+        os.fsync(fd)
+
+        with lock:
+            done.add(chunk)
+            _save_download_state(
+                state_file, blob.generation, blob.size, chunk_size, done
+            )
+
+    try:
+        pending = [chunk for chunk in chunks if chunk not in done]
+        with ThreadPoolExecutor(
+            max_workers=get_download_workers(workers),
+            thread_name_prefix="cogito-download",
+        ) as executor:
+            # Consume the results to raise the first error
+            list(executor.map(fetch, pending))
+    finally:
+        os.close(fd)
+
+    try:
+        verify_checksum(partial_file, blob)
+    except ValueError:
+        # Corrupt data must not be resumed either
+        for path in (partial_file, state_file):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    os.replace(partial_file, destination)
+    if os.path.exists(state_file):
+        os.remove(state_file)
+
+
+def verify_checksum(path: str, blob) -> None:
+    """
+    Compare a file with the CRC32C checksum of an object, or with its MD5 hash
+    when CRC32C is not available. Raises ``ValueError`` when they differ.
+    """
+    expected_crc32c = getattr(blob, "crc32c", None)
+    expected_md5 = getattr(blob, "md5_hash", None)
+
+    crc32c = None
+    if expected_crc32c:
+        try:
+            import google_crc32c
+
+            crc32c = google_crc32c.Checksum()
+        except ImportError:
+            crc32c = None
+    md5 = hashlib.md5() if expected_md5 and crc32c is None else None
+    if crc32c is None and md5 is None:
+        return
+
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(8 * 1024 * 1024), b""):
+            if crc32c is not None:
+                crc32c.update(block)
+            else:
+                md5.update(block)
+
+    if crc32c is not None:
+        name, expected, actual = "CRC32C", expected_crc32c, crc32c.digest()
+    else:
+        name, expected, actual = "MD5", expected_md5, md5.digest()
+    actual = base64.b64encode(actual).decode()
+    if actual != expected:
+        raise ValueError(
+            f"{name} mismatch for {blob.name}: expected {expected}, got {actual}"
+        )
+
+
+def _load_download_state(
+    state_file: str, generation: int, size: int, chunk_size: int
+) -> Set[int]:
+    """Chunks already written by a previous download of the same object"""
+    try:
+        with open(state_file) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return set()
+
+    if (state.get("generation"), state.get("size"), state.get("chunk_size")) != (
+        generation,
+        size,
+        chunk_size,
+    ):
+        return set()
+    return set(state.get("done", []))
+
+
+def _save_download_state(
+    state_file: str, generation: int, size: int, chunk_size: int, done: Set[int]
+) -> None:
+    temporary_file = state_file + ".tmp"
+    with open(temporary_file, "w") as f:
+        json.dump(
+            {
+                "generation": generation,
+                "size": size,
+                "chunk_size": chunk_size,
+                "done": sorted(done),
+            },
+            f,
+        )
+    os.replace(temporary_file, state_file)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Dict, List
 
 
 class BasePredictor(ABC):
@@ -11,6 +11,16 @@ class BasePredictor(ABC):
     async def setup(self):
         pass
 
+    def predict_batch(self, inputs: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Run a batch of predictions at once. Each element of ``inputs`` holds the
+        keyword arguments of a single ``predict`` call, and the returned list must
+        keep the same order. Required only when batching is enabled for the route.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not implement predict_batch"
+        )
+
 
 class BaseTrainer(ABC):
     @abstractmethod
@@ -0,0 +1,139 @@
+import asyncio
+import functools
+import inspect
+import os
+import resource
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class PredictorHandle:
+    """
+    Current instance of a predictor, which hot reloads replace while it serves.
+
+    Routes call the predictor through the methods returned by ``bind``, which
+    look the instance up on every call. Calls in flight are counted by instance,
+    so that a replaced instance can be drained before it is released.
+    """
+
+    def __init__(self, name: str, instance: Any):
+        self.name = name
+        self.instance = instance
+        self._in_flight: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def in_flight(self, instance: Any) -> int:
+        """Number of calls still running on ``instance``"""
+        return self._in_flight.get(id(instance), 0)
+
+    def swap(self, instance: Any) -> Any:
+        """Send the next calls to ``instance``, returning the replaced one"""
+        previous, self.instance = self.instance, instance
+        return previous
+
+    async def drain(self, instance: Any, timeout: Optional[float] = None) -> bool:
+        """Wait for the calls running on ``instance``, up to ``timeout`` seconds"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while self.in_flight(instance):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.05)
+        return True
+
+    def _enter(self) -> Any:
+        with self._lock:
+            instance = self.instance
+            key = id(instance)
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+        return instance
+
+    def _exit(self, instance: Any) -> None:
+        with self._lock:
+            key = id(instance)
+            self._in_flight[key] -= 1
+            if not self._in_flight[key]:
+                del self._in_flight[key]
+
+    def bind(self, method: str) -> Callable:
+        """
+        Function calling ``method`` on the current instance, with the signature
+        and kind (coroutine, generator, ...) of that method.
+        """
+        template = getattr(self.instance, method)
+
+        if inspect.isasyncgenfunction(template):
+
+            async def call(*args, **kwargs):
+                instance = self._enter()
+                try:
+                    async for chunk in getattr(instance, method)(*args, **kwargs):
+                        yield chunk
+                finally:
+                    self._exit(instance)
+
+        elif inspect.iscoroutinefunction(template):
+
+            async def call(*args, **kwargs):
+                instance = self._enter()
+                try:
+                    return await getattr(instance, method)(*args, **kwargs)
+                finally:
+                    self._exit(instance)
+
+        elif inspect.isgeneratorfunction(template):
+
+            def call(*args, **kwargs):
+                instance = self._enter()
+                try:
+                    yield from getattr(instance, method)(*args, **kwargs)
+                finally:
+                    self._exit(instance)
+
+        else:
+
+            def call(*args, **kwargs):
+                instance = self._enter()
+                try:
+                    return getattr(instance, method)(*args, **kwargs)
+                finally:
+                    self._exit(instance)
+
+        return functools.wraps(template)(call)
+
+
+def memory_usage() -> int:
+    """Resident memory of the process in bytes, or its peak where not available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Reported in kilobytes on Linux and in bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class PeakMemorySampler:
+    """Highest resident memory of the process while the block runs"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.start = 0
+        self.peak = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _sample(self) -> None:
+        while True:
+            self.peak = max(self.peak, memory_usage())
+            await asyncio.sleep(self.interval)
+
+    async def __aenter__(self) -> "PeakMemorySampler":
+        self.start = self.peak = memory_usage()
+        self._task = asyncio.create_task(self._sample())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self.peak = max(self.peak, memory_usage())
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from cogito.core.metrics import (
+    response_cache_evictions_counter,
+    response_cache_hits_counter,
+    response_cache_misses_counter,
+)
+
+
+def canonical_key(payload: Dict[str, Any], exclude: Iterable[str] = ()) -> str:
+    """
+    Stable hash of a validated input. Keys are sorted, so two payloads with the
+    same values always share a key, whatever the order of their fields.
+    """
+    from fastapi.encoders import jsonable_encoder
+
+    excluded = set(exclude)
+    data = {name: value for name, value in payload.items() if name not in excluded}
+    serialized = json.dumps(
+        jsonable_encoder(data), sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache of predictor results with an optional time to live.
+
+    It is only used from the event loop, so it does not need any locking.
+    Requests setting any of ``no_cache_params`` (e.g. a random seed) to a value
+    other than None bypass the cache, both for reads and writes.
+
+    Clearing the cache starts a new generation. Results computed from an
+    earlier generation, e.g. by a predictor instance since reloaded, are not
+    stored.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        no_cache_params: Iterable[str] = (),
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be greater than 0")
+
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.no_cache_params = tuple(no_cache_params)
+
+        self.generation = 0
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_cacheable(self, payload: Dict[str, Any]) -> bool:
+        return all(payload.get(name) is None for name in self.no_cache_params)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return whether the key was found, and its result"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                response_cache_hits_counter.add(1, {"route": self.name})
+                return True, result
+
+            del self._entries[key]
+            response_cache_evictions_counter.add(
+                1, {"route": self.name, "reason": "expired"}
+            )
+
+        response_cache_misses_counter.add(1, {"route": self.name})
+        return False, None
+
+    def set(self, key: str, result: Any, generation: Optional[int] = None) -> None:
+        if generation is not None and generation != self.generation:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        self._entries[key] = (expires_at, result)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            response_cache_evictions_counter.add(
+                1, {"route": self.name, "reason": "size"}
+            )
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.generation += 1
@@ -0,0 +1,69 @@
+import time
+from typing import Dict, List, Optional
+
+from cogito.api.responses import PredictorStatusResponse, StatusResponse
+
+# States of the application and of its predictors
+PENDING = "pending"
+SETTING_UP = "setting_up"
+WARMING_UP = "warming_up"
+READY = "ready"
+FAILED = "failed"
+
+
+class StartupStatus:
+    """
+    Progress of the application startup, from the setup of its predictors to the
+    warm-up of its routes, as reported by the status endpoint.
+    """
+
+    def __init__(self, predictors: List[str]):
+        self.state = PENDING
+        self.error: Optional[str] = None
+        self.predictors: Dict[str, PredictorStatusResponse] = {
+            predictor: PredictorStatusResponse(state=PENDING)
+            for predictor in predictors
+        }
+        self._start_time = time.perf_counter()
+        self._elapsed: Optional[float] = None
+        self._predictor_start_times: Dict[str, float] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self.state == READY
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self._elapsed is not None:
+            return self._elapsed
+        return time.perf_counter() - self._start_time
+
+    def set_state(self, state: str, error: Optional[str] = None) -> None:
+        self.state = state
+        self.error = error
+        if state in (READY, FAILED):
+            self._elapsed = time.perf_counter() - self._start_time
+
+    def predictor_started(self, predictor: str) -> None:
+        self._predictor_start_times[predictor] = time.perf_counter()
+        self.predictors[predictor] = PredictorStatusResponse(state=SETTING_UP)
+
+    def predictor_finished(self, predictor: str, error: Optional[str] = None) -> float:
+        """Mark the setup of a predictor as done, returning its duration in seconds"""
+        duration = time.perf_counter() - self._predictor_start_times[predictor]
+        self.predictors[predictor] = PredictorStatusResponse(
+            state=FAILED if error else READY,
+            duration_seconds=round(duration, 3),
+            error=error,
+        )
+        return duration
+
+    def to_response(self) -> StatusResponse:
+        ready = sum(status.state == READY for status in self.predictors.values())
+        return StatusResponse(
+            state=self.state,
+            progress=ready / len(self.predictors) if self.predictors else 1.0,
+            elapsed_seconds=round(self.elapsed_seconds, 3),
+            predictors=self.predictors,
+            error=self.error,
+        )
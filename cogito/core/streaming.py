@@ -0,0 +1,120 @@
+import asyncio
+import inspect
+import json
+import time
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from cogito.core.execution import EVENT_LOOP, THREAD
+from cogito.core.metrics import (
+    stream_duration_histogram,
+    stream_first_chunk_histogram,
+)
+
+# Wire formats of a streamed response
+SSE = "sse"
+NDJSON = "ndjson"
+
+MEDIA_TYPES = {
+    SSE: "text/event-stream",
+    NDJSON: "application/x-ndjson",
+}
+
+_END_OF_STREAM = object()
+
+
+def is_streaming_handler(handler: Callable) -> bool:
+    """Whether the handler is a sync or async generator function"""
+    return inspect.isgeneratorfunction(handler) or inspect.isasyncgenfunction(handler)
+
+
+def check_streaming_mode(handler: Callable, mode: str) -> None:
+    """Async generators run on the event loop, sync ones on the loop or a thread"""
+    if inspect.isasyncgenfunction(handler):
+        if mode != EVENT_LOOP:
+            raise ValueError("Async generator predictors run on the event loop only")
+    elif mode not in (EVENT_LOOP, THREAD):
+        raise ValueError(f"Generator predictors cannot run in {mode} execution mode")
+
+
+def negotiate_stream_format(accept: Optional[str], default: Optional[str]) -> str:
+    """Pick the stream format from the Accept header, or the route default"""
+    if accept:
+        if MEDIA_TYPES[SSE] in accept:
+            return SSE
+        if MEDIA_TYPES[NDJSON] in accept:
+            return NDJSON
+    return default or NDJSON
+
+
+def format_chunk(chunk: Any, stream_format: str) -> str:
+    from fastapi.encoders import jsonable_encoder
+
+    data = json.dumps(jsonable_encoder(chunk))
+    if stream_format == SSE:
+        return f"data: {data}\n\n"
+    return f"{data}\n"
+
+
+def format_error(message: str, stream_format: str) -> str:
+    data = json.dumps({"error": message})
+    if stream_format == SSE:
+        return f"event: error\ndata: {data}\n\n"
+    return f"{data}\n"
+
+
+async def iterate_results(
+    handler: Callable,
+    kwargs: Dict[str, Any],
+    mode: str,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[Any]:
+    """
+    Iterate the chunks produced by a generator predictor. Async generators run on
+    the event loop, while sync ones are advanced on the route executor unless the
+    route runs on the event loop.
+    """
+    check_streaming_mode(handler, mode)
+
+    if inspect.isasyncgenfunction(handler):
+        async for chunk in handler(**kwargs):
+            yield chunk
+        return
+
+    if mode == EVENT_LOOP:
+        for chunk in handler(**kwargs):
+            yield chunk
+        return
+
+    loop = asyncio.get_running_loop()
+    iterator = await loop.run_in_executor(executor, lambda: iter(handler(**kwargs)))
+    try:
+        while True:
+            chunk = await loop.run_in_executor(executor, next, iterator, _END_OF_STREAM)
+            if chunk is _END_OF_STREAM:
+                return
+            yield chunk
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await loop.run_in_executor(executor, close)
+
+
+async def timed_stream(
+    chunks: AsyncIterator[Any], predictor: str
+) -> AsyncIterator[Any]:
+    """Record the time to the first chunk and the duration of the whole stream"""
+    start_time = time.time()
+    first_chunk = True
+    try:
+        async for chunk in chunks:
+            if first_chunk:
+                first_chunk = False
+                stream_first_chunk_histogram.record(
+                    (time.time() - start_time) * 1000, {"predictor": predictor}
+                )
+            yield chunk
+    finally:
+        stream_duration_histogram.record(
+            (time.time() - start_time) * 1000, {"predictor": predictor}
+        )
@@ -1,4 +1,5 @@
 import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
 from contextlib import contextmanager
 import importlib
 import inspect
@@ -6,7 +7,7 @@ import logging
 import os
 import time
 from inspect import Parameter, signature
-from typing import Any, Callable, Dict, get_type_hints
+from typing import Any, Callable, Dict, Optional, get_type_hints
 
 try:
     # Pydantic v2
@@ -17,24 +18,46 @@ except ImportError:
 
 from pydantic import create_model
 
-from cogito.api.responses import ErrorResponse, ResultResponse
+from cogito.api.responses import ErrorResponse, FastJSONResponse, ResultResponse
+from cogito.core.admission import AIMDLimit, AdmissionQueue
+from cogito.core.batching import MicroBatcher
+from cogito.core.coalescing import SharedCall, SingleFlight
 from cogito.core.config.file import ConfigFile
+from cogito.core.deadlines import (
+    acquire_before_deadline,
+    check_deadline,
+    wait_until_started,
+    get_deadline,
+)
+from cogito.core.execution import (
+    EVENT_LOOP,
+    PROCESS,
+    THREAD,
+    ForkProcessExecutor,
+    create_invoker,
+    default_execution_mode,
+)
 from cogito.core.exceptions import (
     ModelDownloadError,
-    NoThreadsAvailableError,
     BadRequestError,
+    DeadlineExceededError,
+)
+from cogito.core.metrics import (
+    inference_duration_histogram,
+    model_download_duration_histogram,
 )
-from cogito.core.metrics import inference_duration_histogram
-from cogito.core.model_store import download_gcp_model, download_huggingface_model
 from cogito.core.models import BasePredictor
-
-
-def instance_class(class_path) -> Any:
-    """
-    Instance a class from a string path
-    """
-    path, class_name = class_path.split(":")
-    module = importlib.import_module(f"{path}")
+from cogito.core.response_cache import ResponseCache, canonical_key
+from cogito.core.streaming import (
+    MEDIA_TYPES,
+    check_streaming_mode,
+    format_chunk,
+    format_error,
+    is_streaming_handler,
+    iterate_results,
+    negotiate_stream_format,
+    timed_stream,
+)
 
 
 def instance_class(class_path) -> Any:
@@ -47,21 +70,20 @@ def instance_class(class_path) -> Any:
     path, class_name = class_path.split(":")
     module = importlib.import_module(f"{path}")
 
-    if not hasattr(module, class_name):
-        raise AttributeError(f"Class {class_name} not found in module {path}")
     if not hasattr(module, class_name):
         raise AttributeError(f"Class {class_name} not found in module {path}")
 
     object_class = getattr(module, class_name)
-    object_class = getattr(module, class_name)
 
     # Build an instance of the class
     instance = object_class()
-    instance = object_class()
 
     # Instantiate and return the class
     return instance
-    return instance
+
+
+# Response mode that serializes results straight to JSON bytes, unvalidated
+FAST_RESPONSE = "fast"
 
 
 def get_predictor_handler_return_type(predictor: BasePredictor):
@@ -88,105 +110,293 @@ def wrap_handler(
     descriptor: str,
     original_handler: Callable,
     response_model: ResultResponse,
-    semaphore: asyncio.Semaphore = None,
+    admission_queue: AdmissionQueue = None,
     config: ConfigFile = None,
+    batcher: MicroBatcher = None,
+    executor: Executor = None,
+    execution_mode: str = None,
+    stream_format: str = None,
+    cache: ResponseCache = None,
+    coalescer: SingleFlight = None,
+    response_mode: str = None,
+    timeout_ms: float = None,
 ) -> Callable:
-    class_name, input_model = create_request_model(descriptor, original_handler)
+    if is_streaming_handler(original_handler):
+        if batcher is not None or cache is not None or coalescer is not None:
+            raise ValueError(
+                f"Streaming predictor {descriptor} does not support batching, "
+                "response caching nor request coalescing"
+            )
+        return wrap_streaming_handler(
+            descriptor,
+            original_handler,
+            admission_queue,
+            executor,
+            execution_mode,
+            stream_format,
+            timeout_ms,
+        )
 
-    return_input = config.get_cogito_param('server.return_input_on_response') if config else True
-
-    # Check if the original handler is an async function
-    # Fixme Unify handler after replacing status checking model with file based mode.
-    if inspect.iscoroutinefunction(original_handler):
+    class_name, input_model = create_request_model(descriptor, original_handler)
 
-        async def handler(input: input_model):
-            async def a_timed_handler(input):
-                result = None
-                try:
-                    dict_input = input.model_dump()
-                except:
-                    dict_input = input.dict()
+    return_input = (
+        config.get_cogito_param("server.return_input_on_response") if config else True
+    )
 
-                try:
-                    start_time = time.time()
-                    result = await original_handler(**dict_input)
-                    end_time = time.time() - start_time
-                    inference_duration_histogram.record(
-                        end_time * 1000, {"predictor": class_name, "async": True}
-                    )
-                    # todo Count successful requests
-                except BadRequestError as e:
-                    raise
-                except Exception as e:
-                    logging.exception(e)
-                    # todo Count failed requests
-                    return ErrorResponse(message=str(e)).to_json_response()
-
-                return response_model(
-                    inference_time_seconds=end_time,
-                    input=dict_input if return_input else None,
-                    result=result,
+    is_coroutine = inspect.iscoroutinefunction(original_handler)
+    execution_mode = execution_mode or default_execution_mode(original_handler)
+    fast_response = response_mode == FAST_RESPONSE
+
+    if (
+        not is_coroutine
+        and execution_mode == THREAD
+        and not (admission_queue or executor or batcher)
+        and cache is None
+        and coalescer is None
+        and not fast_response
+    ):
+        # Plain synchronous handler, called directly by the SDK and the CLI
+        def handler(input: input_model):
+            result = None
+            try:
+                dict_input = input.model_dump()
+            except:
+                dict_input = input.dict()
+            try:
+                start_time = time.time()
+                result = original_handler(**dict_input)
+                end_time = time.time() - start_time
+                inference_duration_histogram.record(
+                    end_time * 1000, {"predictor": class_name, "async": False}
                 )
-
-            if not semaphore:
-                return await a_timed_handler(input)
-            else:
-                if semaphore.locked():
-                    raise NoThreadsAvailableError(descriptor)
-                await semaphore.acquire()
-                try:
-                    return await a_timed_handler(input)
-                finally:
-                    semaphore.release()
+                # todo Count successful requests
+            except BadRequestError as e:
+                raise
+            except Exception as e:
+                logging.exception(e)
+                # todo Count failed requests
+                return ErrorResponse(message=str(e)).to_json_response()
+
+            return response_model(
+                inference_time_seconds=end_time,
+                input=dict_input if return_input else None,
+                result=result,
+            )
 
     else:
-
-        def handler(input: input_model):
-            def timed_handler(input):
-                result = None
-                try:
-                    dict_input = input.model_dump()
-                except:
-                    dict_input = input.dict()
-                try:
-                    start_time = time.time()
-                    result = original_handler(**dict_input)
-                    end_time = time.time() - start_time
+        # Admission is awaited on the event loop, so the handler is a coroutine
+        # that runs the predictor as the route's execution mode says: on the
+        # loop itself, on the route executor or through the micro-batcher.
+        from starlette.requests import Request
+
+        if batcher is not None:
+            invoke = batcher.submit
+        else:
+            invoke = create_invoker(
+                descriptor, original_handler, execution_mode, executor
+            )
+
+        # Coalesced calls in flight, with the requests waiting for them
+        shared_calls: Dict[asyncio.Future, SharedCall] = {}
+
+        def build_response(inference_time_seconds, dict_input, result):
+            if fast_response:
+                # Serialized straight to bytes, without validating the result
+                return FastJSONResponse(
+                    {
+                        "inference_time_seconds": inference_time_seconds,
+                        "input": dict_input if return_input else None,
+                        "result": result,
+                    }
+                )
+            return response_model(
+                inference_time_seconds=inference_time_seconds,
+                input=dict_input if return_input else None,
+                result=result,
+            )
+
+        async def a_timed_handler(dict_input, cache_key=None):
+            result = None
+            # Results of a predictor reloaded meanwhile are not cached
+            generation = cache.generation if cache_key is not None else None
+            try:
+                start_time = time.time()
+                result = await invoke(dict_input)
+                end_time = time.time() - start_time
+                # The batcher records the duration of the whole batch
+                if batcher is None:
                     inference_duration_histogram.record(
-                        end_time * 1000, {"predictor": class_name, "async": False}
+                        end_time * 1000,
+                        {"predictor": class_name, "async": is_coroutine},
                     )
-                    # todo Count successful requests
-                except BadRequestError as e:
-                    raise
-                except Exception as e:
-                    logging.exception(e)
-                    # todo Count failed requests
-                    return ErrorResponse(message=str(e)).to_json_response()
-
-                return response_model(
-                    inference_time_seconds=end_time,
-                    input=dict_input if return_input else None,
-                    result=result,
+                # todo Count successful requests
+            except BadRequestError as e:
+                raise
+            except Exception as e:
+                logging.exception(e)
+                # todo Count failed requests
+                return ErrorResponse(message=str(e)).to_json_response()
+
+            if cache_key is not None:
+                cache.set(cache_key, result, generation)
+            return build_response(end_time, dict_input, result)
+
+        async def handler(input: input_model, request: Request = None):
+            try:
+                dict_input = input.model_dump()
+            except:
+                dict_input = input.dict()
+
+            # Invalid deadline headers are rejected, even when cached
+            deadline = get_deadline(request, timeout_ms)
+
+            cache_key = None
+            if cache is not None and cache.is_cacheable(dict_input):
+                cache_key = canonical_key(dict_input)
+                found, result = cache.get(cache_key)
+                if found:
+                    return build_response(0.0, dict_input, result)
+
+            async def admitted_handler(deadline, watched_request, started=None):
+                if not admission_queue:
+                    check_deadline(deadline, class_name)
+                    if started is not None:
+                        started.set()
+                    return await a_timed_handler(dict_input, cache_key)
+
+                acquired_at = await acquire_before_deadline(
+                    admission_queue, watched_request, deadline, class_name
                 )
-
-            if not semaphore:
-                return timed_handler(input)
-            else:
-                if semaphore.locked():
-                    raise NoThreadsAvailableError(descriptor)
-                semaphore.acquire()
                 try:
-                    return timed_handler(input)
+                    check_deadline(deadline, class_name)
+                    if started is not None:
+                        started.set()
+                    return await a_timed_handler(dict_input, cache_key)
                 finally:
-                    semaphore.release()
+                    admission_queue.release(acquired_at)
+
+            if coalescer is None:
+                return await admitted_handler(deadline, request)
+
+            # Identical requests arriving while this one runs share its result,
+            # without taking a slot of their own. The shared call neither follows
+            # the deadline nor the client of the first request: each request gives
+            # up on its own when its deadline passes before the call started.
+            key = cache_key or canonical_key(dict_input)
+            shared = SharedCall()
+            call, first = coalescer.join(
+                key, lambda: admitted_handler(None, None, shared.started)
+            )
+            if first:
+                shared_calls[call] = shared
+                call.add_done_callback(shared_calls.pop)
+            elif call in shared_calls:
+                shared = shared_calls[call]
+            else:
+                return await asyncio.shield(call)
+
+            shared.waiting += 1
+            try:
+                return await wait_until_started(
+                    call, shared.started, deadline, class_name
+                )
+            finally:
+                shared.waiting -= 1
+                # Every request gave up, drop the call before its inference
+                if not shared.waiting and not shared.started.is_set():
+                    coalescer.cancel(key, call)
 
     handler.__annotations__ = {"input": input_model, "return": response_model}
+    if inspect.iscoroutinefunction(handler):
+        handler.__annotations__["request"] = Request
     logging.debug(
         f"Handler of {original_handler.__name__} annotated with {handler.__annotations__}"
     )
     return handler
 
 
+def wrap_streaming_handler(
+    descriptor: str,
+    original_handler: Callable,
+    admission_queue: AdmissionQueue = None,
+    executor: Executor = None,
+    execution_mode: str = None,
+    stream_format: str = None,
+    timeout_ms: float = None,
+) -> Callable:
+    """
+    Wrap a generator predictor in a handler that streams each chunk as it is
+    produced, as Server-Sent Events or newline delimited JSON. The admission slot
+    is held until the stream is over.
+    """
+    from starlette.background import BackgroundTask
+    from starlette.requests import Request
+    from starlette.responses import StreamingResponse
+
+    class_name, input_model = create_request_model(descriptor, original_handler)
+    execution_mode = execution_mode or (
+        EVENT_LOOP if inspect.isasyncgenfunction(original_handler) else THREAD
+    )
+    check_streaming_mode(original_handler, execution_mode)
+
+    async def handler(input: input_model, request: Request):
+        try:
+            dict_input = input.model_dump()
+        except:
+            dict_input = input.dict()
+
+        response_format = negotiate_stream_format(
+            request.headers.get("accept"), stream_format
+        )
+
+        released = False
+        acquired_at = None
+
+        def release():
+            nonlocal released
+            if admission_queue and not released:
+                released = True
+                admission_queue.release(acquired_at)
+
+        deadline = get_deadline(request, timeout_ms)
+        if admission_queue:
+            acquired_at = await acquire_before_deadline(
+                admission_queue, request, deadline, class_name
+            )
+        try:
+            check_deadline(deadline, class_name)
+        except DeadlineExceededError:
+            release()
+            raise
+
+        async def body():
+            try:
+                chunks = iterate_results(
+                    original_handler, dict_input, execution_mode, executor
+                )
+                async for chunk in timed_stream(chunks, class_name):
+                    yield format_chunk(chunk, response_format)
+            except Exception as e:
+                logging.exception(e)
+                yield format_error(str(e), response_format)
+            finally:
+                release()
+
+        # The background task releases the slot if the body is never iterated
+        return StreamingResponse(
+            body(),
+            media_type=MEDIA_TYPES[response_format],
+            background=BackgroundTask(release),
+        )
+
+    handler.__annotations__ = {
+        "input": input_model,
+        "request": Request,
+        "return": StreamingResponse,
+    }
+    return handler
+
+
 # TODO: Maybe the return is not correct: class_name,input_model
 # It is only used to create the input model
 # class_name must be resolved outside of this function
@@ -208,33 +418,180 @@ def create_request_model(descriptor, original_handler):
     return class_name, input_model
 
 
-def model_download(model_path: str) -> str:
+def model_download(model_path: str, workers: Optional[int] = None) -> str:
     """
-    Download a model from various sources based on the model path format.
+    Download a model from various sources based on the model path format, with
+    ``workers`` parallel connections (``COGITO_DOWNLOAD_WORKERS`` by default).
     Supported formats:
     - Google Cloud Storage: gs://bucket/path/to/model
     - Hugging Face: repo_owner/repo_name
     """
+    from cogito.core.model_cache import ModelCache, get_cache_max_size
+    from cogito.core.model_store import (
+        download_gcp_model,
+        download_huggingface_model,
+        download_lock,
+    )
+
     cache_dir = os.getenv("COGITO_HOME")
     os.environ["HF_HOME"] = cache_dir
 
+    source = "gcs" if model_path.startswith("gs://") else "huggingface"
+    start_time = time.time()
     try:
-        if model_path.startswith("gs://"):
-            return download_gcp_model(model_path, cache_dir)
-        return download_huggingface_model(model_path, cache_dir)
+        # Processes sharing the cache wait for the first one to download the
+        # model, then find it in the cache
+        with download_lock(cache_dir, model_path):
+            if source == "gcs":
+                path = download_gcp_model(model_path, cache_dir, workers=workers)
+            else:
+                path = download_huggingface_model(
+                    model_path, cache_dir, workers=workers
+                )
+            cache = ModelCache(cache_dir, get_cache_max_size())
+            cache.pin(model_path)
+            cache.add(model_path, path)
+            return path
     except Exception as e:
         raise ModelDownloadError(model_path, e)
+    finally:
+        model_download_duration_histogram.record(
+            (time.time() - start_time) * 1000, {"source": source}
+        )
 
 
-def create_routes_semaphores(config: ConfigFile) -> Dict[str, asyncio.Semaphore]:
+def get_route_threads(config: ConfigFile, route) -> int:
+    """Thread budget of a route, falling back to `server.threads`"""
+    return getattr(route, "threads", None) or config.cogito.get_server_threads
+
+
+def create_routes_semaphores(config: ConfigFile) -> Dict[str, AdmissionQueue]:
     semaphores = {}
-    semaphores[config.cogito.get_predictor] = asyncio.Semaphore(
-        config.cogito.get_server_threads
-    )
+    for route in config.cogito.get_routes:
+        threads = get_route_threads(config, route)
+
+        # A batched route runs up to `threads` batches at once, so it may hold as
+        # many requests as fit in those batches.
+        batching = getattr(route, "batching", None)
+        if batching:
+            threads *= batching.max_batch_size
+
+        adaptive = getattr(route, "adaptive_concurrency", None)
+        adaptive_limit = None
+        if adaptive:
+            adaptive_limit = AIMDLimit(
+                initial_limit=adaptive.initial_limit or threads,
+                min_limit=adaptive.min_limit,
+                max_limit=adaptive.max_limit,
+                backoff=adaptive.backoff,
+                tolerance=adaptive.tolerance,
+            )
+
+        queue = getattr(route, "queue", None)
+        semaphores[route.path] = AdmissionQueue(
+            name=route.path,
+            concurrency=threads,
+            max_depth=queue.max_depth if queue else 0,
+            max_wait_ms=queue.max_wait_ms if queue else None,
+            adaptive_limit=adaptive_limit,
+        )
 
     return semaphores
 
 
+def create_routes_caches(config: ConfigFile) -> Dict[str, ResponseCache]:
+    """Build a response cache for every route that enables it"""
+    caches = {}
+    for route in config.cogito.get_routes:
+        cache = getattr(route, "cache", None)
+        if cache:
+            caches[route.path] = ResponseCache(
+                name=route.path,
+                max_entries=cache.max_entries,
+                ttl_seconds=cache.ttl_seconds,
+                no_cache_params=cache.no_cache_params,
+            )
+
+    return caches
+
+
+def create_routes_coalescers(config: ConfigFile) -> Dict[str, SingleFlight]:
+    """Build a request coalescer for every route that enables it"""
+    return {
+        route.path: SingleFlight(name=route.path)
+        for route in config.cogito.get_routes
+        if getattr(route, "coalesce", False)
+    }
+
+
+def create_routes_batchers(
+    config: ConfigFile,
+    predictors: Dict[str, BasePredictor],
+    executors: Dict[str, Executor] = None,
+) -> Dict[str, MicroBatcher]:
+    """Build a micro-batcher for every route that enables batching"""
+    batchers = {}
+    for route in config.cogito.get_routes:
+        batching = getattr(route, "batching", None)
+        if not batching:
+            continue
+
+        predictor_string = route.predictor
+        predictor = predictors[predictor_string]
+        batch_handler = getattr(predictor, "predict_batch", None)
+        if batch_handler is None or (
+            getattr(batch_handler, "__func__", None) is BasePredictor.predict_batch
+        ):
+            raise ValueError(
+                f"Batching is enabled for {predictor_string} but the predictor "
+                "does not implement predict_batch"
+            )
+
+        if getattr(route, "execution", None) == PROCESS:
+            raise ValueError(
+                f"Batching is not supported for {route.path} in process execution mode"
+            )
+
+        _, class_name = predictor_string.split(":")
+        batchers[route.path] = MicroBatcher(
+            name=class_name,
+            batch_handler=batch_handler,
+            max_batch_size=batching.max_batch_size,
+            max_wait_ms=batching.max_wait_ms,
+            concurrency=get_route_threads(config, route),
+            executor=executors.get(route.path) if executors else None,
+        )
+
+    return batchers
+
+
+def create_routes_executors(config: ConfigFile) -> Dict[str, Executor]:
+    """
+    Build a dedicated executor per route, sized to the route threads, to run
+    predictors apart from the threadpool shared by the rest of the app. Routes in
+    process execution mode get a pool of worker processes instead of threads.
+    """
+    executors = {}
+    for route in config.cogito.get_routes:
+        _, class_name = route.predictor.split(":")
+        threads = get_route_threads(config, route)
+
+        # Leave room for as many predictions as the adaptive limit may allow
+        adaptive = getattr(route, "adaptive_concurrency", None)
+        if adaptive and not getattr(route, "batching", None):
+            threads = max(threads, adaptive.max_limit)
+
+        if getattr(route, "execution", None) == PROCESS:
+            executors[route.path] = ForkProcessExecutor(max_workers=threads)
+        else:
+            executors[route.path] = ThreadPoolExecutor(
+                max_workers=threads,
+                thread_name_prefix=f"cogito-{class_name}",
+            )
+
+    return executors
+
+
 # Dependencia para limitar la concurrencia
 async def limit_concurrent_requests(semaphore: asyncio.Semaphore):
     await semaphore.acquire()  # Bloquea si se alcanzó el límite
@@ -245,13 +602,23 @@ async def limit_concurrent_requests(semaphore: asyncio.Semaphore):
         semaphore.release()  # Libera el semáforo al finalizar
 
 
-@contextmanager
-def readiness_context(readiness_file: str) -> None:
+def write_readiness_file(readiness_file: str) -> None:
     full_readiness_file = os.path.expandvars(os.path.expanduser(readiness_file))
     folder = os.path.dirname(full_readiness_file)
     os.makedirs(folder, exist_ok=True)
 
     with open(full_readiness_file, "w") as f:
         f.write("ready")
+
+
+def remove_readiness_file(readiness_file: str) -> None:
+    full_readiness_file = os.path.expandvars(os.path.expanduser(readiness_file))
+    if os.path.exists(full_readiness_file):
+        os.remove(full_readiness_file)
+
+
+@contextmanager
+def readiness_context(readiness_file: str) -> None:
+    write_readiness_file(readiness_file)
     yield
-    os.remove(full_readiness_file)
+    remove_readiness_file(readiness_file)
@@ -0,0 +1,97 @@
+import asyncio
+import inspect
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from cogito.core.logging import get_logger
+from cogito.core.metrics import warmup_duration_histogram
+
+
+def load_warmup_payloads(config) -> List[Dict[str, Any]]:
+    """
+    Sample payloads of a route warm-up: the inline ones followed by those of its
+    file, which holds either a JSON list or one JSON object per line.
+    """
+    payloads = list(config.payloads)
+    if config.file:
+        with open(config.file) as f:
+            content = f.read()
+        if content.lstrip().startswith("["):
+            payloads.extend(json.loads(content))
+        else:
+            payloads.extend(
+                json.loads(line) for line in content.splitlines() if line.strip()
+            )
+    return payloads
+
+
+def _warmup_request(path: str) -> Request:
+    """Request without a client, which never disconnects"""
+
+    async def receive():
+        await asyncio.Event().wait()
+
+    scope = {"type": "http", "method": "POST", "path": path, "headers": []}
+    return Request(scope, receive)
+
+
+async def _call(handler: Callable, input, path: str):
+    if not inspect.iscoroutinefunction(handler):
+        return await asyncio.to_thread(handler, input)
+
+    response = await handler(input, _warmup_request(path))
+    if isinstance(response, StreamingResponse):
+        async for _ in response.body_iterator:
+            pass
+        if response.background is not None:
+            await response.background()
+    return response
+
+
+async def warm_up_route(
+    path: str,
+    handler: Callable,
+    payloads: List[Dict[str, Any]],
+    iterations: int = 1,
+    logger=None,
+) -> float:
+    """
+    Run the sample payloads of a route through its handler, one at a time, so
+    that lazy initialization is done before the first real request. Failed
+    payloads are logged without stopping the warm-up. Returns its duration in
+    milliseconds.
+    """
+    logger = logger or get_logger("cogito.warmup")
+    input_model = handler.__annotations__["input"]
+    errors = 0
+
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        for index, payload in enumerate(payloads):
+            try:
+                response = await _call(handler, input_model(**payload), path)
+                if isinstance(response, JSONResponse) and response.status_code >= 400:
+                    raise ValueError(response.body.decode())
+            except Exception as e:
+                errors += 1
+                logger.warning(
+                    "Warm-up payload failed",
+                    extra={"route": path, "payload": index, "error": str(e)},
+                )
+    duration_ms = (time.perf_counter() - start_time) * 1000
+
+    warmup_duration_histogram.record(duration_ms, {"route": path})
+    logger.info(
+        "Route warmed up",
+        extra={
+            "route": path,
+            "requests": len(payloads) * iterations,
+            "errors": errors,
+            "duration_ms": round(duration_ms, 2),
+        },
+    )
+    return duration_ms
@@ -0,0 +1,219 @@
+import gc
+import logging
+import os
+import select
+import signal
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+import uvicorn
+
+from cogito.core.logging import get_logger
+from cogito.core.utils import remove_readiness_file, write_readiness_file
+
+
+class WorkerSupervisor:
+    """
+    Pre-fork process supervisor.
+
+    Everything loaded before ``run`` is called (typically the predictors, already
+    set up) is shared with the workers through copy-on-write memory pages. Each
+    worker runs ``target(notify)`` and calls ``notify()`` once it is accepting
+    connections. The readiness file is written only while every worker is ready,
+    and workers that exit unexpectedly are respawned. SIGHUP is forwarded to the
+    workers, which reload their predictors when hot reloads are enabled.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        target: Callable[[Callable[[], None]], None],
+        readiness_file: Optional[str] = None,
+        logger: Optional[logging.Logger] = None,
+        respawn_delay: float = 1.0,
+        shutdown_timeout: float = 30.0,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be greater than 0")
+
+        self.workers = workers
+        self.target = target
+        self.readiness_file = readiness_file
+        self.respawn_delay = respawn_delay
+        self.shutdown_timeout = shutdown_timeout
+
+        self._logger = logger or get_logger("cogito.workers")
+        self._children: Dict[int, int] = {}  # pid -> worker index
+        self._ready: Set[int] = set()
+        self._pending_respawns: Dict[int, float] = {}  # worker index -> time
+        self._is_ready = False
+        self._stopping = False
+        self._ready_read: Optional[int] = None
+        self._ready_write: Optional[int] = None
+
+    def run(self) -> None:
+        """Fork the workers and supervise them until asked to stop."""
+        self._ready_read, self._ready_write = os.pipe()
+        previous_handlers = {
+            sig: signal.signal(sig, self._handle_signal)
+            for sig in (signal.SIGTERM, signal.SIGINT)
+        }
+        previous_handlers[signal.SIGHUP] = signal.signal(
+            signal.SIGHUP, self._forward_signal
+        )
+
+        # Keep the objects loaded so far out of the garbage collector, so that
+        # collections in the workers do not touch (and copy) the shared pages.
+        gc.freeze()
+        try:
+            for index in range(self.workers):
+                self._spawn(index)
+
+            while not self._stopping:
+                self._read_notifications(timeout=0.2)
+                self._reap()
+                self._respawn_due()
+        finally:
+            self._shutdown()
+            for sig, handler in previous_handlers.items():
+                signal.signal(sig, handler)
+            os.close(self._ready_read)
+            os.close(self._ready_write)
+            gc.unfreeze()
+
+    def stop(self) -> None:
+        self._stopping = True
+
+    def _handle_signal(self, signum, frame) -> None:
+        self._logger.info("Stopping workers", extra={"signal": signum})
+        self.stop()
+
+    def _forward_signal(self, signum, frame) -> None:
+        self._logger.info("Forwarding signal to workers", extra={"signal": signum})
+        for pid in self._children:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def _spawn(self, index: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            self._run_child()
+
+        self._children[pid] = index
+        self._logger.info("Worker started", extra={"worker": index, "pid": pid})
+
+    def _run_child(self) -> None:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        # Ignored until the worker handles it, instead of terminating it
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        os.close(self._ready_read)
+        write_fd = self._ready_write
+
+        def notify():
+            os.write(write_fd, f"{os.getpid()}\n".encode())
+
+        exit_code = 0
+        try:
+            self.target(notify)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 1
+        except BaseException:
+            self._logger.exception("Worker failed", extra={"pid": os.getpid()})
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _read_notifications(self, timeout: float) -> None:
+        try:
+            readable, _, _ = select.select([self._ready_read], [], [], timeout)
+        except InterruptedError:
+            return
+        if not readable:
+            return
+
+        for line in os.read(self._ready_read, 4096).decode().split():
+            pid = int(line)
+            if pid in self._children:
+                self._ready.add(pid)
+
+        if not self._is_ready and len(self._ready) == self.workers:
+            self._is_ready = True
+            if self.readiness_file:
+                write_readiness_file(self.readiness_file)
+            self._logger.info("All workers ready", extra={"workers": self.workers})
+
+    def _reap(self) -> None:
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+            index = self._children.pop(pid, None)
+            self._ready.discard(pid)
+            if index is None or self._stopping:
+                continue
+
+            self._logger.warning(
+                "Worker exited unexpectedly, respawning",
+                extra={
+                    "worker": index,
+                    "pid": pid,
+                    "exit_code": os.waitstatus_to_exitcode(status),
+                },
+            )
+            if self._is_ready:
+                self._is_ready = False
+                if self.readiness_file:
+                    remove_readiness_file(self.readiness_file)
+            self._pending_respawns[index] = time.monotonic() + self.respawn_delay
+
+    def _respawn_due(self) -> None:
+        now = time.monotonic()
+        for index, due in list(self._pending_respawns.items()):
+            if due <= now and not self._stopping:
+                del self._pending_respawns[index]
+                self._spawn(index)
+
+    def _shutdown(self) -> None:
+        for pid in self._children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        while self._children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.05)
+
+        for pid in list(self._children):
+            self._logger.warning("Killing worker", extra={"pid": pid})
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+            self._children.pop(pid, None)
+
+        if self._is_ready and self.readiness_file:
+            remove_readiness_file(self.readiness_file)
+        self._is_ready = False
+
+
+class NotifyingServer(uvicorn.Server):
+    """Uvicorn server that calls ``on_started`` once it accepts connections."""
+
+    def __init__(self, config: uvicorn.Config, on_started: Callable[[], None]):
+        super().__init__(config)
+        self.on_started = on_started
+
+    async def startup(self, sockets: Optional[List] = None) -> None:
+        await super().startup(sockets=sockets)
+        if self.started:
+            self.on_started()
@@ -0,0 +1,181 @@
+import json
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import islice
+from typing import IO, Deque, Iterator, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+# Parallelism of a batch prediction
+THREAD = "thread"
+PROCESS = "process"
+
+# Predictor used by the forked worker processes, set up by the parent process
+_process_predictor = None
+
+
+class PredictionSummary(BaseModel):
+    records: int = 0
+    errors: int = 0
+    next_offset: int = 0
+    elapsed_seconds: float = 0.0
+    latencies_ms: List[float] = []
+
+    @property
+    def throughput(self) -> float:
+        return self.records / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def percentile(self, percent: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        latencies = sorted(self.latencies_ms)
+        index = min(len(latencies) - 1, int(len(latencies) * percent / 100))
+        return latencies[index]
+
+    def __str__(self) -> str:
+        return (
+            f"{self.records} records ({self.errors} errors) in "
+            f"{self.elapsed_seconds:.2f}s, {self.throughput:.1f} records/s, "
+            f"latency p50 {self.percentile(50):.1f}ms, "
+            f"p95 {self.percentile(95):.1f}ms, p99 {self.percentile(99):.1f}ms, "
+            f"max {max(self.latencies_ms, default=0.0):.1f}ms, "
+            f"next offset {self.next_offset}"
+        )
+
+
+def predict_record(predictor, line: int, record: str) -> Tuple[int, str, bool, float]:
+    """
+    Run the prediction of one JSONL record. Returns its line number, its output
+    line, whether it failed, and its latency in milliseconds.
+    """
+    start_time = time.perf_counter()
+    try:
+        response = predictor.run(json.loads(record))
+        if isinstance(response, JSONResponse):
+            output = {"line": line, **json.loads(response.body)}
+            failed = response.status_code >= 400
+        else:
+            output = {"line": line, **json.loads(response.model_dump_json())}
+            failed = False
+    except Exception as e:
+        output = {"line": line, "message": str(e)}
+        failed = True
+
+    latency_ms = (time.perf_counter() - start_time) * 1000
+    return line, json.dumps(output), failed, latency_ms
+
+
+def _predict_record_in_process(line: int, record: str) -> Tuple[int, str, bool, float]:
+    return predict_record(_process_predictor, line, record)
+
+
+def predict_jsonl(
+    predictor,
+    input_file: IO[str],
+    output_file: IO[str],
+    workers: int = 1,
+    parallelism: str = THREAD,
+    ordered: bool = True,
+    offset: int = 0,
+    summary: Optional[PredictionSummary] = None,
+) -> PredictionSummary:
+    """
+    Run every JSONL record of ``input_file`` through a predictor already set up,
+    writing one JSON line per record to ``output_file``. Records run on
+    ``workers`` threads, or forked processes that share the loaded model, and
+    the first ``offset`` lines are skipped to resume an interrupted run. Each
+    output line carries the number of its input line, so that unordered outputs
+    can be matched back to their inputs.
+
+    ``summary``, when given, is updated as records finish, so that it is still
+    available when the run is interrupted. Its ``next_offset`` is the first line
+    whose record has not finished yet: resuming from it runs every missing
+    record again, along with the records after it that already finished when
+    the outputs were unordered.
+    """
+    global _process_predictor
+
+    if workers < 1:
+        raise ValueError("workers must be greater than 0")
+
+    if parallelism == PROCESS:
+        from cogito.core.execution import ForkProcessExecutor
+
+        _process_predictor = predictor
+        executor: Executor = ForkProcessExecutor(max_workers=workers)
+
+        def submit(line: int, record: str) -> Future:
+            return executor.submit(_predict_record_in_process, line, record)
+
+    elif parallelism == THREAD:
+        executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="cogito-predict"
+        )
+
+        def submit(line: int, record: str) -> Future:
+            return executor.submit(predict_record, predictor, line, record)
+
+    else:
+        raise ValueError(f"Unknown parallelism: {parallelism}")
+
+    records: Iterator[Tuple[int, str]] = (
+        (line, record)
+        for line, record in islice(enumerate(input_file), offset, None)
+        if record.strip()
+    )
+
+    if summary is None:
+        summary = PredictionSummary()
+    summary.next_offset = offset
+    # Bounded window of records in flight, so that inputs are streamed
+    max_in_flight = workers * 4
+    pending: List[Future] = []
+    # Lines submitted in order, and the ones finished before all of the earlier
+    # ones, to move the resume offset past contiguous finished lines only
+    submitted: Deque[int] = deque()
+    finished: Set[int] = set()
+
+    def write(future: Future) -> None:
+        line, output, failed, latency_ms = future.result()
+        output_file.write(output + "\n")
+        finished.add(line)
+        while submitted and submitted[0] in finished:
+            finished.remove(submitted[0])
+            summary.next_offset = submitted.popleft() + 1
+        summary.records += 1
+        summary.errors += failed
+        summary.latencies_ms.append(latency_ms)
+
+    def drain(until: int) -> None:
+        nonlocal pending
+        while len(pending) > until:
+            if ordered:
+                write(pending.pop(0))
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                pending = [future for future in pending if future not in done]
+                for future in done:
+                    write(future)
+
+    start_time = time.perf_counter()
+    try:
+        for line, record in records:
+            pending.append(submit(line, record))
+            submitted.append(line)
+            drain(until=max_in_flight - 1)
+        drain(until=0)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        _process_predictor = None
+        output_file.flush()
+        summary.elapsed_seconds = time.perf_counter() - start_time
+
+    return summary
@@ -1,4 +1,11 @@
+import asyncio
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, List
+
 from cogito.core.config.file import build_config_file
+from cogito.core.execution import run_coroutine_in_thread
 from cogito.core.utils import (
     create_request_model,
     get_predictor_handler_return_type,
@@ -10,6 +17,13 @@ from cogito.core.exceptions import NoSetupMethodError
 
 # SDK Predictor class
 class Predict:
+    """
+    Runs the predictions of a cogito predictor in process, without any HTTP hop.
+
+    The handler is built once, and a single instance can be shared across
+    threads: ``setup`` runs only once, whatever the number of threads calling it.
+    Thread safety of the predictions themselves is up to the predictor code.
+    """
 
     # Initialize predictor
     def __init__(self, config_path):
@@ -28,31 +42,60 @@ class Predict:
         # Get response model type
         self.response_model = get_predictor_handler_return_type(self.predictor_instance)
 
+        # Wrap handler with response model, once for every prediction
+        self._handler = wrap_handler(
+            descriptor=self.predictor_path,
+            original_handler=self.predictor_instance.predict,
+            response_model=self.response_model,
+        )
+        self._is_coroutine = inspect.iscoroutinefunction(self._handler)
+
+        self._setup_lock = threading.Lock()
+        self._setup_done = False
+
     # Setup predictor calling setup method in the user's code
     def setup(self):
-        try:
-            if hasattr(self.predictor_instance, "setup") and callable(
-                getattr(self.predictor_instance, "setup")
-            ):
-                self.predictor_instance.setup()
-            else:
-                raise NoSetupMethodError(self.predictor_instance.__class__.__name__)
-        except Exception as e:
-            raise Exception(f"Error setting up the predictor: {e}")
+        with self._setup_lock:
+            if self._setup_done:
+                return
+            try:
+                if hasattr(self.predictor_instance, "setup") and callable(
+                    getattr(self.predictor_instance, "setup")
+                ):
+                    self.predictor_instance.setup()
+                else:
+                    raise NoSetupMethodError(self.predictor_instance.__class__.__name__)
+            except Exception as e:
+                raise Exception(f"Error setting up the predictor: {e}")
+            self._setup_done = True
 
     # Run predictor using the input model in the user's code
     def run(self, payload_data: dict) -> dict:
         input_model = self.input_model_class(**payload_data)
 
-        # Wrap handler with response model
-        handler = wrap_handler(
-            descriptor=self.predictor_path,
-            original_handler=self.predictor_instance.predict,
-            response_model=self.response_model,
-        )
+        # Call handler with input model. Coroutine handlers run on an event loop
+        # owned by the calling thread.
+        if self._is_coroutine:
+            return run_coroutine_in_thread(self._handler, input=input_model)
+        return self._handler(input_model)
+
+    async def arun(self, payload_data: dict) -> dict:
+        """Run a prediction from a coroutine, without blocking the event loop"""
+        input_model = self.input_model_class(**payload_data)
+
+        if self._is_coroutine:
+            return await self._handler(input_model)
+        return await asyncio.to_thread(self._handler, input_model)
 
-        # Call handler with input model
-        response = handler(input_model)
+    def run_many(self, payloads: Iterable[dict], concurrency: int = 4) -> List[Any]:
+        """
+        Run the predictions of several payloads, up to ``concurrency`` of them at
+        the same time, returning their responses in the order of the payloads.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be greater than 0")
 
-        # Print response in JSON format
-        return response
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="cogito-predict"
+        ) as executor:
+            return list(executor.map(self.run, payloads))
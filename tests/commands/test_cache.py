@@ -0,0 +1,33 @@
+import os
+
+from click.testing import CliRunner
+
+from cogito.cli import cli
+from cogito.core.model_cache import ModelCache
+
+
+def test_cache_command_lists_prunes_and_verifies_models(tmp_path):
+    cache = ModelCache(str(tmp_path))
+    for name in ("v1", "v2"):
+        os.makedirs(tmp_path / name)
+        (tmp_path / name / "weights.bin").write_bytes(name.encode() * 512)
+        cache.add(f"gs://models/{name}/", str(tmp_path / name))
+
+    runner = CliRunner()
+    arguments = ["-c", str(tmp_path / "cogito.yaml"), "cache", "--cache-dir"]
+
+    result = runner.invoke(cli, [*arguments, str(tmp_path), "list"])
+    assert result.exit_code == 0
+    assert result.output.splitlines()[0].startswith("gs://models/v1/\t1.0 KiB")
+    assert result.output.splitlines()[-1] == "2 models, 2.0 KiB"
+
+    result = runner.invoke(cli, [*arguments, str(tmp_path), "verify"])
+    assert result.exit_code == 0
+    assert "2 models verified" in result.output
+
+    result = runner.invoke(
+        cli, [*arguments, str(tmp_path), "prune", "--max-size-gb", "0.000001"]
+    )
+    assert result.exit_code == 0
+    assert "Removed gs://models/v1/" in result.output
+    assert [entry.model_path for entry in cache.entries()] == ["gs://models/v2/"]
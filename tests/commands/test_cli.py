@@ -0,0 +1,29 @@
+from click.testing import CliRunner
+
+from cogito.cli import cli
+
+
+def test_cli_lists_every_command_and_loads_them_on_demand():
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["--help"])
+    assert result.exit_code == 0
+    for command in (
+        "cache",
+        "config",
+        "init",
+        "predict",
+        "run",
+        "scaffold",
+        "train",
+        "version",
+    ):
+        assert command in result.output
+
+    result = runner.invoke(cli, ["version"])
+    assert result.exit_code == 0
+    assert "Version" in result.output
+
+    result = runner.invoke(cli, ["unknown"])
+    assert result.exit_code != 0
+    assert "No such command" in result.output
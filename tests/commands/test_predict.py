@@ -19,7 +19,7 @@ class TestPredictCommand:
         ctx.get.return_value = "/path/to/cogito.yaml"
         return ctx
 
-    @patch("cogito.commands.predict.Predict")
+    @patch("cogito.lib.prediction.Predict")
     def test_predict_success(self, mock_predict_class, cli_runner, mock_context):
         # Arrange
         mock_predict_instance = MagicMock()
@@ -47,7 +47,7 @@ class TestPredictCommand:
         assert "test" in result.output
         assert "0.95" in result.output
 
-    @patch("cogito.commands.predict.Predict")
+    @patch("cogito.lib.prediction.Predict")
     def test_predict_config_not_found(
         self, mock_predict_class, cli_runner, mock_context
     ):
@@ -64,7 +64,7 @@ class TestPredictCommand:
         assert result.exit_code == 1
         assert "Config file not found" in result.output
 
-    @patch("cogito.commands.predict.Predict")
+    @patch("cogito.lib.prediction.Predict")
     def test_predict_generic_error(self, mock_predict_class, cli_runner, mock_context):
         # Arrange
         mock_predict_class.side_effect = Exception("Test error")
@@ -76,3 +76,81 @@ class TestPredictCommand:
         # Assert
         assert result.exit_code == 1
         assert "Error initializing the predictor: Test error" in result.output
+
+    @patch("cogito.lib.prediction.Predict")
+    def test_predict_input_file(
+        self, mock_predict_class, cli_runner, mock_context, tmp_path
+    ):
+        # Arrange
+        mock_predict_instance = MagicMock()
+        mock_predict_class.return_value = mock_predict_instance
+
+        mock_result = MagicMock()
+        mock_result.model_dump_json.return_value = '{"result": "test"}'
+        mock_predict_instance.run.return_value = mock_result
+
+        input_file = tmp_path / "inputs.jsonl"
+        input_file.write_text('{"text": "a"}\n{"text": "b"}\n')
+        output_file = tmp_path / "results.jsonl"
+
+        # Act
+        result = cli_runner.invoke(
+            predict,
+            [
+                "--input-file",
+                str(input_file),
+                "--output-file",
+                str(output_file),
+                "--workers",
+                "2",
+            ],
+            obj=mock_context,
+        )
+
+        # Assert
+        assert result.exit_code == 0
+        mock_predict_instance.setup.assert_called_once()
+        assert mock_predict_instance.run.call_count == 2
+        lines = [json.loads(line) for line in output_file.read_text().splitlines()]
+        assert lines == [{"line": 0, "result": "test"}, {"line": 1, "result": "test"}]
+        assert "2 records (0 errors)" in result.output
+
+    @patch("cogito.lib.prediction.Predict")
+    def test_predict_input_file_interrupted(
+        self, mock_predict_class, cli_runner, mock_context, tmp_path
+    ):
+        # Arrange
+        mock_predict_instance = MagicMock()
+        mock_predict_class.return_value = mock_predict_instance
+
+        mock_result = MagicMock()
+        mock_result.model_dump_json.return_value = '{"result": "test"}'
+
+        def run(payload):
+            if payload["text"] == "b":
+                raise KeyboardInterrupt
+            return mock_result
+
+        mock_predict_instance.run.side_effect = run
+
+        input_file = tmp_path / "inputs.jsonl"
+        input_file.write_text('{"text": "a"}\n{"text": "b"}\n{"text": "c"}\n')
+        output_file = tmp_path / "results.jsonl"
+
+        # Act
+        result = cli_runner.invoke(
+            predict,
+            ["--input-file", str(input_file), "--output-file", str(output_file)],
+            obj=mock_context,
+        )
+
+        # Assert
+        assert result.exit_code == 130
+        assert "Interrupted: 1 records (0 errors)" in result.output
+        assert "next offset 1" in result.output
+
+    def test_predict_requires_payload_or_input_file(self, cli_runner, mock_context):
+        result = cli_runner.invoke(predict, [], obj=mock_context)
+
+        assert result.exit_code == 1
+        assert "--payload or --input-file" in result.output
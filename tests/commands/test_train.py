@@ -24,7 +24,7 @@ class TestTrainCommand:
             {"model": "test_model", "data": {"x": [1, 2, 3], "y": [4, 5, 6]}}
         )
 
-    @patch("cogito.commands.train.Trainer")
+    @patch("cogito.lib.training.Trainer")
     def test_train_success(
         self, mock_trainer_class, runner, mock_context, valid_payload
     ):
@@ -46,7 +46,7 @@ class TestTrainCommand:
         )
         assert "Training completed successfully" in result.output
 
-    @patch("cogito.commands.train.Trainer")
+    @patch("cogito.lib.training.Trainer")
     def test_train_config_not_found(
         self, mock_trainer_class, runner, mock_context, valid_payload
     ):
@@ -62,7 +62,7 @@ class TestTrainCommand:
         assert result.exit_code == 1
         assert "Config file not found" in result.output
 
-    @patch("cogito.commands.train.Trainer")
+    @patch("cogito.lib.training.Trainer")
     def test_train_general_exception(
         self, mock_trainer_class, runner, mock_context, valid_payload
     ):
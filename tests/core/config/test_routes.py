@@ -0,0 +1,70 @@
+import yaml
+
+from cogito.core.config.file import ConfigFile
+from cogito.core.utils import create_routes_semaphores
+
+
+def _load(tmp_path, cogito):
+    config_path = tmp_path / "cogito.yaml"
+    config_path.write_text(yaml.dump({"config_version": 1, "cogito": cogito}))
+    return ConfigFile.load_from_file(str(config_path))
+
+
+def _server(**kwargs):
+    server = {
+        "name": "Cogito ergo sum",
+        "description": "Inference server",
+        "fastapi": {"host": "0.0.0.0", "port": 8000},
+        "threads": 2,
+    }
+    server.update(kwargs)
+    return server
+
+
+def test_single_route_uses_the_top_level_predictor(tmp_path):
+    config = _load(
+        tmp_path,
+        {
+            "predictor": "predict:Predictor",
+            "server": _server(route={"name": "Predict", "path": "/v1/predict"}),
+        },
+    )
+
+    routes = config.cogito.get_routes
+
+    assert [(route.path, route.predictor) for route in routes] == [
+        ("/v1/predict", "predict:Predictor")
+    ]
+
+
+def test_multiple_routes_with_their_own_predictor_and_threads(tmp_path):
+    config = _load(
+        tmp_path,
+        {
+            "predictor": "predict:Predictor",
+            "server": _server(
+                routes=[
+                    {"name": "Default", "path": "/v1/predict"},
+                    {
+                        "name": "Embed",
+                        "path": "/v1/embed",
+                        "predictor": "embed:Embedder",
+                        "threads": 4,
+                        "queue": {"max_depth": 8, "max_wait_ms": 50},
+                    },
+                ]
+            ),
+        },
+    )
+
+    routes = config.cogito.get_routes
+    assert [(route.path, route.predictor) for route in routes] == [
+        ("/v1/predict", "predict:Predictor"),
+        ("/v1/embed", "embed:Embedder"),
+    ]
+
+    semaphores = create_routes_semaphores(config)
+    assert semaphores["/v1/predict"].concurrency == 2
+    assert semaphores["/v1/predict"].max_depth == 0
+    assert semaphores["/v1/embed"].concurrency == 4
+    assert semaphores["/v1/embed"].max_depth == 8
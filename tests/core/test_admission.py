@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from cogito.core.admission import AIMDLimit, AdmissionQueue
+from cogito.core.exceptions import NoThreadsAvailableError
+
+
+def test_admission_queue_rejects_immediately_without_depth():
+    async def run():
+        queue = AdmissionQueue("predict:Predictor", concurrency=1)
+        await queue.acquire()
+        with pytest.raises(NoThreadsAvailableError):
+            await queue.acquire()
+        queue.release()
+
+    asyncio.run(run())
+
+
+def test_admission_queue_waits_for_a_free_slot():
+    async def run():
+        queue = AdmissionQueue(
+            "predict:Predictor", concurrency=1, max_depth=2, max_wait_ms=1000
+        )
+        order = []
+
+        async def request(i):
+            async with queue.slot():
+                order.append(i)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(request(i) for i in range(3)))
+        return order
+
+    assert asyncio.run(run()) == [0, 1, 2]
+
+
+def test_admission_queue_rejects_when_full():
+    async def run():
+        queue = AdmissionQueue(
+            "predict:Predictor", concurrency=1, max_depth=1, max_wait_ms=1000
+        )
+        await queue.acquire()
+        waiter = asyncio.create_task(queue.acquire())
+        await asyncio.sleep(0)
+        assert queue.depth == 1
+
+        with pytest.raises(NoThreadsAvailableError):
+            await queue.acquire()
+
+        queue.release()
+        await waiter
+        queue.release()
+
+    asyncio.run(run())
+
+
+def test_admission_queue_rejects_after_max_wait():
+    async def run():
+        queue = AdmissionQueue(
+            "predict:Predictor", concurrency=1, max_depth=1, max_wait_ms=10
+        )
+        await queue.acquire()
+        with pytest.raises(NoThreadsAvailableError):
+            await queue.acquire()
+        assert queue.depth == 0
+        queue.release()
+
+    asyncio.run(run())
+
+
+def test_aimd_limit_grows_while_latency_is_flat_and_backs_off():
+    limit = AIMDLimit(initial_limit=2, max_limit=4, backoff=0.5, tolerance=1.5)
+
+    for _ in range(20):
+        limit.mark_saturated()
+        limit.update(0.01)
+    assert limit.limit == 4
+
+    for _ in range(4):
+        limit.update(0.05)
+    backed_off = limit.limit
+    assert backed_off < 4
+
+    # Without waiting requests the limit has no reason to grow
+    for _ in range(10):
+        limit.update(0.01)
+    assert limit.limit == backed_off
+
+
+def test_adaptive_admission_queue_follows_its_limit():
+    async def run():
+        queue = AdmissionQueue(
+            "predict:Predictor",
+            max_depth=100,
+            # Scheduling jitter must not be taken as overload here
+            adaptive_limit=AIMDLimit(initial_limit=1, max_limit=8, tolerance=100),
+        )
+        running, peak = 0, 0
+
+        async def request():
+            nonlocal running, peak
+            async with queue.slot():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.005)
+                running -= 1
+
+        await asyncio.gather(*(request() for _ in range(60)))
+        return queue.concurrency, peak
+
+    concurrency, peak = asyncio.run(run())
+    assert concurrency > 1
+    assert 1 < peak <= concurrency
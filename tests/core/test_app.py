@@ -0,0 +1,166 @@
+import sys
+import time
+
+import pytest
+import yaml
+from fastapi.testclient import TestClient
+
+from cogito.core.app import Application
+
+PREDICTOR_MODULE = "app_test_predictor"
+
+PREDICTOR_SOURCE = """
+import threading
+
+from cogito import BasePredictor
+
+# Set to hold the setup of the predictors until the test releases it
+hold_setup = threading.Event()
+release_setup = threading.Event()
+
+
+class Predictor(BasePredictor):
+    instances = 0
+    setups = 0
+    predictions = 0
+
+    def __init__(self):
+        Predictor.instances += 1
+        self.version = Predictor.instances
+
+    def setup(self):
+        if hold_setup.is_set():
+            release_setup.wait(5)
+        Predictor.setups += 1
+
+    def predict(self, text: str) -> str:
+        Predictor.predictions += 1
+        return f"{self.version}:{text}"
+"""
+
+
+@pytest.fixture
+def predictor_module(tmp_path, monkeypatch):
+    (tmp_path / f"{PREDICTOR_MODULE}.py").write_text(PREDICTOR_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    # Application points the model caches of the process to the configuration
+    monkeypatch.setenv("HF_HOME", "")
+    monkeypatch.setenv("COGITO_HOME", "")
+
+    __import__(PREDICTOR_MODULE)
+    yield sys.modules[PREDICTOR_MODULE]
+    sys.modules.pop(PREDICTOR_MODULE, None)
+
+
+def create_app(tmp_path, **server) -> Application:
+    config = {
+        "config_version": 1,
+        "cogito": {
+            "predictor": f"{PREDICTOR_MODULE}:Predictor",
+            "trainer": "",
+            "server": {
+                "name": "test",
+                "description": "Test server",
+                "version": "1.0.0",
+                "cache_dir": str(tmp_path / "cache"),
+                "readiness_file": str(tmp_path / "readiness.lock"),
+                "threads": 1,
+                "fastapi": {
+                    "host": "127.0.0.1",
+                    "port": 8000,
+                    "access_log": False,
+                    "debug": False,
+                },
+                "routes": [
+                    {"name": "A", "path": "/v1/a", "tags": ["a"]},
+                    {"name": "B", "path": "/v1/b", "tags": ["b"]},
+                ],
+                **server,
+            },
+        },
+    }
+    config_path = tmp_path / "cogito.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+    return Application(config_file_path=str(config_path))
+
+
+def test_routes_sharing_a_predictor_set_up_a_single_instance(
+    tmp_path, predictor_module
+):
+    application = create_app(tmp_path)
+
+    with TestClient(application.app) as client:
+        assert client.post("/v1/a", json={"text": "x"}).json()["result"] == "1:x"
+        assert client.post("/v1/b", json={"text": "y"}).json()["result"] == "1:y"
+        assert (tmp_path / "readiness.lock").exists()
+
+    predictor = predictor_module.Predictor
+    assert (predictor.instances, predictor.setups) == (1, 1)
+
+
+def test_background_setup_answers_503_until_ready(tmp_path, predictor_module):
+    application = create_app(tmp_path, background_setup=True)
+    predictor_module.hold_setup.set()
+
+    with TestClient(application.app) as client:
+        response = client.post("/v1/a", json={"text": "x"})
+        assert response.status_code == 503
+        assert client.get("/status").status_code == 503
+        assert client.get("/health-check").status_code == 200
+
+        predictor_module.release_setup.set()
+        deadline = time.monotonic() + 5
+        while client.get("/status").status_code != 200:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        assert client.post("/v1/a", json={"text": "x"}).json()["result"] == "1:x"
+
+
+def test_reload_endpoint_swaps_the_predictor_of_every_route(tmp_path, predictor_module):
+    application = create_app(tmp_path, reload={"admin_endpoint": True, "signal": False})
+
+    with TestClient(application.app) as client:
+        assert client.post("/v1/a", json={"text": "x"}).json()["result"] == "1:x"
+
+        response = client.post("/admin/reload")
+        assert response.status_code == 200
+        assert [reload["predictor"] for reload in response.json()] == [
+            f"{PREDICTOR_MODULE}:Predictor"
+        ]
+        assert client.post("/v1/a", json={"text": "x"}).json()["result"] == "2:x"
+        assert client.post("/v1/b", json={"text": "y"}).json()["result"] == "2:y"
+
+        response = client.post("/admin/reload", params={"predictor": "other:Other"})
+        assert response.status_code == 400
+
+    predictor = predictor_module.Predictor
+    assert (predictor.instances, predictor.setups) == (2, 2)
+
+
+def test_reload_endpoint_is_disabled_by_default(tmp_path, predictor_module):
+    application = create_app(tmp_path, reload={"signal": False})
+
+    with TestClient(application.app) as client:
+        assert client.post("/admin/reload").status_code == 404
+
+
+def test_warm_up_reaches_the_predictor_despite_the_response_cache(
+    tmp_path, predictor_module
+):
+    route = {
+        "name": "A",
+        "path": "/v1/a",
+        "tags": ["a"],
+        "cache": {"max_entries": 10},
+        "warmup": {"payloads": [{"text": "x"}], "iterations": 3},
+    }
+    application = create_app(tmp_path, routes=[route])
+
+    with TestClient(application.app) as client:
+        assert predictor_module.Predictor.predictions == 3
+        assert client.post("/v1/a", json={"text": "x"}).json()["result"] == "1:x"
+        assert client.post("/v1/a", json={"text": "x"}).status_code == 200
+
+    # The warm-up left the cache empty, the first request filled it
+    assert predictor_module.Predictor.predictions == 4
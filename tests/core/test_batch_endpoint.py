@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+import pytest
+from pydantic import BaseModel
+from starlette.requests import Request
+
+from cogito.core.admission import AdmissionQueue
+from cogito.core.batch_endpoint import create_batch_handler
+from cogito.core.exceptions import BadRequestError
+
+
+class InputModel(BaseModel):
+    x: int
+
+
+def make_request(chunks, content_type="application/json") -> Request:
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+
+    async def receive():
+        return messages.pop(0)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [(b"content-type", content_type.encode())],
+    }
+    return Request(scope, receive)
+
+
+async def run_batch(handler, request):
+    response = await handler(request)
+    body = ""
+    async for chunk in response.body_iterator:
+        body += chunk
+    return [json.loads(line) for line in body.splitlines()]
+
+
+def make_handler(max_concurrency=2):
+    async def invoke(payload):
+        # Later items finish first, results must still come back in order
+        await asyncio.sleep(0.01 * (5 - payload["x"]))
+        if payload["x"] == 3:
+            raise ValueError("three")
+        return payload["x"] * 2
+
+    return create_batch_handler(
+        "/v1/predict", invoke, InputModel, max_concurrency=max_concurrency
+    )
+
+
+def test_batch_endpoint_streams_ordered_results_with_item_errors():
+    handler = make_handler()
+    body = json.dumps([{"x": 1}, {"x": 2}, {"x": 3}, {"y": 4}, {"x": 4}])
+
+    lines = asyncio.run(run_batch(handler, make_request([body.encode()])))
+
+    assert [line["index"] for line in lines] == [0, 1, 2, 3, 4]
+    assert [line.get("result") for line in lines] == [2, 4, None, None, 8]
+    assert lines[2]["error"] == "three"
+    assert "Field required" in lines[3]["error"]
+
+
+def test_batch_endpoint_reads_ndjson_bodies():
+    handler = make_handler()
+    chunks = [b'{"x": 1}\n{"x"', b": 2}\nnot json\n", b'{"x": 4}']
+
+    lines = asyncio.run(
+        run_batch(handler, make_request(chunks, "application/x-ndjson"))
+    )
+
+    assert [line.get("result") for line in lines] == [2, 4, None, 8]
+    assert lines[2]["error"].startswith("Invalid JSON")
+
+
+def test_batch_endpoint_rejects_bodies_that_are_not_lists():
+    handler = make_handler()
+    with pytest.raises(BadRequestError):
+        asyncio.run(handler(make_request([b'{"x": 1}'])))
+
+
+def test_batch_items_take_slots_of_the_route_admission_queue():
+    running, peak = 0, 0
+
+    async def invoke(payload):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return payload["x"]
+
+    async def run():
+        queue = AdmissionQueue("/v1/predict", concurrency=1, max_depth=1)
+        handler = create_batch_handler(
+            "/v1/predict", invoke, InputModel, max_concurrency=3, admission_queue=queue
+        )
+        body = json.dumps([{"x": x} for x in range(3)])
+        lines = await run_batch(handler, make_request([body.encode()]))
+        return queue, lines
+
+    queue, lines = asyncio.run(run())
+
+    assert peak == 1
+    assert queue.locked() is False
+    # A single item waits for the slot, the queue is full for the next one
+    assert [line.get("result") for line in lines] == [0, 1, None]
+    assert "error" in lines[2]
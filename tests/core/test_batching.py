@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from cogito.core.batching import MicroBatcher
+
+
+def test_micro_batcher_groups_concurrent_requests():
+    calls = []
+
+    def predict_batch(inputs):
+        calls.append(len(inputs))
+        return [item["x"] * 2 for item in inputs]
+
+    async def run():
+        batcher = MicroBatcher(
+            "MockPredictor", predict_batch, max_batch_size=4, max_wait_ms=50
+        )
+        try:
+            return await asyncio.gather(*(batcher.submit({"x": i}) for i in range(6)))
+        finally:
+            await batcher.close()
+
+    results = asyncio.run(run())
+
+    assert results == [0, 2, 4, 6, 8, 10]
+    assert calls == [4, 2]
+
+
+def test_micro_batcher_async_batch_handler():
+    async def predict_batch(inputs):
+        return [f"Hello, {item['name']}" for item in inputs]
+
+    async def run():
+        batcher = MicroBatcher("MockPredictor", predict_batch, max_wait_ms=1)
+        try:
+            return await batcher.submit({"name": "World"})
+        finally:
+            await batcher.close()
+
+    assert asyncio.run(run()) == "Hello, World"
+
+
+def test_micro_batcher_propagates_errors_to_every_caller():
+    def predict_batch(inputs):
+        raise RuntimeError("boom")
+
+    async def run():
+        batcher = MicroBatcher("MockPredictor", predict_batch, max_wait_ms=10)
+        try:
+            return await asyncio.gather(
+                batcher.submit({"x": 1}),
+                batcher.submit({"x": 2}),
+                return_exceptions=True,
+            )
+        finally:
+            await batcher.close()
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_micro_batcher_rejects_mismatched_result_length():
+    def predict_batch(inputs):
+        return [1]
+
+    async def run():
+        batcher = MicroBatcher("MockPredictor", predict_batch, max_wait_ms=10)
+        try:
+            return await asyncio.gather(
+                batcher.submit({"x": 1}),
+                batcher.submit({"x": 2}),
+                return_exceptions=True,
+            )
+        finally:
+            await batcher.close()
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_micro_batcher_invalid_batch_size():
+    with pytest.raises(ValueError):
+        MicroBatcher("MockPredictor", lambda inputs: inputs, max_batch_size=0)
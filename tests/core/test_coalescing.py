@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from cogito.api.responses import ResultResponse
+from cogito.core.admission import AdmissionQueue
+from cogito.core.coalescing import SingleFlight
+from cogito.core.utils import wrap_handler
+
+
+def test_single_flight_shares_in_flight_calls():
+    calls = []
+
+    async def run():
+        flight = SingleFlight("/v1/predict")
+
+        async def compute(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return value * 2
+
+        results = await asyncio.gather(
+            flight.do("a", lambda: compute(1)),
+            flight.do("a", lambda: compute(1)),
+            flight.do("b", lambda: compute(2)),
+        )
+        assert len(flight) == 0
+        # Once finished, the next call runs again
+        results.append(await flight.do("a", lambda: compute(1)))
+        return results
+
+    assert asyncio.run(run()) == [2, 2, 4, 2]
+    assert calls == [1, 2, 1]
+
+
+def test_cleared_single_flight_runs_the_next_calls_again():
+    calls = []
+
+    async def run():
+        flight = SingleFlight("/v1/predict")
+
+        async def compute(value):
+            calls.append(value)
+            call = len(calls)
+            await asyncio.sleep(0.01)
+            return call
+
+        running = asyncio.ensure_future(flight.do("a", lambda: compute(1)))
+        await asyncio.sleep(0)
+        flight.clear()
+        return await asyncio.gather(running, flight.do("a", lambda: compute(1)))
+
+    assert asyncio.run(run()) == [1, 2]
+    assert calls == [1, 1]
+
+
+def test_single_flight_propagates_errors_to_every_caller():
+    async def run():
+        flight = SingleFlight("/v1/predict")
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        return await asyncio.gather(
+            flight.do("a", fail), flight.do("a", fail), return_exceptions=True
+        )
+
+    errors = asyncio.run(run())
+    assert [str(error) for error in errors] == ["boom", "boom"]
+
+
+def test_single_flight_survives_cancelled_caller():
+    async def run():
+        flight = SingleFlight("/v1/predict")
+
+        async def compute():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        leader = asyncio.create_task(flight.do("a", compute))
+        follower = asyncio.create_task(flight.do("a", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(run()) == "done"
+
+
+def test_wrap_handler_coalesces_identical_requests_without_slots():
+    calls = []
+
+    class Predictor:
+        async def predict(self, text: str) -> str:
+            calls.append(text)
+            await asyncio.sleep(0.01)
+            return text.upper()
+
+    class InputModel(BaseModel):
+        text: str
+
+    async def run():
+        handler = wrap_handler(
+            "predict:Predictor",
+            Predictor().predict,
+            ResultResponse,
+            admission_queue=AdmissionQueue("/v1/predict", concurrency=1),
+            coalescer=SingleFlight("/v1/predict"),
+        )
+        # A single slot: without coalescing the copies would be rejected
+        return await asyncio.gather(*(handler(InputModel(text="a")) for _ in range(3)))
+
+    responses = asyncio.run(run())
+    assert [response.result for response in responses] == ["A", "A", "A"]
+    assert calls == ["a"]
@@ -0,0 +1,170 @@
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+from cogito.api.responses import ResultResponse
+from cogito.core.admission import AdmissionQueue
+from cogito.core.coalescing import SingleFlight
+from cogito.core.deadlines import acquire_before_deadline, get_deadline
+from cogito.core.exceptions import (
+    BadRequestError,
+    ClientDisconnectedError,
+    DeadlineExceededError,
+)
+from cogito.core.response_cache import ResponseCache
+from cogito.core.utils import wrap_handler
+
+
+def make_request(timeout_ms=None, disconnected: asyncio.Event = None) -> Request:
+    headers = []
+    if timeout_ms is not None:
+        headers.append((b"x-request-timeout-ms", str(timeout_ms).encode()))
+
+    async def receive():
+        if disconnected is not None:
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+        await asyncio.Event().wait()
+
+    return Request({"type": "http", "method": "POST", "headers": headers}, receive)
+
+
+def test_get_deadline_uses_the_earliest_timeout():
+    async def run():
+        now = asyncio.get_running_loop().time()
+        assert get_deadline(None) is None
+        assert get_deadline(make_request(100)) == pytest.approx(now + 0.1, abs=0.05)
+        assert get_deadline(make_request(5000), 100) == pytest.approx(
+            now + 0.1, abs=0.05
+        )
+        for header in ("soon", "nan", "inf", "-inf"):
+            with pytest.raises(BadRequestError):
+                get_deadline(make_request(header))
+
+    asyncio.run(run())
+
+
+def test_expired_requests_are_dropped_before_inference():
+    calls = []
+
+    class Predictor:
+        async def predict(self, text: str) -> str:
+            calls.append(text)
+            return text
+
+    handler = wrap_handler("predict:Predictor", Predictor().predict, ResultResponse)
+    input_model = handler.__annotations__["input"]
+
+    async def run():
+        with pytest.raises(DeadlineExceededError):
+            await handler(input_model(text="a"), make_request(0))
+        return await handler(input_model(text="b"), make_request(1000))
+
+    assert asyncio.run(run()).result == "b"
+    assert calls == ["b"]
+
+
+def test_invalid_deadlines_are_rejected_on_cache_hits():
+    class Predictor:
+        async def predict(self, text: str) -> str:
+            return text
+
+    handler = wrap_handler(
+        "predict:Predictor",
+        Predictor().predict,
+        ResultResponse,
+        cache=ResponseCache("/v1/predict"),
+    )
+    input_model = handler.__annotations__["input"]
+
+    async def run():
+        assert (await handler(input_model(text="a"), make_request(1000))).result == "a"
+        with pytest.raises(BadRequestError):
+            await handler(input_model(text="a"), make_request("soon"))
+
+    asyncio.run(run())
+
+
+def test_queued_requests_give_up_at_their_deadline():
+    async def run():
+        queue = AdmissionQueue("/v1/predict", max_depth=1, max_wait_ms=1000)
+        await queue.acquire()
+        deadline = asyncio.get_running_loop().time() + 0.01
+        with pytest.raises(DeadlineExceededError):
+            await acquire_before_deadline(queue, None, deadline, "Predictor")
+        assert queue.depth == 0
+
+        queue.release()
+        assert not queue.locked()
+
+    asyncio.run(run())
+
+
+def test_queued_requests_are_cancelled_when_the_client_disconnects():
+    async def run():
+        queue = AdmissionQueue("/v1/predict", max_depth=1, max_wait_ms=1000)
+        await queue.acquire()
+        disconnected = asyncio.Event()
+        waiter = asyncio.create_task(
+            acquire_before_deadline(
+                queue, make_request(disconnected=disconnected), None, "Predictor"
+            )
+        )
+        await asyncio.sleep(0.01)
+        assert queue.depth == 1
+
+        disconnected.set()
+        with pytest.raises(ClientDisconnectedError):
+            await waiter
+        assert queue.depth == 0
+
+        queue.release()
+        assert not queue.locked()
+
+    asyncio.run(run())
+
+
+def test_coalesced_requests_give_up_at_their_own_deadline():
+    calls = []
+
+    class Predictor:
+        async def predict(self, text: str) -> str:
+            calls.append(text)
+            return text.upper()
+
+    queue = AdmissionQueue("/v1/predict", max_depth=5, max_wait_ms=1000)
+    handler = wrap_handler(
+        "predict:Predictor",
+        Predictor().predict,
+        ResultResponse,
+        admission_queue=queue,
+        coalescer=SingleFlight("/v1/predict"),
+    )
+    input_model = handler.__annotations__["input"]
+
+    async def run():
+        # The single slot is busy, the shared calls wait in the queue
+        acquired_at = await queue.acquire()
+        first = asyncio.create_task(handler(input_model(text="a"), make_request(10)))
+        second = asyncio.create_task(handler(input_model(text="a"), make_request()))
+        third = asyncio.create_task(handler(input_model(text="a"), make_request(10)))
+        await asyncio.sleep(0.05)
+        queue.release(acquired_at)
+
+        results = await asyncio.gather(first, second, third, return_exceptions=True)
+
+        # Nobody waits for this one anymore, it is dropped before its inference
+        acquired_at = await queue.acquire()
+        with pytest.raises(DeadlineExceededError):
+            await handler(input_model(text="b"), make_request(10))
+        await asyncio.sleep(0.01)
+        assert queue.depth == 0
+        queue.release(acquired_at)
+        return results
+
+    first, second, third = asyncio.run(run())
+    assert isinstance(first, DeadlineExceededError)
+    assert second.result == "A"
+    assert isinstance(third, DeadlineExceededError)
+    assert calls == ["a"]
@@ -0,0 +1,78 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from cogito.core.execution import (
+    EVENT_LOOP,
+    PROCESS,
+    THREAD,
+    ForkProcessExecutor,
+    create_invoker,
+    default_execution_mode,
+    register_process_predictor,
+)
+
+
+class AsyncPredictor:
+    async def predict(self, name: str) -> str:
+        return f"{name}@{threading.current_thread().name}"
+
+
+class SyncPredictor:
+    def setup(self):
+        self.greeting = "Hello"
+
+    def predict(self, name: str) -> str:
+        return f"{self.greeting}, {name} from {os.getpid()}"
+
+
+def test_default_execution_mode():
+    assert default_execution_mode(AsyncPredictor().predict) == EVENT_LOOP
+    assert default_execution_mode(SyncPredictor().predict) == THREAD
+
+
+def test_invoker_event_loop_runs_coroutine_on_the_loop():
+    invoke = create_invoker(
+        "predict:AsyncPredictor", AsyncPredictor().predict, EVENT_LOOP
+    )
+
+    result = asyncio.run(invoke({"name": "World"}))
+
+    assert result == f"World@{threading.current_thread().name}"
+
+
+def test_invoker_thread_moves_coroutine_off_the_loop():
+    invoke = create_invoker("predict:AsyncPredictor", AsyncPredictor().predict, THREAD)
+
+    async def run():
+        return await asyncio.gather(invoke({"name": "A"}), invoke({"name": "B"}))
+
+    results = asyncio.run(run())
+
+    main_thread = threading.current_thread().name
+    assert all(not result.endswith(f"@{main_thread}") for result in results)
+
+
+def test_invoker_process_uses_the_set_up_predictor():
+    predictor = SyncPredictor()
+    predictor.setup()
+    register_process_predictor("predict:SyncPredictor", predictor)
+    executor = ForkProcessExecutor(max_workers=1)
+    invoke = create_invoker(
+        "predict:SyncPredictor", predictor.predict, PROCESS, executor
+    )
+
+    try:
+        result = asyncio.run(invoke({"name": "World"}))
+    finally:
+        executor.shutdown()
+
+    assert result.startswith("Hello, World from ")
+    assert result != f"Hello, World from {os.getpid()}"
+
+
+def test_invoker_unknown_mode():
+    with pytest.raises(ValueError):
+        create_invoker("predict:SyncPredictor", SyncPredictor().predict, "gpu")
@@ -0,0 +1,81 @@
+import json
+import multiprocessing
+import os
+import socket
+import time
+
+import pytest
+
+from cogito.core.file_lock import FileLock, read_lock_owner
+
+
+def hold_lock(path, acquired, release):
+    lock = FileLock(path, poll_seconds=0.01)
+    lock.acquire()
+    acquired.set()
+    release.wait(5)
+    lock.release()
+
+
+def write_owner(path, **owner):
+    with open(path, "w") as f:
+        json.dump({"host": socket.gethostname(), "token": "old", **owner}, f)
+
+
+def test_lock_is_exclusive_across_processes(tmp_path):
+    path = str(tmp_path / "locks" / "model.lock")
+    context = multiprocessing.get_context("fork")
+    acquired, release = context.Event(), context.Event()
+    process = context.Process(target=hold_lock, args=(path, acquired, release))
+    process.start()
+    try:
+        assert acquired.wait(5)
+        with pytest.raises(TimeoutError):
+            FileLock(path, poll_seconds=0.01).acquire(timeout=0.05)
+
+        release.set()
+        lock = FileLock(path, poll_seconds=0.01)
+        lock.acquire(timeout=5)
+        assert read_lock_owner(path)["pid"] == os.getpid()
+        lock.release()
+        assert not os.path.exists(path)
+    finally:
+        release.set()
+        process.join()
+
+
+def test_locks_of_dead_processes_are_broken(tmp_path):
+    path = str(tmp_path / "model.lock")
+    process = multiprocessing.get_context("fork").Process(target=lambda: None)
+    process.start()
+    process.join()
+    write_owner(path, pid=process.pid)
+
+    with FileLock(path, poll_seconds=0.01) as lock:
+        assert read_lock_owner(path)["token"] == lock.token
+    assert os.listdir(tmp_path) == []
+
+
+def test_locks_not_refreshed_are_broken(tmp_path):
+    path = str(tmp_path / "model.lock")
+    # Held by a process of another host
+    write_owner(path, host="other-host", pid=1)
+
+    lock = FileLock(path, stale_seconds=60, poll_seconds=0.01)
+    with pytest.raises(TimeoutError):
+        lock.acquire(timeout=0.05)
+
+    stale = time.time() - 120
+    os.utime(path, (stale, stale))
+    lock.acquire(timeout=1)
+    assert read_lock_owner(path)["token"] == lock.token
+    lock.release()
+
+
+def test_held_locks_are_refreshed(tmp_path):
+    path = str(tmp_path / "model.lock")
+    with FileLock(path, stale_seconds=0.2):
+        stale = time.time() - 120
+        os.utime(path, (stale, stale))
+        time.sleep(0.15)
+        assert time.time() - os.path.getmtime(path) < 1
@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+import pytest
+
+from cogito.core.exceptions import JobNotFoundError, JobStoreFullError
+from cogito.core.jobs import (
+    FAILED,
+    QUEUED,
+    SUCCEEDED,
+    Job,
+    JobRunner,
+    MemoryJobStore,
+    SQLiteJobStore,
+)
+
+
+async def double(payload):
+    await asyncio.sleep(0.01)
+    if payload["x"] < 0:
+        raise ValueError("negative")
+    return payload["x"] * 2
+
+
+def test_job_runner_runs_jobs_and_waits_for_them():
+    async def run():
+        runner = JobRunner("/v1/predict", MemoryJobStore("/v1/predict"), double)
+        await runner.start()
+        try:
+            ok = runner.submit({"x": 2})
+            failing = runner.submit({"x": -1})
+            assert (await runner.wait(ok.id)).status == QUEUED
+
+            return await runner.wait(ok.id, 1), await runner.wait(failing.id, 1)
+        finally:
+            await runner.stop()
+
+    ok, failing = asyncio.run(run())
+    assert (ok.status, ok.result) == (SUCCEEDED, 4)
+    assert (failing.status, failing.error) == (FAILED, "negative")
+
+
+def test_memory_job_store_is_bounded_and_expires_results():
+    store = MemoryJobStore("/v1/predict", max_jobs=1, result_ttl_seconds=0.01)
+    job = Job(id="a", payload={}, created_at=time.time())
+    store.add(job)
+    with pytest.raises(JobStoreFullError):
+        store.add(Job(id="b", payload={}, created_at=time.time()))
+
+    job.status = SUCCEEDED
+    job.finished_at = time.time()
+    store.save(job)
+    time.sleep(0.02)
+    assert store.get("a") is None
+    store.add(Job(id="b", payload={}, created_at=time.time()))
+
+
+def test_sqlite_job_store_survives_restarts(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+
+    async def submit():
+        store = SQLiteJobStore("/v1/predict", path)
+        runner = JobRunner("/v1/predict", store, double)
+        # Not started: the job is still queued when the process goes away
+        job = runner.submit({"x": 3})
+        store.close()
+        return job.id
+
+    async def restart(job_id):
+        runner = JobRunner("/v1/predict", SQLiteJobStore("/v1/predict", path), double)
+        await runner.start()
+        try:
+            return await runner.wait(job_id, 1)
+        finally:
+            await runner.stop()
+
+    job_id = asyncio.run(submit())
+    job = asyncio.run(restart(job_id))
+    assert (job.status, job.result) == (SUCCEEDED, 6)
+
+    store = SQLiteJobStore("/v1/predict", path)
+    assert store.get(job_id).result == 6
+    store.close()
+
+    runner = JobRunner("/v1/other", SQLiteJobStore("/v1/other", path), double)
+    with pytest.raises(JobNotFoundError):
+        runner.get(job_id)
+    runner.store.close()
+
+
+def test_jobs_whose_result_cannot_be_stored_fail_without_stopping_the_runner(
+    tmp_path,
+):
+    async def invoke(payload):
+        return object() if payload["x"] == 0 else payload["x"]
+
+    async def run():
+        store = SQLiteJobStore("/v1/predict", str(tmp_path / "jobs.sqlite"))
+        runner = JobRunner("/v1/predict", store, invoke)
+        await runner.start()
+        try:
+            unserializable = runner.submit({"x": 0})
+            ok = runner.submit({"x": 1})
+            # Long-polls of the failed job return as soon as it fails
+            failed = await asyncio.wait_for(runner.wait(unserializable.id, 10), 1)
+            return failed, await runner.wait(ok.id, 1)
+        finally:
+            await runner.stop()
+
+    failed, ok = asyncio.run(run())
+    assert failed.status == FAILED
+    assert failed.result is None
+    assert "Unable to serialize" in failed.error
+    assert (ok.status, ok.result) == (SUCCEEDED, 1)
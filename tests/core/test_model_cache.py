@@ -0,0 +1,147 @@
+import json
+import os
+import socket
+import time
+
+from cogito.core import model_cache
+from cogito.core.model_cache import ModelCache
+from cogito.core.model_store import download_lock, model_key
+
+
+def write_model(path, **files):
+    for name, data in files.items():
+        os.makedirs(os.path.dirname(os.path.join(path, name)), exist_ok=True)
+        with open(os.path.join(path, name), "wb") as f:
+            f.write(data)
+    return str(path)
+
+
+def test_identical_files_are_stored_once(tmp_path):
+    cache = ModelCache(str(tmp_path))
+    first = write_model(tmp_path / "v1", **{"weights.bin": b"w" * 100, "a": b"1"})
+    second = write_model(tmp_path / "v2", **{"weights.bin": b"w" * 100, "a": b"2"})
+
+    cache.add("gs://models/v1/", first)
+    entry = cache.add("gs://models/v2/", second)
+
+    assert os.path.samefile(
+        os.path.join(first, "weights.bin"), os.path.join(second, "weights.bin")
+    )
+    assert entry.size == 101
+    assert cache.size() == 102
+    assert [entry.model_path for entry in cache.entries()] == [
+        "gs://models/v1/",
+        "gs://models/v2/",
+    ]
+
+
+def test_least_recently_used_models_are_evicted(tmp_path):
+    cache = ModelCache(str(tmp_path), max_size=250)
+    paths = {
+        name: write_model(tmp_path / name, **{"weights.bin": name.encode() * 100})
+        for name in ("v1", "v2", "v3")
+    }
+    cache.add("gs://models/v1/", paths["v1"])
+    cache.add("gs://models/v2/", paths["v2"])
+    # Using v1 again makes v2 the least recently used
+    cache.add("gs://models/v1/", paths["v1"])
+    cache.add("gs://models/v3/", paths["v3"])
+
+    assert [entry.model_path for entry in cache.entries()] == [
+        "gs://models/v1/",
+        "gs://models/v3/",
+    ]
+    assert not os.path.exists(paths["v2"])
+    assert cache.size() == 200
+
+
+def test_pinned_models_are_not_evicted(tmp_path):
+    cache = ModelCache(str(tmp_path))
+    cache.add("gs://models/v1/", write_model(tmp_path / "v1", a=b"1" * 10))
+    cache.add("gs://models/v2/", write_model(tmp_path / "v2", a=b"2" * 10))
+    cache.pin("gs://models/v1/")
+    # Pin of a process that is gone
+    pins_dir = os.path.join(cache.root, "pins", model_key("gs://models/v2/"))
+    os.makedirs(pins_dir)
+    open(os.path.join(pins_dir, f"{socket.gethostname()}-999999999"), "w").close()
+
+    removed, freed = cache.prune(0)
+
+    assert [entry.model_path for entry in removed] == ["gs://models/v2/"]
+    assert freed == 10
+    assert [entry.model_path for entry in cache.entries()] == ["gs://models/v1/"]
+
+    cache.unpin("gs://models/v1/")
+    removed, _ = cache.prune(0)
+    assert [entry.model_path for entry in removed] == ["gs://models/v1/"]
+    assert cache.size() == 0
+
+
+def test_models_being_downloaded_are_not_evicted(tmp_path):
+    cache = ModelCache(str(tmp_path))
+    cache.add("gs://models/v1/", write_model(tmp_path / "v1", a=b"1" * 10))
+    cache.add("gs://models/v2/", write_model(tmp_path / "v2", a=b"2" * 10))
+    # v1 is downloaded again, the lock of v2 was left by a process that is gone
+    lock = download_lock(str(tmp_path), "gs://models/v1/")
+    lock.acquire()
+    with open(download_lock(str(tmp_path), "gs://models/v2/").path, "w") as f:
+        json.dump({"host": socket.gethostname(), "pid": 999999999}, f)
+
+    try:
+        removed, _ = cache.prune(0)
+    finally:
+        lock.release()
+
+    assert [entry.model_path for entry in removed] == ["gs://models/v2/"]
+    assert [entry.model_path for entry in cache.entries()] == ["gs://models/v1/"]
+
+
+def test_files_are_hashed_without_locking_the_cache(tmp_path, monkeypatch):
+    cache = ModelCache(str(tmp_path))
+    hash_file = model_cache.hash_file
+    locked = []
+
+    def tracked_hash_file(path):
+        locked.append(os.path.exists(cache.lock().path))
+        return hash_file(path)
+
+    monkeypatch.setattr(model_cache, "hash_file", tracked_hash_file)
+    cache.add("gs://models/v1/", write_model(tmp_path / "v1", a=b"1", b=b"2"))
+
+    assert locked == [False, False]
+
+
+def test_verify_finds_and_removes_modified_models(tmp_path):
+    cache = ModelCache(str(tmp_path))
+    path = write_model(tmp_path / "v1", **{"weights.bin": b"w" * 10, "b": b"b"})
+    cache.add("gs://models/v1/", path)
+    cache.add("gs://models/v2/", write_model(tmp_path / "v2", a=b"a"))
+    assert cache.verify() == []
+
+    # Replaced by another file, instead of being downloaded again
+    os.remove(os.path.join(path, "weights.bin"))
+    write_model(path, **{"weights.bin": b"x" * 10})
+
+    problems = cache.verify(repair=True)
+    assert [(entry.model_path, problem) for entry, problem in problems] == [
+        ("gs://models/v1/", f"Modified file {os.path.join(path, 'weights.bin')}")
+    ]
+    assert [entry.model_path for entry in cache.entries()] == ["gs://models/v2/"]
+    assert not os.path.exists(path)
+    assert cache.size() == 1
+
+
+def test_pins_of_other_hosts_expire_unless_refreshed(tmp_path):
+    cache = ModelCache(str(tmp_path), pin_stale_seconds=60)
+    entry = cache.add("gs://models/v1/", write_model(tmp_path / "v1", a=b"1"))
+    pins_dir = os.path.join(cache.root, "pins", entry.key)
+    os.makedirs(pins_dir)
+    pin_file = os.path.join(pins_dir, "other-host-1")
+    open(pin_file, "w").close()
+    assert cache.pinned(entry.key)
+
+    # The pod that pinned the model crashed a while ago
+    stale = time.time() - 120
+    os.utime(pin_file, (stale, stale))
+    assert not cache.pinned(entry.key)
+    assert os.listdir(pins_dir) == []
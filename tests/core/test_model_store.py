@@ -0,0 +1,316 @@
+import base64
+import json
+import hashlib
+import os
+import threading
+
+import google_crc32c
+import pytest
+
+from cogito.core.model_store import (
+    MANIFEST_FILE,
+    METADATA_SUFFIX,
+    PARTIAL_SUFFIX,
+    STATE_SUFFIX,
+    _save_download_state,
+    download_gcp_model,
+    download_lock,
+)
+
+
+class FakeBlob:
+    def __init__(self, name: str, data: bytes, generation: int = 1):
+        self.name = name
+        self.data = data
+        self.size = len(data)
+        self.generation = generation
+        self.crc32c = base64.b64encode(google_crc32c.Checksum(data).digest()).decode()
+        self.md5_hash = base64.b64encode(hashlib.md5(data).digest()).decode()
+        self.ranges = []
+        self.fail_at = None
+        self._lock = threading.Lock()
+
+    def download_as_bytes(self, start, end, if_generation_match=None, **kwargs):
+        assert if_generation_match == self.generation
+        with self._lock:
+            self.ranges.append((start, end))
+        if self.fail_at == start:
+            raise ConnectionError("connection reset")
+        return self.data[start : end + 1]
+
+
+class FakeBucket:
+    def __init__(self, blobs):
+        self.blobs = blobs
+
+    def get_blob(self, name):
+        return self.blobs.get(name)
+
+    def list_blobs(self, prefix=""):
+        return [blob for name, blob in self.blobs.items() if name.startswith(prefix)]
+
+
+class FakeClient:
+    def __init__(self, **blobs):
+        self.buckets = {"models": FakeBucket(blobs)}
+
+    def bucket(self, name):
+        return self.buckets[name]
+
+
+DATA = os.urandom(10 * 1024 + 17)
+
+
+def test_download_fetches_chunks_in_parallel_and_renames_the_file(tmp_path):
+    blob = FakeBlob("weights.bin", DATA)
+    path = download_gcp_model(
+        "gs://models/weights.bin",
+        str(tmp_path),
+        workers=4,
+        chunk_size=1024,
+        client=FakeClient(**{"weights.bin": blob}),
+    )
+
+    assert path == str(tmp_path / "models" / "weights.bin")
+    assert open(path, "rb").read() == DATA
+    assert len(blob.ranges) == 11
+    assert sorted(os.listdir(tmp_path / "models")) == [
+        "weights.bin",
+        f"weights.bin{METADATA_SUFFIX}",
+    ]
+
+    # Complete files are cache hits
+    download_gcp_model(
+        "gs://models/weights.bin",
+        str(tmp_path),
+        chunk_size=1024,
+        client=FakeClient(**{"weights.bin": blob}),
+    )
+    assert len(blob.ranges) == 11
+
+
+def test_new_generations_of_the_same_size_are_downloaded_again(tmp_path):
+    client = FakeClient(**{"weights.bin": FakeBlob("weights.bin", b"A" * 1024)})
+    download_gcp_model("gs://models/weights.bin", str(tmp_path), client=client)
+
+    blob = FakeBlob("weights.bin", b"B" * 1024, generation=2)
+    client = FakeClient(**{"weights.bin": blob})
+    path = download_gcp_model("gs://models/weights.bin", str(tmp_path), client=client)
+    assert open(path, "rb").read() == b"B" * 1024
+
+    # A corrupt file of the right size is not taken for the model either
+    os.remove(path + METADATA_SUFFIX)
+    with open(path, "wb") as f:
+        f.write(b"C" * 1024)
+    blob.ranges = []
+    download_gcp_model("gs://models/weights.bin", str(tmp_path), client=client)
+    assert open(path, "rb").read() == b"B" * 1024
+    assert blob.ranges != []
+
+
+def test_interrupted_downloads_resume_their_missing_chunks(tmp_path):
+    blob = FakeBlob("weights.bin", DATA)
+    client = FakeClient(**{"weights.bin": blob})
+    blob.fail_at = 5 * 1024
+
+    with pytest.raises(ConnectionError):
+        download_gcp_model(
+            "gs://models/weights.bin",
+            str(tmp_path),
+            workers=1,
+            chunk_size=1024,
+            client=client,
+        )
+    # The partial file is never taken for the model
+    assert not (tmp_path / "models" / "weights.bin").exists()
+    assert (tmp_path / "models" / f"weights.bin{PARTIAL_SUFFIX}").exists()
+
+    blob.fail_at = None
+    blob.ranges = []
+    path = download_gcp_model(
+        "gs://models/weights.bin", str(tmp_path), chunk_size=1024, client=client
+    )
+    assert open(path, "rb").read() == DATA
+    # Chunks written before the failure are not downloaded again
+    assert min(start for start, _ in blob.ranges) == 5 * 1024
+
+
+def test_corrupt_downloads_are_discarded(tmp_path):
+    blob = FakeBlob("weights.bin", DATA)
+    destination = str(tmp_path / "models" / "weights.bin")
+    os.makedirs(tmp_path / "models")
+    # A previous run left a corrupt chunk behind
+    with open(destination + PARTIAL_SUFFIX, "wb") as f:
+        f.write(b"\0" * len(DATA))
+    _save_download_state(destination + STATE_SUFFIX, 1, len(DATA), 1024, {0})
+
+    with pytest.raises(ValueError, match="CRC32C mismatch"):
+        download_gcp_model(
+            "gs://models/weights.bin",
+            str(tmp_path),
+            chunk_size=1024,
+            client=FakeClient(**{"weights.bin": blob}),
+        )
+    assert os.listdir(tmp_path / "models") == []
+
+
+def test_partial_downloads_of_another_generation_start_over(tmp_path):
+    blob = FakeBlob("weights.bin", DATA, generation=2)
+    destination = str(tmp_path / "models" / "weights.bin")
+    os.makedirs(tmp_path / "models")
+    with open(destination + PARTIAL_SUFFIX, "wb") as f:
+        f.write(b"\0" * len(DATA))
+    _save_download_state(destination + STATE_SUFFIX, 1, len(DATA), 1024, {0, 1})
+
+    download_gcp_model(
+        "gs://models/weights.bin",
+        str(tmp_path),
+        chunk_size=1024,
+        client=FakeClient(**{"weights.bin": blob}),
+    )
+    assert open(destination, "rb").read() == DATA
+    assert len(blob.ranges) == 11
+
+
+def make_prefix_client(**files):
+    return FakeClient(
+        **{name: FakeBlob(name, data) for name, data in files.items()},
+        **{"models/other.bin": FakeBlob("models/other.bin", b"other")},
+    )
+
+
+def test_prefixes_are_downloaded_as_directories(tmp_path):
+    client = make_prefix_client(
+        **{
+            "models/llm/": b"",
+            "models/llm/config.json": b"{}",
+            "models/llm/weights/part-1.bin": DATA,
+            "models/llm/weights/part-2.bin": DATA[::-1],
+        }
+    )
+
+    path = download_gcp_model(
+        "gs://models/models/llm/",
+        str(tmp_path),
+        workers=4,
+        chunk_size=1024,
+        client=client,
+    )
+
+    assert path == str(tmp_path / "models" / "models" / "llm")
+    assert sorted(
+        os.path.relpath(os.path.join(root, name), path)
+        for root, _, names in os.walk(path)
+        for name in names
+    ) == [MANIFEST_FILE, "config.json", "weights/part-1.bin", "weights/part-2.bin"]
+    assert open(os.path.join(path, "weights/part-2.bin"), "rb").read() == DATA[::-1]
+
+
+def test_unchanged_files_of_a_prefix_are_skipped(tmp_path):
+    client = make_prefix_client(
+        **{"models/llm/a.bin": DATA, "models/llm/b.bin": DATA[::-1]}
+    )
+    blobs = client.buckets["models"].blobs
+    download_gcp_model("gs://models/models/llm/", str(tmp_path), client=client)
+    for blob in blobs.values():
+        blob.ranges = []
+
+    # A new generation with the same content is verified, not downloaded
+    blobs["models/llm/a.bin"].generation = 2
+    blobs["models/llm/b.bin"] = FakeBlob("models/llm/b.bin", DATA, generation=3)
+    download_gcp_model("gs://models/models/llm/", str(tmp_path), client=client)
+
+    assert blobs["models/llm/a.bin"].ranges == []
+    assert blobs["models/llm/b.bin"].ranges != []
+    assert open(tmp_path / "models/models/llm/b.bin", "rb").read() == DATA
+
+
+def test_objects_outside_of_the_prefix_directory_are_rejected(tmp_path):
+    client = make_prefix_client(**{"models/llm/../escape.bin": b"data"})
+    with pytest.raises(ValueError, match="outside"):
+        download_gcp_model("gs://models/models/llm/", str(tmp_path), client=client)
+
+
+def test_concurrent_downloads_of_a_model_wait_for_the_first_one(tmp_path):
+    blob = FakeBlob("weights.bin", DATA)
+    client = FakeClient(**{"weights.bin": blob})
+    paths = []
+
+    def download():
+        with download_lock(str(tmp_path), "gs://models/weights.bin"):
+            paths.append(
+                download_gcp_model(
+                    "gs://models/weights.bin",
+                    str(tmp_path),
+                    chunk_size=1024,
+                    client=client,
+                )
+            )
+
+    threads = [threading.Thread(target=download) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert paths == [str(tmp_path / "models" / "weights.bin")] * 4
+    # Only the first download fetched the object
+    assert len(blob.ranges) == 11
+
+
+def test_objects_named_alike_do_not_share_files(tmp_path):
+    client = FakeClient(**{"x/model.bin": FakeBlob("x/model.bin", b"a" * 10)})
+    client.buckets["other"] = FakeBucket(
+        {"y/model.bin": FakeBlob("y/model.bin", b"b" * 10)}
+    )
+
+    first = download_gcp_model("gs://models/x/model.bin", str(tmp_path), client=client)
+    second = download_gcp_model("gs://other/y/model.bin", str(tmp_path), client=client)
+
+    assert first == str(tmp_path / "models" / "x" / "model.bin")
+    assert second == str(tmp_path / "other" / "y" / "model.bin")
+    assert open(first, "rb").read() == b"a" * 10
+    assert open(second, "rb").read() == b"b" * 10
+    # Neither do their locks, so they download at the same time
+    first_lock = download_lock(str(tmp_path), "gs://models/x/model.bin")
+    second_lock = download_lock(str(tmp_path), "gs://other/y/model.bin")
+    assert first_lock.path != second_lock.path
+    assert (
+        download_lock(str(tmp_path), "gs://models/x//model.bin").path == first_lock.path
+    )
+
+    with pytest.raises(ValueError):
+        download_gcp_model("gs://models/../../model.bin", str(tmp_path), client=client)
+
+
+def test_prefixes_ending_alike_do_not_share_files(tmp_path):
+    client = make_prefix_client(
+        **{
+            "llama/v1/config.json": b"llama",
+            "llama/v1/shard-2.bin": DATA,
+            "mistral/v1/config.json": b"mistral",
+        }
+    )
+
+    llama = download_gcp_model("gs://models/llama/v1/", str(tmp_path), client=client)
+    mistral = download_gcp_model(
+        "gs://models/mistral/v1/", str(tmp_path), client=client
+    )
+
+    assert llama != mistral
+    assert sorted(os.listdir(mistral)) == [MANIFEST_FILE, "config.json"]
+    assert open(os.path.join(llama, "config.json"), "rb").read() == b"llama"
+
+
+def test_files_of_deleted_objects_are_removed(tmp_path):
+    client = make_prefix_client(
+        **{"models/llm/a.bin": b"a", "models/llm/old/b.bin": b"b"}
+    )
+    path = download_gcp_model("gs://models/models/llm/", str(tmp_path), client=client)
+
+    del client.buckets["models"].blobs["models/llm/old/b.bin"]
+    download_gcp_model("gs://models/models/llm/", str(tmp_path), client=client)
+
+    assert sorted(os.listdir(path)) == [MANIFEST_FILE, "a.bin"]
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+        assert list(json.load(f)) == ["a.bin"]
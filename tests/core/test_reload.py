@@ -0,0 +1,59 @@
+import asyncio
+import inspect
+
+from cogito.core.reload import PeakMemorySampler, PredictorHandle
+
+
+class Predictor:
+    def __init__(self, version: str):
+        self.version = version
+
+    async def predict(self, text: str, delay: float = 0.0) -> str:
+        await asyncio.sleep(delay)
+        return f"{self.version}:{text}"
+
+    def stream(self, text: str):
+        yield self.version
+        yield text
+
+
+def test_bound_methods_keep_the_signature_and_kind_of_the_predictor():
+    handle = PredictorHandle("predict:Predictor", Predictor("v1"))
+    predict = handle.bind("predict")
+    stream = handle.bind("stream")
+
+    assert inspect.iscoroutinefunction(predict)
+    assert inspect.isgeneratorfunction(stream)
+    assert list(inspect.signature(predict).parameters) == ["text", "delay"]
+    assert predict.__annotations__["return"] is str
+    assert list(stream(text="a")) == ["v1", "a"]
+
+
+def test_swapped_instances_are_drained():
+    async def run():
+        handle = PredictorHandle("predict:Predictor", Predictor("v1"))
+        predict = handle.bind("predict")
+
+        running = asyncio.create_task(predict(text="a", delay=0.05))
+        await asyncio.sleep(0.01)
+        previous = handle.swap(Predictor("v2"))
+        assert handle.in_flight(previous) == 1
+        assert await predict(text="b") == "v2:b"
+
+        assert not await handle.drain(previous, timeout=0)
+        assert await handle.drain(previous, timeout=1)
+        return await running
+
+    assert asyncio.run(run()) == "v1:a"
+
+
+def test_peak_memory_sampler_sees_allocations():
+    async def run():
+        async with PeakMemorySampler(interval=0.01) as memory:
+            blob = b"\x01" * (64 * 1024 * 1024)
+            await asyncio.sleep(0.05)
+            del blob
+        return memory
+
+    memory = asyncio.run(run())
+    assert memory.peak - memory.start >= 32 * 1024 * 1024
@@ -0,0 +1,96 @@
+import asyncio
+import time
+from typing import Optional
+
+from pydantic import BaseModel
+
+from cogito.api.responses import ResultResponse
+from cogito.core.response_cache import ResponseCache, canonical_key
+from cogito.core.utils import wrap_handler
+
+
+def test_canonical_key_ignores_field_order():
+    assert canonical_key({"a": 1, "b": [1, 2]}) == canonical_key({"b": [1, 2], "a": 1})
+    assert canonical_key({"a": 1}) != canonical_key({"a": 2})
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache("/v1/predict", max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == (True, 1)
+
+    cache.set("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+    assert len(cache) == 2
+
+
+def test_response_cache_expires_entries():
+    cache = ResponseCache("/v1/predict", ttl_seconds=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") == (False, None)
+    assert len(cache) == 0
+
+
+def test_wrap_handler_serves_repeated_inputs_from_cache():
+    calls = []
+
+    class Predictor:
+        def predict(self, text: str, seed: Optional[int] = None) -> str:
+            calls.append(text)
+            return text.upper()
+
+    cache = ResponseCache("/v1/predict", no_cache_params=["seed"])
+    handler = wrap_handler(
+        "predict:Predictor", Predictor().predict, ResultResponse, cache=cache
+    )
+
+    class InputModel(BaseModel):
+        text: str
+        seed: Optional[int] = None
+
+    async def run():
+        first = await handler(InputModel(text="a"))
+        second = await handler(InputModel(text="a"))
+        seeded = await handler(InputModel(text="a", seed=1))
+        return first, second, seeded
+
+    first, second, seeded = asyncio.run(run())
+    assert first.result == second.result == seeded.result == "A"
+    assert second.inference_time_seconds == 0.0
+    assert calls == ["a", "a"]
+
+
+def test_response_cache_drops_results_computed_before_a_clear():
+    calls = []
+
+    class Predictor:
+        async def predict(self, text: str) -> str:
+            calls.append(text)
+            await asyncio.sleep(0.02)
+            return f"{len(calls)}:{text}"
+
+    cache = ResponseCache("/v1/predict")
+    handler = wrap_handler(
+        "predict:Predictor", Predictor().predict, ResultResponse, cache=cache
+    )
+
+    class InputModel(BaseModel):
+        text: str
+
+    async def run():
+        running = asyncio.create_task(handler(InputModel(text="a")))
+        await asyncio.sleep(0.01)
+        # e.g. the predictor was reloaded while it ran
+        cache.clear()
+        stale = await running
+        fresh = await handler(InputModel(text="a"))
+        cached = await handler(InputModel(text="a"))
+        return stale, fresh, cached
+
+    stale, fresh, cached = asyncio.run(run())
+    assert (stale.result, fresh.result, cached.result) == ("1:a", "2:a", "2:a")
+    assert calls == ["a", "a"]
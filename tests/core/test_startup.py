@@ -0,0 +1,29 @@
+from cogito.core.startup import (
+    FAILED,
+    PENDING,
+    READY,
+    SETTING_UP,
+    StartupStatus,
+)
+
+
+def test_startup_status_reports_the_progress_of_the_setup():
+    status = StartupStatus(["predict:A", "predict:B"])
+    assert (status.state, status.ready) == (PENDING, False)
+
+    status.set_state(SETTING_UP)
+    status.predictor_started("predict:A")
+    status.predictor_started("predict:B")
+    status.predictor_finished("predict:A")
+    response = status.to_response()
+    assert response.progress == 0.5
+    assert response.predictors["predict:A"].state == READY
+    assert response.predictors["predict:B"].state == SETTING_UP
+
+    status.predictor_finished("predict:B", error="boom")
+    status.set_state(FAILED, "boom")
+    elapsed = status.elapsed_seconds
+    response = status.to_response()
+    assert (response.state, response.error) == (FAILED, "boom")
+    assert response.predictors["predict:B"].error == "boom"
+    assert status.elapsed_seconds == elapsed
@@ -0,0 +1,101 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import BaseModel
+from starlette.requests import Request
+
+from cogito.core.admission import AdmissionQueue
+from cogito.core.streaming import negotiate_stream_format
+from cogito.core.utils import wrap_handler
+
+
+class InputModel(BaseModel):
+    text: str
+
+
+def make_request(accept: str = None) -> Request:
+    headers = [(b"accept", accept.encode())] if accept else []
+    return Request({"type": "http", "method": "POST", "headers": headers})
+
+
+async def consume(response) -> str:
+    body = ""
+    async for chunk in response.body_iterator:
+        body += chunk
+    if response.background is not None:
+        await response.background()
+    return body
+
+
+def test_negotiate_stream_format():
+    assert negotiate_stream_format(None, None) == "ndjson"
+    assert negotiate_stream_format(None, "sse") == "sse"
+    assert negotiate_stream_format("text/event-stream", "ndjson") == "sse"
+    assert negotiate_stream_format("application/x-ndjson", "sse") == "ndjson"
+    assert negotiate_stream_format("*/*", "sse") == "sse"
+
+
+def test_stream_sync_generator_as_ndjson():
+    class Predictor:
+        def predict(self, text: str):
+            for word in text.split():
+                yield {"token": word}
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    queue = AdmissionQueue("predict:Predictor", concurrency=1)
+    handler = wrap_handler(
+        "predict:Predictor",
+        Predictor().predict,
+        None,
+        admission_queue=queue,
+        executor=executor,
+    )
+
+    async def run():
+        response = await handler(InputModel(text="hello world"), make_request())
+        assert response.media_type == "application/x-ndjson"
+        assert queue.locked()
+        body = await consume(response)
+        assert not queue.locked()
+        return body
+
+    assert asyncio.run(run()) == '{"token": "hello"}\n{"token": "world"}\n'
+    executor.shutdown()
+
+
+def test_stream_async_generator_as_sse():
+    class Predictor:
+        async def predict(self, text: str):
+            for word in text.split():
+                await asyncio.sleep(0)
+                yield word
+
+    handler = wrap_handler("predict:Predictor", Predictor().predict, None)
+
+    async def run():
+        response = await handler(
+            InputModel(text="a b"), make_request("text/event-stream")
+        )
+        assert response.media_type == "text/event-stream"
+        return await consume(response)
+
+    assert asyncio.run(run()) == 'data: "a"\n\ndata: "b"\n\n'
+
+
+def test_stream_reports_errors_in_band():
+    class Predictor:
+        def predict(self, text: str):
+            yield text
+            raise ValueError("boom")
+
+    handler = wrap_handler(
+        "predict:Predictor", Predictor().predict, None, stream_format="sse"
+    )
+
+    async def run():
+        response = await handler(InputModel(text="a"), make_request())
+        return await consume(response)
+
+    assert asyncio.run(run()) == (
+        'data: "a"\n\nevent: error\ndata: {"error": "boom"}\n\n'
+    )
@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+from cogito.api.responses import ResultResponse
+from cogito.core.admission import AdmissionQueue
+from cogito.core.config.v1 import WarmupConfig
+from cogito.core.utils import wrap_handler
+from cogito.core.warmup import load_warmup_payloads, warm_up_route
+
+
+def test_load_warmup_payloads_from_inline_yaml_and_files(tmp_path):
+    jsonl = tmp_path / "warmup.jsonl"
+    jsonl.write_text('{"text": "b"}\n\n{"text": "c"}\n')
+    json_list = tmp_path / "warmup.json"
+    json_list.write_text(json.dumps([{"text": "d"}]))
+
+    config = WarmupConfig(payloads=[{"text": "a"}], file=str(jsonl))
+    assert load_warmup_payloads(config) == [{"text": "a"}, {"text": "b"}, {"text": "c"}]
+    assert load_warmup_payloads(WarmupConfig(file=str(json_list))) == [{"text": "d"}]
+
+
+def test_warm_up_route_runs_payloads_through_the_handler():
+    calls = []
+
+    class Predictor:
+        async def predict(self, text: str) -> str:
+            if text == "fail":
+                raise ValueError("fail")
+            calls.append(text)
+            return text
+
+        def stream(self, text: str):
+            calls.append(f"stream {text}")
+            yield text
+
+        def sync(self, text: str) -> str:
+            calls.append(f"sync {text}")
+            return text
+
+    predictor = Predictor()
+    queue = AdmissionQueue("/v1/predict")
+    handlers = [
+        wrap_handler("p:Predictor", predictor.predict, ResultResponse, queue),
+        wrap_handler("p:Predictor", predictor.stream, None, queue),
+        wrap_handler("p:Predictor", predictor.sync, ResultResponse),
+    ]
+    payloads = [{"text": "a"}, {"text": "fail"}]
+
+    async def run():
+        for handler in handlers:
+            await warm_up_route("/v1/predict", handler, payloads, iterations=2)
+
+    asyncio.run(run())
+    assert (
+        calls
+        == ["a", "a"] + ["stream a", "stream fail"] * 2 + ["sync a", "sync fail"] * 2
+    )
+    assert not queue.locked()
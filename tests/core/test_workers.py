@@ -0,0 +1,43 @@
+import threading
+import time
+
+from cogito.core.workers import WorkerSupervisor
+
+
+def test_worker_supervisor_respawns_crashed_worker_and_signals_readiness(tmp_path):
+    readiness_file = tmp_path / "readiness.lock"
+    attempts_file = tmp_path / "attempts"
+    attempts_file.write_text("")
+
+    def target(notify):
+        with open(attempts_file, "a") as f:
+            f.write("x")
+        if attempts_file.read_text() == "x":
+            raise SystemExit(1)
+        notify()
+        time.sleep(30)
+
+    supervisor = WorkerSupervisor(
+        1,
+        target,
+        readiness_file=str(readiness_file),
+        respawn_delay=0.05,
+        shutdown_timeout=5,
+    )
+    observed_ready = []
+
+    def stop_when_ready():
+        deadline = time.monotonic() + 10
+        while not readiness_file.exists() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        observed_ready.append(readiness_file.exists())
+        supervisor.stop()
+
+    watcher = threading.Thread(target=stop_when_ready)
+    watcher.start()
+    supervisor.run()
+    watcher.join()
+
+    assert observed_ready == [True]
+    assert attempts_file.read_text() == "xx"
+    assert not readiness_file.exists()
@@ -64,3 +64,98 @@ def test_wrap_handler_base_model_input_str_output():
 
     assert issubclass(wrapped_handler_annotations["input"], BaseModel)
     assert issubclass(wrapped_handler_annotations["return"], ResultResponse)
+
+
+def test_wrap_handler_batched():
+    import asyncio
+
+    from cogito.core.batching import MicroBatcher
+
+    class MockPredictor:
+        def predict(self, input: str) -> str:
+            return f"Hello, {input}"
+
+        def predict_batch(self, inputs):
+            return [f"Hello, {item['input']}" for item in inputs]
+
+    predictor = MockPredictor()
+
+    async def run():
+        batcher = MicroBatcher("MockPredictor", predictor.predict_batch, max_wait_ms=5)
+        wrapped_handler = wrap_handler(
+            "predict:MockPredictor",
+            predictor.predict,
+            ResultResponse,
+            batcher=batcher,
+        )
+        input_model = wrapped_handler.__annotations__["input"]
+        try:
+            return await asyncio.gather(
+                wrapped_handler(input_model(input="World")),
+                wrapped_handler(input_model(input="Cogito")),
+            )
+        finally:
+            await batcher.close()
+
+    responses = asyncio.run(run())
+    assert [response.result for response in responses] == [
+        "Hello, World",
+        "Hello, Cogito",
+    ]
+
+
+def test_wrap_handler_sync_runs_on_route_executor():
+    import asyncio
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    from cogito.core.admission import AdmissionQueue
+
+    class MockPredictor:
+        def predict(self, input: str) -> str:
+            return threading.current_thread().name
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cogito-test")
+
+    async def run():
+        wrapped_handler = wrap_handler(
+            "predict:MockPredictor",
+            MockPredictor().predict,
+            ResultResponse,
+            admission_queue=AdmissionQueue("predict:MockPredictor", concurrency=1),
+            executor=executor,
+        )
+        input_model = wrapped_handler.__annotations__["input"]
+        return await wrapped_handler(input_model(input="World"))
+
+    try:
+        response = asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+    assert response.result.startswith("cogito-test")
+
+
+def test_wrap_handler_fast_response_mode():
+    import asyncio
+    import json
+
+    from cogito.api.responses import FastJSONResponse
+
+    class MockPredictor:
+        async def predict(self, input: str) -> dict:
+            return {"greeting": f"Hello, {input}"}
+
+    wrapped_handler = wrap_handler(
+        "predict:MockPredictor",
+        MockPredictor().predict,
+        ResultResponse,
+        response_mode="fast",
+    )
+    input_model = wrapped_handler.__annotations__["input"]
+    response = asyncio.run(wrapped_handler(input_model(input="World")))
+
+    assert isinstance(response, FastJSONResponse)
+    body = json.loads(response.body)
+    assert body["input"] == {"input": "World"}
+    assert body["result"] == {"greeting": "Hello, World"}
@@ -0,0 +1,80 @@
+import io
+import json
+import time
+
+import pytest
+
+from cogito.lib.batch_prediction import PredictionSummary, predict_jsonl
+
+
+class MockResponse:
+    def __init__(self, result):
+        self.result = result
+
+    def model_dump_json(self):
+        return json.dumps({"result": self.result})
+
+
+class MockPredict:
+    def run(self, payload):
+        # Earlier records take longer, so unordered outputs come out reversed
+        time.sleep(0.01 * (4 - payload["x"]))
+        if payload["x"] == 2:
+            raise ValueError("two")
+        return MockResponse(payload["x"] * 10)
+
+
+def run(**kwargs):
+    inputs = io.StringIO("".join(json.dumps({"x": x}) + "\n" for x in range(4)))
+    outputs = io.StringIO()
+    summary = predict_jsonl(MockPredict(), inputs, outputs, **kwargs)
+    return summary, [json.loads(line) for line in outputs.getvalue().splitlines()]
+
+
+def test_predict_jsonl_writes_results_in_order():
+    summary, lines = run(workers=4)
+
+    assert [line["line"] for line in lines] == [0, 1, 2, 3]
+    assert [line.get("result") for line in lines] == [0, 10, None, 30]
+    assert lines[2]["message"] == "two"
+    assert (summary.records, summary.errors, summary.next_offset) == (4, 1, 4)
+    assert len(summary.latencies_ms) == 4
+
+
+def test_predict_jsonl_unordered_and_resumed():
+    _, lines = run(workers=4, ordered=False)
+    assert sorted(line["line"] for line in lines) == [0, 1, 2, 3]
+    assert lines[0]["line"] != 0
+
+    summary, lines = run(workers=2, offset=3)
+    assert [line["line"] for line in lines] == [3]
+    assert summary.next_offset == 4
+
+
+def test_interrupted_unordered_run_resumes_from_the_first_unfinished_line():
+    class InterruptedOutput(io.StringIO):
+        def write(self, line):
+            if len(self.getvalue().splitlines()) == 2:
+                raise KeyboardInterrupt
+            return super().write(line)
+
+    inputs = io.StringIO("".join(json.dumps({"x": x}) + "\n" for x in range(4)))
+    summary = PredictionSummary()
+    with pytest.raises(KeyboardInterrupt):
+        predict_jsonl(
+            MockPredict(),
+            inputs,
+            InterruptedOutput(),
+            workers=4,
+            ordered=False,
+            summary=summary,
+        )
+
+    # Line 0 is the slowest, the lines after it finished first
+    assert (summary.records, summary.next_offset) == (2, 0)
+    assert summary.elapsed_seconds > 0
+
+
+def test_predict_jsonl_rejects_unknown_parallelism():
+    with pytest.raises(ValueError):
+        run(parallelism="fiber")
@@ -111,3 +111,57 @@ def test_run_general_exception(
         predictor = Predict("/path/to/cogito.yaml")
 
     assert "Test exception" in str(excinfo.value)
+
+
+class SyncPredictor:
+    def __init__(self):
+        self.setup_calls = 0
+
+    def setup(self):
+        self.setup_calls += 1
+
+    def predict(self, text: str) -> str:
+        return text.upper()
+
+
+class AsyncPredictor(SyncPredictor):
+    async def predict(self, text: str) -> str:
+        return text.upper()
+
+
+def build_predict(predictor_class, mock_config_file):
+    mock_config_file.cogito.get_predictor = "predict:Predictor"
+    with (
+        patch("cogito.lib.prediction.build_config_file", return_value=mock_config_file),
+        patch("cogito.lib.prediction.instance_class", return_value=predictor_class()),
+    ):
+        return Predict("/path/to/cogito.yaml")
+
+
+@pytest.mark.parametrize("predictor_class", [SyncPredictor, AsyncPredictor])
+def test_run_many_and_arun(predictor_class, mock_config_file):
+    import asyncio
+
+    predictor = build_predict(predictor_class, mock_config_file)
+
+    with patch("cogito.lib.prediction.wrap_handler") as mock_wrap_handler:
+        responses = predictor.run_many(
+            [{"text": text} for text in "abcdef"], concurrency=3
+        )
+        response = asyncio.run(predictor.arun({"text": "g"}))
+
+    # The handler was built once, by the constructor
+    mock_wrap_handler.assert_not_called()
+    assert [response.result for response in responses] == list("ABCDEF")
+    assert response.result == "G"
+
+
+def test_setup_runs_once_across_threads(mock_config_file):
+    from concurrent.futures import ThreadPoolExecutor
+
+    predictor = build_predict(SyncPredictor, mock_config_file)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: predictor.setup(), range(8)))
+
+    assert predictor.predictor_instance.setup_calls == 1
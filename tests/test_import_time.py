@@ -0,0 +1,85 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies only the server and the model downloads need
+HEAVY_MODULES = [
+    "fastapi",
+    "uvicorn",
+    "opentelemetry",
+    "google.cloud.storage",
+    "huggingface_hub",
+]
+
+# Dependencies of the server only, that predictions in process do not need
+SERVER_MODULES = [
+    "fastapi",
+    "uvicorn",
+    "opentelemetry.sdk",
+    "opentelemetry.exporter.prometheus",
+    "google.cloud.storage",
+    "huggingface_hub",
+]
+
+# Import time budget in a fresh interpreter, in seconds. Loading the heavy
+# dependencies takes well over it, the lazy imports a fraction of it.
+IMPORT_BUDGET_SECONDS = 1.0
+
+
+def import_in_subprocess(statement: str) -> dict:
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = time.perf_counter() - start\n"
+        "print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # The statement may print as well, the report is the last line
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "statement",
+    ["import cogito", "from cogito import BasePredictor", "import cogito.cli"],
+)
+def test_imports_stay_light_and_within_budget(statement):
+    result = import_in_subprocess(statement)
+
+    assert [module for module in HEAVY_MODULES if module in result["modules"]] == []
+    assert result["elapsed"] < IMPORT_BUDGET_SECONDS
+
+
+def test_lazy_exports_load_on_first_use():
+    result = import_in_subprocess("from cogito import Application, model_download")
+    assert "fastapi" in result["modules"]
+
+
+def test_cli_subcommands_only_import_their_own_module():
+    result = import_in_subprocess(
+        "from cogito.cli import cli\ncli.main(['version'], standalone_mode=False)"
+    )
+
+    assert "cogito.commands.version" in result["modules"]
+    assert "cogito.commands.run" not in result["modules"]
+    assert [module for module in HEAVY_MODULES if module in result["modules"]] == []
+
+
+def test_in_process_predictions_do_not_import_the_server():
+    result = import_in_subprocess(
+        "import cogito.commands.predict\nimport cogito.lib.prediction"
+    )
+
+    assert [module for module in SERVER_MODULES if module in result["modules"]] == []
+    assert result["elapsed"] < IMPORT_BUDGET_SECONDS